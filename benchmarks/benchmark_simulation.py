@@ -8,6 +8,7 @@ logging.disable(logging.CRITICAL)
 
 import time
 import concurrent.futures
+import multiprocessing
 import sys
 from pathlib import Path
 import taichi as ti
@@ -44,6 +45,25 @@ from scenarios import FeverScenario, SepsisScenario
 # Import actions
 from actions import BloodTestAction, MEDICATIONS, FLUIDS
 
+def _gpu_probe():
+    """Report whether ti.gpu initialises on a real device rather than falling back to the CPU."""
+    ti.init(arch=ti.gpu)
+    return ti.lang.impl.current_cfg().arch != ti.cpu
+
+def _pick_arch(mp_context):
+    """
+    Choose the Taichi backend once, by initialising ti.gpu in a throwaway
+    process and checking which backend it ended up on, instead of letting
+    every worker attempt a GPU init. The probe runs out of process because
+    a GPU init without a usable driver can crash the interpreter outright.
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as probe:
+        try:
+            on_gpu = probe.submit(_gpu_probe).result()
+        except concurrent.futures.BrokenExecutor:
+            on_gpu = False
+    return ti.gpu if on_gpu else ti.cpu
+
 # Configuration for benchmark
 NUM_SIMULATIONS = 50      # Number of parallel simulation instances
 N_STEPS = 1000           # Number of simulation steps per instance
@@ -155,23 +175,22 @@ def create_simulation():
     
     return Master(solvers=solvers, dt=1.0, couplers=couplers, scenarios=scenarios, actions=actions)
 
-def run_simulation(sim_id):
-    """Run a single simulation instance."""
-    # Initialize Taichi with GPU if available, otherwise use CPU
-    try:
-        ti.init(arch=ti.gpu, offline_cache=False)
-        if sim_id == 0:  # Only print this once to avoid spamming
-            print("Running with GPU acceleration")
-    except Exception:
-        ti.init(arch=ti.cpu, offline_cache=False)
-        if sim_id == 0:  # Only print this once to avoid spamming
-            print("Running with CPU (GPU not available)")
-
-    sim = create_simulation()
+def run_simulation(sim_id, arch):
+    """Run a single simulation instance on the Taichi backend main() picked."""
+    # Compiled coupler kernels are cached on disk, so only the first worker
+    # of the first run pays for compiling them.
+    init_kwargs = dict(arch=arch, offline_cache=True)
+    if arch == ti.cpu:
+        # The process pool already puts one worker on every core
+        init_kwargs["cpu_max_num_threads"] = 1
+    ti.init(**init_kwargs)
+    if sim_id == 0:  # Only print this once to avoid spamming
+        print("Running with GPU acceleration" if arch == ti.gpu else "Running with CPU (GPU not available)")
+
     config_times = {}
     
     for config in BENCHMARK_CONFIGS:
-        start = time.time()
+        start = time.perf_counter()
         
         # Reset the simulation instance by creating a new one
         # This ensures each benchmark configuration starts from a clean state
@@ -179,7 +198,7 @@ def run_simulation(sim_id):
         
         # Apply legacy actions (direct state modifications) specified in the configuration
         if config["legacy_actions"]:
-            sim.actions(config["legacy_actions"])
+            sim.apply_actions(config["legacy_actions"])
         
         # Apply new action objects
         for action_name in config["actions"]:
@@ -190,10 +209,9 @@ def run_simulation(sim_id):
             sim.apply_scenario(scenario_name)
         
         # Run simulation steps
-        for _ in range(N_STEPS):
-            sim.step()
+        sim.step(n_steps=N_STEPS)
             
-        end = time.time()
+        end = time.perf_counter()
         real_time = end - start
         simulated_time = N_STEPS * sim.dt
         speedup = simulated_time / real_time if real_time > 0 else float('inf')
@@ -208,8 +226,12 @@ def main():
     
     overall_start = time.time()
     
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        futures = [executor.submit(run_simulation, i) for i in range(NUM_SIMULATIONS)]
+    # Workers are spawned, not forked: importing master has already started
+    # Taichi in this process, and a forked copy of that runtime hangs in ti.init
+    spawn = multiprocessing.get_context("spawn")
+    arch = _pick_arch(spawn)
+    with concurrent.futures.ProcessPoolExecutor(mp_context=spawn) as executor:
+        futures = [executor.submit(run_simulation, i, arch) for i in range(NUM_SIMULATIONS)]
         
         # Aggregate results by configuration
         config_results = {config["name"]: [] for config in BENCHMARK_CONFIGS}
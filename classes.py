@@ -6,6 +6,8 @@ class State(ABC):
     Base interface/abstract class for all simulation state classes.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def state(self) -> dict:
         """
@@ -19,6 +21,8 @@ class Solver(ABC):
     Base interface/abstract class for all simulation modules.
     """
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def state(self):
@@ -39,10 +43,33 @@ class Solver(ABC):
         """
         Extract the relevant portion of the global_state for this solver.
         """
-        parsed_state = {}
-        for key in self.state:
-            parsed_state[key] = global_state[key]
-        return parsed_state
+        return {key: global_state[key] for key in self.state}
+
+
+class ParamCacheMixin:
+    """
+    Clears a solver's cached, parameter-derived values when a parameter is reassigned.
+
+    The solver names the cache attribute in ``_CACHE_ATTR`` and the parameters it is
+    derived from in ``_CACHE_PARAMS`` (None for every public attribute). Assigning
+    one sets the cache attribute to None, and the solver rebuilds it on its next solve.
+    List it before Solver in the bases.
+    """
+
+    __slots__ = ()
+
+    _CACHE_ATTR = "_dt"
+    _CACHE_PARAMS = frozenset()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        params = self._CACHE_PARAMS
+        if params is None:
+            stale = not name.startswith("_")
+        else:
+            stale = name in params
+        if stale:
+            super().__setattr__(self._CACHE_ATTR, None)
 
 
 class Coupler(ABC):
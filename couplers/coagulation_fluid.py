@@ -147,8 +147,9 @@ class CoagulationFluidCoupler(Coupler):
             result["hemoglobin"] = new_hemoglobin
             
         if result:
-            self.logger.info(f"Coupling: Coagulation affecting fluid status - "
-                           f"Bleeding: {bleeding_rate:.1f} -> {result.get('bleeding_rate', bleeding_rate):.1f}, "
-                           f"Fluid: {fluid_volume:.0f} -> {result.get('fluid_volume', fluid_volume):.0f} ml")
+            self.logger.info("Coupling: Coagulation affecting fluid status - "
+                             "Bleeding: %.1f -> %.1f, Fluid: %.0f -> %.0f ml",
+                             bleeding_rate, result.get('bleeding_rate', bleeding_rate),
+                             fluid_volume, result.get('fluid_volume', fluid_volume))
             
         return result
\ No newline at end of file
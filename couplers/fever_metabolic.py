@@ -111,8 +111,9 @@ class FeverMetabolicCoupler(Coupler):
             result["metabolic_rate"] = new_metabolic_rate
             
         if result:
-            self.logger.info(f"Coupling: Fever affecting metabolism - "
-                           f"HR: {heart_rate:.1f} -> {result.get('heart_rate', heart_rate):.1f}, "
-                           f"O2: {oxygen_saturation:.1f}% -> {result.get('oxygen_saturation', oxygen_saturation):.1f}%")
+            self.logger.info("Coupling: Fever affecting metabolism - "
+                             "HR: %.1f -> %.1f, O2: %.1f%% -> %.1f%%",
+                             heart_rate, result.get('heart_rate', heart_rate),
+                             oxygen_saturation, result.get('oxygen_saturation', oxygen_saturation))
             
         return result
\ No newline at end of file
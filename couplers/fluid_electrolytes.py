@@ -104,8 +104,8 @@ class FluidElectrolyteCoupler(Coupler):
             result["potassium"] = new_potassium
             
         if result:
-            self.logger.info(f"Coupling: Fluid affecting electrolytes - "
-                            f"Na: {sodium:.1f} -> {new_sodium:.1f}, "
-                            f"K: {potassium:.1f} -> {new_potassium:.1f}")
+            self.logger.info("Coupling: Fluid affecting electrolytes - "
+                             "Na: %.1f -> %.1f, K: %.1f -> %.1f",
+                             sodium, new_sodium, potassium, new_potassium)
             
         return result
\ No newline at end of file
@@ -120,8 +120,9 @@ class InfectionHemogramCoupler(Coupler):
             result["hemoglobin"] = max(3.0, min(18.0, new_hemoglobin))  # 3-18 g/dL range
             
         if result:
-            self.logger.info(f"Coupling: Infection affecting hemogram - "
-                           f"WBC: {current_wbc:.1f} -> {result.get('wbc', current_wbc):.1f}, "
-                           f"PLT: {current_platelets:.0f} -> {result.get('platelets', current_platelets):.0f}")
+            self.logger.info("Coupling: Infection affecting hemogram - "
+                             "WBC: %.1f -> %.1f, PLT: %.0f -> %.0f",
+                             current_wbc, result.get('wbc', current_wbc),
+                             current_platelets, result.get('platelets', current_platelets))
             
         return result
\ No newline at end of file
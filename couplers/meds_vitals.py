@@ -79,7 +79,8 @@ class MedsVitalsCoupler(Coupler):
         
         # Log significant changes
         if abs(new_hr - heart_rate) > 1.0 or abs(new_bp - blood_pressure) > 1.0:
-            self.logger.info(f"Coupling: Meds affecting vitals - HR: {heart_rate:.1f} -> {new_hr:.1f}, BP: {blood_pressure:.1f} -> {new_bp:.1f}")
+            self.logger.info("Coupling: Meds affecting vitals - HR: %.1f -> %.1f, BP: %.1f -> %.1f",
+                             heart_rate, new_hr, blood_pressure, new_bp)
         
         # Return the updated values
         return {
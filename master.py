@@ -1,11 +1,22 @@
 import logging
+import os
 import taichi as ti
 from typing import List, Optional, Dict, Any
 from classes import Solver, Coupler, Scenario, Action
 
 # Initialize Taichi with CPU/GPU backend
 ti.init(arch=ti.cpu)  # Can be changed to ti.gpu if needed
-logging.basicConfig(level=logging.INFO)
+# INFO records the whole state on every step; set JACOB_DEBUG=1 to see them
+logging.basicConfig(level=logging.INFO if os.environ.get("JACOB_DEBUG") else logging.WARNING)
+
+
+# Stands in for keys absent from the pre-step state when building last_delta
+_MISSING = object()
+
+
+def _name_index(items) -> dict:
+    """Map each name to its first item, matching what a linear scan would find."""
+    return {item.name: item for item in reversed(items)}
 
 
 class Master:
@@ -34,9 +45,14 @@ class Master:
         self.couplers = couplers or []
         self.scenarios = scenarios or []
         self.actions = actions or []
+        # Name lookups for get_scenario / get_action; rebuilt from the lists on
+        # a miss, so entries appended after construction are still found
+        self._scenario_index = _name_index(self.scenarios)
+        self._action_index = _name_index(self.actions)
         self.active_scenarios = []
         self.active_actions = []  # Track actions with duration > 0
         self.state = {}
+        self.last_delta = {}  # Solver outputs that changed on the last step
         self.dt = dt  # can be float
         self.current_time = 0.0
 
@@ -102,27 +118,39 @@ class Master:
                 if key not in self.state:
                     self.logger.warning(f"Coupler will create new state key: {key}")
 
-    def step(self):
+    def step(self, n_steps: int = 1):
         """
         Progress the simulation by dt, letting each solver update its part of the state
         and then applying couplers for interactions between solvers.
         Also applies active scenarios.
         Uses Taichi for parallelism where possible.
+
+        :param n_steps: Number of dt steps to run before returning
+        :return: The global state dictionary after the last step
         """
-        # Parallel solver step - prepare data structures
-        solver_results = {}
-        
-        # Let each solver parse and solve (can be executed in parallel)
-        for solver in self.solvers:
-            local_state_dict = solver.parse_state(self.state)
-            new_local_state = solver.solve(local_state_dict, self.dt)
-            # Store results for later update
-            solver_results[solver] = new_local_state.state
-        
-        # Update global state with all solver results
-        for solver_state in solver_results.values():
-            self.state.update(solver_state)
-            
+        step_once = self._step_once
+        for _ in range(n_steps):
+            step_once()
+        return self.state
+
+    def _step_once(self):
+        """Advance the simulation by a single dt."""
+        # Let each solver parse and solve (can be executed in parallel).
+        # Every solver must see the pre-step state, so results are merged afterwards.
+        state = self.state
+        dt = self.dt
+        solver_results = [solver.solve(solver.parse_state(state), dt).state
+                          for solver in self.solvers]
+
+        # Update global state with all solver results; later solvers win on shared keys.
+        # last_delta holds the merged outputs that differ from the pre-step state.
+        before = state.copy()
+        for solver_state in solver_results:
+            state.update(solver_state)
+        get = before.get
+        self.last_delta = {key: state[key] for solver_state in solver_results
+                           for key in solver_state if get(key, _MISSING) != state[key]}
+
         # Apply couplers after all solvers have updated their states
         for coupler in self.couplers:
             local_state = coupler.parse_state(self.state)
@@ -139,8 +167,8 @@ class Master:
         self._apply_active_actions()
 
         self.current_time += self.dt
-        self.logger.info(str(self))
-        return self.state
+        # Lazy %s: the full state string is only built when INFO is enabled
+        self.logger.info("%s", self)
     
     def _apply_scenarios(self):
         """
@@ -197,6 +225,19 @@ class Master:
             # Apply action effects adjusted by remaining fraction
             self._apply_action_changes(action, kwargs, remaining_fraction)
 
+    def get_scenario(self, scenario_name: str) -> Optional[Scenario]:
+        """
+        Look up a registered scenario by name.
+
+        :param scenario_name: The name of the scenario
+        :return: The first scenario in ``scenarios`` with that name, or None
+        """
+        scenario = self._scenario_index.get(scenario_name)
+        if scenario is None:
+            self._scenario_index = _name_index(self.scenarios)
+            scenario = self._scenario_index.get(scenario_name)
+        return scenario
+
     def apply_scenario(self, scenario_name: str):
         """
         Activate a scenario by name.
@@ -204,19 +245,18 @@ class Master:
         :param scenario_name: The name of the scenario to activate
         :return: True if scenario was found and activated, False otherwise
         """
-        for scenario in self.scenarios:
-            if scenario.name == scenario_name:
-                if scenario not in self.active_scenarios:
-                    scenario.activate()
-                    self.active_scenarios.append(scenario)
-                    self.logger.info(f"Scenario {scenario_name} activated")
-                    return True
-                else:
-                    self.logger.warning(f"Scenario {scenario_name} is already active")
-                    return True
-        
-        self.logger.warning(f"Scenario {scenario_name} not found")
-        return False
+        scenario = self.get_scenario(scenario_name)
+        if scenario is None:
+            self.logger.warning(f"Scenario {scenario_name} not found")
+            return False
+
+        if scenario not in self.active_scenarios:
+            scenario.activate()
+            self.active_scenarios.append(scenario)
+            self.logger.info(f"Scenario {scenario_name} activated")
+        else:
+            self.logger.warning(f"Scenario {scenario_name} is already active")
+        return True
 
     def deactivate_scenario(self, scenario_name: str):
         """
@@ -263,6 +303,19 @@ class Master:
         self.logger.info(f"Action {action.name} performed with changes: {changes}")
         return observable_state
     
+    def get_action(self, action_name: str) -> Optional[Action]:
+        """
+        Look up a registered action by name.
+
+        :param action_name: The name of the action
+        :return: The first action in ``actions`` with that name, or None
+        """
+        action = self._action_index.get(action_name)
+        if action is None:
+            self._action_index = _name_index(self.actions)
+            action = self._action_index.get(action_name)
+        return action
+
     def perform_action_by_name(self, action_name: str, **kwargs) -> Dict[str, Any]:
         """
         Find an action by name and perform it.
@@ -271,10 +324,10 @@ class Master:
         :param kwargs: Additional parameters specific to this action
         :return: Dictionary of observable state values after performing the action, empty if action not found
         """
-        for action in self.actions:
-            if action.name == action_name:
-                return self.perform_action(action, **kwargs)
-                
+        action = self.get_action(action_name)
+        if action is not None:
+            return self.perform_action(action, **kwargs)
+
         self.logger.warning(f"Action {action_name} not found")
         return {}
     
@@ -301,7 +354,7 @@ class Master:
                 
         return changes
 
-    def actions(self, actions: Dict[str, float]):
+    def apply_actions(self, actions: Dict[str, float]):
         """
         Perform immediate state changes according to an actions dictionary.
         For user/model actions like medications, pacemaker configurations, procedures, etc.
@@ -312,16 +365,18 @@ class Master:
         :param actions: Dictionary of state keys and their delta values (or absolute values for new keys)
         :return: Updated global state
         """
+        state = self.state
         for key, value in actions.items():
-            if key in self.state:
-                self.state[key] += value
+            current = state.get(key)
+            if current is not None:
+                state[key] = current + value
             else:
                 # Add the key with the specified value instead of throwing an error
-                self.state[key] = value
-                self.logger.info(f"Created new state key: {key} = {value}")
+                state[key] = value
+                self.logger.info("Created new state key: %s = %s", key, value)
 
         self.logger.info("Actions applied: %s", actions)
-        self.logger.info(str(self))
+        self.logger.info("%s", self)
         return self.state
 
     def __str__(self):
@@ -0,0 +1,138 @@
+"""
+Multi-patient stepping for solvers that implement solve_batch.
+
+Each batch-capable solver declares the columns it works on in
+``batch_columns``. BatchStepper lays the union of those columns out in a
+single (n_patients, n_columns) array so a whole cohort advances one tick
+with one vectorised call per solver. Cohort holds the same columns field by
+field for callers that keep a population around between ticks; single-solver
+populations such as PressureHROxyPopulation build on it.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from classes import Solver
+
+
+class Cohort:
+    """
+    State of a whole cohort, stored field by field.
+
+    Every column is a contiguous array of length n that callers read and
+    write directly, e.g. ``cohort["epinephrine"][3] = 2.0``; no per-patient
+    dicts are built while stepping. Use BatchStepper.cohort to create one.
+    """
+
+    __slots__ = ("columns", "_index", "_data")
+
+    def __init__(self, columns, n: int, defaults: Dict[str, float] = None, dtype=np.float64):
+        """
+        :param columns: Field names, in storage order
+        :param n: Number of patients
+        :param defaults: Starting value of each field for every patient (0 if missing)
+        :param dtype: Floating dtype of the arrays
+        """
+        defaults = defaults or {}
+        self.columns = tuple(columns)
+        self._index = {column: i for i, column in enumerate(self.columns)}
+        self._data = np.empty((len(self.columns), n), dtype=dtype)
+        for i, column in enumerate(self.columns):
+            self._data[i] = defaults.get(column, 0.0)
+
+    def __len__(self):
+        return self._data.shape[1]
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """Writable array of one field across all patients."""
+        return self._data[self._index[key]]
+
+    def patient(self, i: int) -> Dict[str, float]:
+        """Snapshot of patient i as a state dict."""
+        return dict(zip(self.columns, self._data[:, i].tolist()))
+
+
+class BatchStepper:
+    """
+    Advance a cohort of patients through several batch-capable solvers at once.
+
+    Patients are rows of a packed (n_patients, n_columns) array over the
+    union of the solvers' ``batch_columns``. Each solver reads its own
+    columns and writes back only the ones its ``state`` owns, so a column no
+    solver in the stepper owns (e.g. ``fio2``) is an input held at whatever
+    the caller stores in it.
+    """
+
+    def __init__(self, solvers: List[Solver]):
+        """
+        :param solvers: Solvers providing ``batch_columns`` and ``solve_batch``
+        """
+        columns = []
+        for solver in solvers:
+            for column in solver.batch_columns:
+                if column not in columns:
+                    columns.append(column)
+        self.solvers = solvers
+        self.columns = tuple(columns)
+        index = {column: i for i, column in enumerate(columns)}
+        self._solver_columns = []
+        self._solver_outputs = []
+        for solver in solvers:
+            self._solver_columns.append(np.array([index[c] for c in solver.batch_columns],
+                                                 dtype=np.intp))
+            # Only write back the keys the solver owns; the rest are inputs it
+            # passes through and may belong to another solver in the cohort.
+            owned = solver.state.keys()
+            local = [i for i, c in enumerate(solver.batch_columns) if c in owned]
+            self._solver_outputs.append((np.array(local, dtype=np.intp),
+                                         np.array([index[solver.batch_columns[i]] for i in local],
+                                                  dtype=np.intp)))
+
+    def _defaults(self, values: Dict[str, float] = None) -> Dict[str, float]:
+        """
+        Starting value of every key: the caller's values, with each solver's
+        state rebuilt from them so missing keys take the solver's defaults
+        and derived keys (MAP from systolic/diastolic) agree with the rest.
+        """
+        values = values or {}
+        defaults = dict(values)
+        for solver in self.solvers:
+            defaults.update(type(solver._state)(dict(solver.state, **values)).state)
+        return defaults
+
+    def pack(self, states: List[Dict[str, float]]) -> np.ndarray:
+        """Build the packed array from per-patient state dicts, using each solver's defaults."""
+        return np.array([[d.get(c, 0.0) for c in self.columns]
+                         for d in map(self._defaults, states)], dtype=float)
+
+    def cohort(self, n: int, initial_state: Dict[str, float] = None, dtype=np.float64) -> Cohort:
+        """
+        Allocate a Cohort over this stepper's columns.
+
+        :param initial_state: Starting values shared by every patient; missing keys
+                              use the solvers' defaults
+        """
+        return Cohort(self.columns, n, self._defaults(initial_state), dtype)
+
+    def unpack(self, states: np.ndarray) -> List[Dict[str, float]]:
+        """Convert the packed array back into one dict per patient."""
+        return [dict(zip(self.columns, row.tolist())) for row in states]
+
+    def step(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Advance every patient by dt.
+
+        Every solver reads the pre-step values of its columns; results are
+        written to a new array.
+        """
+        out = states.copy()
+        for solver, cols, (local, owned) in zip(self.solvers, self._solver_columns,
+                                                self._solver_outputs):
+            out[:, owned] = solver.solve_batch(states[:, cols], dt)[:, local]
+        return out
+
+    def step_cohort(self, cohort: Cohort, dt: float):
+        """Advance every patient of a cohort built by cohort() in place."""
+        rows = cohort._data.T
+        rows[...] = self.step(rows, dt)
@@ -3,8 +3,15 @@ from classes import Solver, State
 
 logger = logging.getLogger(__name__)
 
+# Keys the Master seeds from this solver's initial state; when they are all
+# present, solve can index the input dict directly instead of going through
+# CoagulationState's .get() defaults.
+_REQUIRED = frozenset(("platelet_count", "pt", "ptt", "fibrinogen", "d_dimer"))
+
 
 class CoagulationState(State):
+    __slots__ = ("_platelet_count", "_pt", "_ptt", "_fibrinogen", "_d_dimer", "_cache")
+
     def __init__(self, data: dict):
         # Track key coagulation parameters
         self._platelet_count = data.get("platelet_count", 150.0)  # Normal range 150-450 K/uL
@@ -12,16 +19,32 @@ class CoagulationState(State):
         self._ptt = data.get("ptt", 30.0)  # Partial Thromboplastin Time, normal 25-35 seconds
         self._fibrinogen = data.get("fibrinogen", 300.0)  # Normal range 200-400 mg/dL
         self._d_dimer = data.get("d_dimer", 0.5)  # Normal < 0.5 mg/L FEU
+        self._cache = None
+
+    @classmethod
+    def from_values(cls, platelet_count: float, pt: float, ptt: float,
+                    fibrinogen: float, d_dimer: float) -> "CoagulationState":
+        """Build a state from solver outputs without parsing a dict."""
+        cs = cls.__new__(cls)
+        cs._platelet_count = platelet_count
+        cs._pt = pt
+        cs._ptt = ptt
+        cs._fibrinogen = fibrinogen
+        cs._d_dimer = d_dimer
+        cs._cache = None
+        return cs
 
     @property
     def state(self) -> dict:
-        return {
-            "platelet_count": self._platelet_count,
-            "pt": self._pt,
-            "ptt": self._ptt,
-            "fibrinogen": self._fibrinogen,
-            "d_dimer": self._d_dimer
-        }
+        if self._cache is None:
+            self._cache = {
+                "platelet_count": self._platelet_count,
+                "pt": self._pt,
+                "ptt": self._ptt,
+                "fibrinogen": self._fibrinogen,
+                "d_dimer": self._d_dimer
+            }
+        return self._cache
 
 
 class CoagulationSolver(Solver):
@@ -54,40 +77,45 @@ class CoagulationSolver(Solver):
         return self._state.state
 
     def solve(self, state: dict, dt: float) -> State:
-        cs = CoagulationState(state)
-        
+        if _REQUIRED <= state.keys():
+            platelet_count = state["platelet_count"]
+            pt = state["pt"]
+            ptt = state["ptt"]
+            fibrinogen = state["fibrinogen"]
+            d_dimer = state["d_dimer"]
+        else:
+            cs = CoagulationState(state)
+            platelet_count, pt, ptt, fibrinogen, d_dimer = (
+                cs._platelet_count, cs._pt, cs._ptt, cs._fibrinogen, cs._d_dimer)
+
         # Update platelets based on production and consumption
         platelet_change = (self.platelet_production_rate - 
-                          self.platelet_decay_rate * cs.state["platelet_count"]) * dt
-        new_platelets = max(0, cs.state["platelet_count"] + platelet_change)
+                          self.platelet_decay_rate * platelet_count) * dt
+        new_platelets = max(0, platelet_count + platelet_change)
 
         # PT tends to normalize to 12 seconds
-        pt_change = self.pt_recovery_rate * (12.0 - cs.state["pt"]) * dt
-        new_pt = max(0, cs.state["pt"] + pt_change)
+        pt_change = self.pt_recovery_rate * (12.0 - pt) * dt
+        new_pt = max(0, pt + pt_change)
 
         # PTT tends to normalize to 30 seconds
-        ptt_change = self.ptt_recovery_rate * (30.0 - cs.state["ptt"]) * dt
-        new_ptt = max(0, cs.state["ptt"] + ptt_change)
+        ptt_change = self.ptt_recovery_rate * (30.0 - ptt) * dt
+        new_ptt = max(0, ptt + ptt_change)
 
         # Fibrinogen production and consumption
         fibrinogen_change = (self.fibrinogen_production_rate - 
-                            0.01 * cs.state["fibrinogen"]) * dt
-        new_fibrinogen = max(0, cs.state["fibrinogen"] + fibrinogen_change)
+                            0.01 * fibrinogen) * dt
+        new_fibrinogen = max(0, fibrinogen + fibrinogen_change)
 
         # D-dimer clearance
-        d_dimer_change = -self.d_dimer_clearance_rate * cs.state["d_dimer"] * dt
-        new_d_dimer = max(0, cs.state["d_dimer"] + d_dimer_change)
-
-        logger.debug(
-            f"CoagulationSolver: platelets={new_platelets:.1f}, "
-            f"PT={new_pt:.1f}, PTT={new_ptt:.1f}, "
-            f"fibrinogen={new_fibrinogen:.1f}, d-dimer={new_d_dimer:.2f}"
-        )
-
-        return CoagulationState({
-            "platelet_count": new_platelets,
-            "pt": new_pt,
-            "ptt": new_ptt,
-            "fibrinogen": new_fibrinogen,
-            "d_dimer": new_d_dimer
-        })
\ No newline at end of file
+        d_dimer_change = -self.d_dimer_clearance_rate * d_dimer * dt
+        new_d_dimer = max(0, d_dimer + d_dimer_change)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "CoagulationSolver: platelets=%.1f, "
+                "PT=%.1f, PTT=%.1f, "
+                "fibrinogen=%.1f, d-dimer=%.2f",
+                new_platelets, new_pt, new_ptt, new_fibrinogen, new_d_dimer
+            )
+
+        return CoagulationState.from_values(new_platelets, new_pt, new_ptt, new_fibrinogen, new_d_dimer)
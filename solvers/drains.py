@@ -5,21 +5,27 @@ logger = logging.getLogger(__name__)
 
 
 class DrainsState(State):
+    __slots__ = ("_chest_tube_output", "_jp_drain_output", "_ng_tube_output",
+                 "_total_output", "_cache")
+
     def __init__(self, data: dict):
         # Track multiple drains and their outputs
         self._chest_tube_output = data.get("chest_tube_output", 0.0)  # mL/hr
         self._jp_drain_output = data.get("jp_drain_output", 0.0)  # mL/hr
         self._ng_tube_output = data.get("ng_tube_output", 0.0)  # mL/hr
         self._total_output = data.get("total_drain_output", 0.0)  # Total accumulated output
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "chest_tube_output": self._chest_tube_output,
-            "jp_drain_output": self._jp_drain_output,
-            "ng_tube_output": self._ng_tube_output,
-            "total_drain_output": self._total_output
-        }
+        if self._cache is None:
+            self._cache = {
+                "chest_tube_output": self._chest_tube_output,
+                "jp_drain_output": self._jp_drain_output,
+                "ng_tube_output": self._ng_tube_output,
+                "total_drain_output": self._total_output
+            }
+        return self._cache
 
 
 class DrainsSolver(Solver):
@@ -63,11 +69,13 @@ class DrainsSolver(Solver):
         new_total = (ds.state["total_drain_output"] + 
                     new_chest + new_jp + new_ng)
 
-        logger.debug(
-            f"DrainsSolver: chest={new_chest:.1f}, "
-            f"JP={new_jp:.1f}, NG={new_ng:.1f}, "
-            f"total={new_total:.1f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "DrainsSolver: chest=%.1f, "
+                "JP=%.1f, NG=%.1f, "
+                "total=%.1f",
+                new_chest, new_jp, new_ng, new_total
+            )
 
         return DrainsState({
             "chest_tube_output": new_chest,
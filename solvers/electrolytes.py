@@ -5,6 +5,9 @@ logger = logging.getLogger(__name__)
 
 
 class ElectrolytesState(State):
+    __slots__ = ("_sodium", "_potassium", "_chloride", "_calcium", "_magnesium",
+                 "_phosphate", "_cache")
+
     def __init__(self, data: dict):
         # Initialize electrolyte levels with normal ranges
         self._sodium = data.get("sodium", 140.0)      # Normal: 135-145 mEq/L
@@ -13,17 +16,20 @@ class ElectrolytesState(State):
         self._calcium = data.get("calcium", 9.5)      # Normal: 8.5-10.5 mg/dL
         self._magnesium = data.get("magnesium", 2.0)  # Normal: 1.7-2.2 mg/dL
         self._phosphate = data.get("phosphate", 3.5)  # Normal: 2.5-4.5 mg/dL
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "sodium": self._sodium,
-            "potassium": self._potassium,
-            "chloride": self._chloride,
-            "calcium": self._calcium,
-            "magnesium": self._magnesium,
-            "phosphate": self._phosphate
-        }
+        if self._cache is None:
+            self._cache = {
+                "sodium": self._sodium,
+                "potassium": self._potassium,
+                "chloride": self._chloride,
+                "calcium": self._calcium,
+                "magnesium": self._magnesium,
+                "phosphate": self._phosphate
+            }
+        return self._cache
 
 
 class ElectrolytesSolver(Solver):
@@ -86,11 +92,13 @@ class ElectrolytesSolver(Solver):
         phos_change = self.phos_regulation_rate * (3.5 - es.state["phosphate"]) * dt
         new_phosphate = es.state["phosphate"] + phos_change
 
-        logger.debug(
-            f"ElectrolytesSolver: Na={new_sodium:.1f}, K={new_potassium:.1f}, "
-            f"Cl={new_chloride:.1f}, Ca={new_calcium:.1f}, "
-            f"Mg={new_magnesium:.1f}, Phos={new_phosphate:.1f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "ElectrolytesSolver: Na=%.1f, K=%.1f, "
+                "Cl=%.1f, Ca=%.1f, "
+                "Mg=%.1f, Phos=%.1f",
+                new_sodium, new_potassium, new_chloride, new_calcium, new_magnesium, new_phosphate
+            )
 
         return ElectrolytesState({
             "sodium": new_sodium,
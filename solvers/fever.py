@@ -5,19 +5,24 @@ logger = logging.getLogger(__name__)
 
 
 class FeverState(State):
+    __slots__ = ("_temperature", "_infection_level", "_antipyretic_level", "_cache")
+
     def __init__(self, data: dict):
         # Core temperature in Celsius
         self._temperature = data.get("temperature", 37.0)  # Normal is 37.0°C
         self._infection_level = data.get("infection_level", 0.0)  # 0-100 scale
         self._antipyretic_level = data.get("antipyretic_level", 0.0)  # medication level
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "temperature": self._temperature,
-            "infection_level": self._infection_level,
-            "antipyretic_level": self._antipyretic_level
-        }
+        if self._cache is None:
+            self._cache = {
+                "temperature": self._temperature,
+                "infection_level": self._infection_level,
+                "antipyretic_level": self._antipyretic_level
+            }
+        return self._cache
 
 
 class FeverSolver(Solver):
@@ -81,11 +86,13 @@ class FeverSolver(Solver):
         # Antipyretic level decreases over time
         new_antipyretic = max(0, fs.state["antipyretic_level"] - 0.2 * dt)
 
-        logger.debug(
-            f"FeverSolver: temp={new_temp:.1f}°C, "
-            f"infection={new_infection:.1f}, "
-            f"antipyretic={new_antipyretic:.1f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "FeverSolver: temp=%.1f°C, "
+                "infection=%.1f, "
+                "antipyretic=%.1f",
+                new_temp, new_infection, new_antipyretic
+            )
 
         return FeverState({
             "temperature": new_temp,
@@ -5,16 +5,21 @@ logger = logging.getLogger(__name__)
 
 
 class FluidsState(State):
+    __slots__ = ("_fluid_volume", "_cache")
+
     def __init__(self, data: dict):
         # We'll track total fluid volume in ml (just as an example)
         self._fluid_volume = data.get(
             "fluid_volume", 2000.0
         )  # e.g. 2000 ml as a baseline
         # Also track net fluid gain or loss each step.
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {"fluid_volume": self._fluid_volume}
+        if self._cache is None:
+            self._cache = {"fluid_volume": self._fluid_volume}
+        return self._cache
 
 
 class FluidsSolver(Solver):
@@ -40,6 +45,7 @@ class FluidsSolver(Solver):
         if new_vol < 0:
             new_vol = 0
 
-        logger.debug(f"FluidsSolver: volume from {vol_old:.2f} to {new_vol:.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("FluidsSolver: volume from %.2f to %.2f", vol_old, new_vol)
 
         return FluidsState({"fluid_volume": new_vol})
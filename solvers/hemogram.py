@@ -5,6 +5,9 @@ logger = logging.getLogger(__name__)
 
 
 class HemogramState(State):
+    __slots__ = ("_hemoglobin", "_hematocrit", "_wbc", "_neutrophils", "_lymphocytes",
+                 "_monocytes", "_eosinophils", "_basophils", "_rbc", "_cache")
+
     def __init__(self, data: dict):
         # Complete blood count parameters
         self._hemoglobin = data.get("hemoglobin", 14.0)  # g/dL (normal 12-16)
@@ -16,20 +19,23 @@ class HemogramState(State):
         self._eosinophils = data.get("eosinophils", 2.0)  # % (normal 1-4)
         self._basophils = data.get("basophils", 1.0)  # % (normal 0.5-1)
         self._rbc = data.get("rbc", 5.0)  # M/uL (normal 4.5-5.9)
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "hemoglobin": self._hemoglobin,
-            "hematocrit": self._hematocrit,
-            "wbc": self._wbc,
-            "neutrophils": self._neutrophils,
-            "lymphocytes": self._lymphocytes,
-            "monocytes": self._monocytes,
-            "eosinophils": self._eosinophils,
-            "basophils": self._basophils,
-            "rbc": self._rbc
-        }
+        if self._cache is None:
+            self._cache = {
+                "hemoglobin": self._hemoglobin,
+                "hematocrit": self._hematocrit,
+                "wbc": self._wbc,
+                "neutrophils": self._neutrophils,
+                "lymphocytes": self._lymphocytes,
+                "monocytes": self._monocytes,
+                "eosinophils": self._eosinophils,
+                "basophils": self._basophils,
+                "rbc": self._rbc
+            }
+        return self._cache
 
 
 class HemogramSolver(Solver):
@@ -92,11 +98,13 @@ class HemogramSolver(Solver):
                             (infection_level * 0.0005 * dt)))
         new_basophils = max(0, min(2, hs.state["basophils"]))  # Relatively stable
 
-        logger.debug(
-            f"HemogramSolver: Hgb={new_hgb:.1f}, Hct={new_hct:.1f}, "
-            f"WBC={new_wbc:.1f}, Neutrophils={new_neutrophils:.1f}%, "
-            f"RBC={new_rbc:.1f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "HemogramSolver: Hgb=%.1f, Hct=%.1f, "
+                "WBC=%.1f, Neutrophils=%.1f%%, "
+                "RBC=%.1f",
+                new_hgb, new_hct, new_wbc, new_neutrophils, new_rbc
+            )
 
         return HemogramState({
             "hemoglobin": new_hgb,
@@ -1,22 +1,28 @@
 import logging
+import math
 from classes import Solver, State
 
 logger = logging.getLogger(__name__)
 
 
 class LactateState(State):
+    __slots__ = ("_lactate", "_perfusion", "_cache")
+
     def __init__(self, data: dict):
         # Lactate level in mmol/L (normal range: 0.5-1.0)
         self._lactate = data.get("lactate", 0.8)
         # Tissue perfusion indicator (0-100%)
         self._perfusion = data.get("perfusion", 100.0)
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "lactate": self._lactate,
-            "perfusion": self._perfusion
-        }
+        if self._cache is None:
+            self._cache = {
+                "lactate": self._lactate,
+                "perfusion": self._perfusion
+            }
+        return self._cache
 
 
 class LactateSolver(Solver):
@@ -63,16 +69,24 @@ class LactateSolver(Solver):
         # Clearance is impaired with poor perfusion
         effective_clearance = self.clearance_rate * (new_perfusion / 100.0)
         
-        # Calculate lactate change
-        lactate_change = (production - 
-                         effective_clearance * ls.state["lactate"]) * dt
-        new_lactate = max(0, ls.state["lactate"] + lactate_change)
+        # With perfusion held at its updated value, dL/dt = production - k*L
+        # is linear, so integrate it exactly rather than with an Euler step.
+        # This stays stable and non-negative for any dt.
+        lactate_old = ls.state["lactate"]
+        if effective_clearance > 0:
+            steady_state = production / effective_clearance
+            new_lactate = steady_state + (lactate_old - steady_state) * math.exp(-effective_clearance * dt)
+        else:
+            # No clearance at zero perfusion: lactate simply accumulates
+            new_lactate = lactate_old + production * dt
 
-        logger.debug(
-            f"LactateSolver: lactate={new_lactate:.2f} mmol/L, "
-            f"perfusion={new_perfusion:.1f}%, "
-            f"BP={blood_pressure:.1f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "LactateSolver: lactate=%.2f mmol/L, "
+                "perfusion=%.1f%%, "
+                "BP=%.1f",
+                new_lactate, new_perfusion, blood_pressure
+            )
 
         return LactateState({
             "lactate": new_lactate,
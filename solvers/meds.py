@@ -1,43 +1,88 @@
 import logging
+import math
+import numpy as np
 from classes import Solver, State
 
 logger = logging.getLogger(__name__)
 
+# Column layout of the (n_patients, n_columns) arrays taken by solve_batch
+BATCH_COLUMNS = ("epinephrine",)
+EPI = 0
+
 
 class MedsState(State):
+    __slots__ = ("_epinephrine", "_cache")
+
     def __init__(self, data: dict):
         # We'll track some medication levels, e.g. epinephrine.
         self._epinephrine = data.get("epinephrine", 0.0)
+        self._cache = None
         # Could add more meds as needed.
 
+    @classmethod
+    def from_scalar(cls, epinephrine: float) -> "MedsState":
+        """Build a state straight from the epinephrine level, skipping dict parsing."""
+        ms = cls.__new__(cls)
+        ms._epinephrine = epinephrine
+        ms._cache = None
+        return ms
+
     @property
     def state(self) -> dict:
-        return {"epinephrine": self._epinephrine}
+        # Built on first access and reused; the state is not mutated afterwards
+        if self._cache is None:
+            self._cache = {"epinephrine": self._epinephrine}
+        return self._cache
 
 
 class MedsSolver(Solver):
+    batch_columns = BATCH_COLUMNS
+
     def __init__(self):
         # This solver handles these keys:
         self._state = MedsState({})
+        self.set_dt(1.0)
+
+    def set_dt(self, dt: float):
+        """Precompute the per-step epinephrine decay factor for this dt."""
+        self._dt = dt
+        # Exact solution of d(epi)/dt = -0.05 * epi; stays in (0, 1] for any dt
+        self._epi_decay = math.exp(-0.05 * dt)
 
     @property
     def state(self):
         return self._state.state
 
     def solve(self, state: dict, dt: float) -> State:
-        # Convert dict to typed state
-        ms = MedsState(state)
-        epi_old = ms.state["epinephrine"]
+        # Read the scalar directly; building a MedsState just to read it back is wasted work
+        epi_old = state.get("epinephrine", 0.0)
 
         # Example model:
         # We have an infusion that might be set externally as an "action" (or could be an internal rule).
-        # For now, let's do a simple elimination model: epi_new = epi_old - 0.05 * epi_old * dt
+        # For now, let's do a simple first-order elimination model: epi_new = epi_old * exp(-0.05 * dt)
         # so half-life type behavior.
-        elimination_rate = 0.05
-        new_epi = epi_old - elimination_rate * epi_old * dt
+        if dt != self._dt:
+            self.set_dt(dt)
+        new_epi = epi_old * self._epi_decay
         if new_epi < 0:
             new_epi = 0
 
-        logger.debug(f"MedsSolver: epinephrine from {epi_old:.2f} to {new_epi:.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("MedsSolver: epinephrine from %.2f to %.2f", epi_old, new_epi)
+
+        return MedsState.from_scalar(new_epi)
+
+    def solve_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Vectorised solve() over many independent patients.
 
-        return MedsState({"epinephrine": new_epi})
+        :param states: Array of shape (n_patients, len(BATCH_COLUMNS))
+        :param dt: Time step
+        :return: New array with the same layout and floating dtype
+        """
+        out = np.array(states, dtype=np.result_type(states.dtype, np.float32))
+        if dt != self._dt:
+            self.set_dt(dt)
+        out[:, EPI] *= self._epi_decay
+        np.maximum(out[:, EPI], 0.0, out=out[:, EPI])
+        return out
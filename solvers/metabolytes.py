@@ -1,11 +1,87 @@
 import logging
 import math
-from classes import Solver, State
+import numpy as np
+from classes import ParamCacheMixin, Solver, State
 
 logger = logging.getLogger(__name__)
 
+# log10(x) == ln(x) * log10(e); math.log is cheaper than math.log10
+_LOG10_E = 0.43429448190325176
+
+# Keys Master.parse_state always supplies to this solver; when all are present
+# solve indexes them directly instead of parsing through MetabolytesState.
+_REQUIRED = frozenset(("pco2", "hco3", "glucose", "ketones", "insulin"))
+
+# Column layout of the (n_patients, n_columns) arrays taken by solve_batch
+BATCH_COLUMNS = ("ph", "pco2", "hco3", "po2", "base_excess",
+                 "glucose", "ketones", "insulin", "oxy_saturation")
+(PH, PCO2, HCO3, PO2, BASE_EXCESS,
+ GLUCOSE, KETONES, INSULIN, OXY_SATURATION) = range(len(BATCH_COLUMNS))
+
+# Order of the continuous state vector used by rhs()/jacobian(). pH, PO2 and
+# base excess are algebraic functions of these, not independent ODE states.
+ODE_VARIABLES = ("pco2", "hco3", "glucose", "ketones", "insulin")
+
+
+def _metab_step(pco2, hco3, glucose, ketones, insulin, oxy_saturation,
+                glucose_baseline, insulin_sensitivity, relax_factor, insulin_relax_factor,
+                resp_factor, metab_factor):
+    """
+    One metabolytes tick on plain floats.
+
+    Kept free of dicts and ``self`` so it can be called per patient in a
+    tight loop (or handed to a JIT) without touching State objects.
+
+    Each compartment relaxes linearly towards a target that is held fixed
+    over the step, so it is advanced with the exact solution
+    x + (target - x) * (1 - exp(-k * dt)). The ``*_factor`` arguments are
+    those 1 - exp(-k * dt) terms (see MetabolytesSolver.set_dt).
+
+    :return: (ph, pco2, hco3, po2, base_excess, glucose, ketones, insulin)
+    """
+    # Update PO2 based on oxygen saturation
+    # Rough approximation using sigmoid relationship
+    new_po2 = 27.0 * oxy_saturation - 2560.0 / (oxy_saturation + 1.0)
+    new_po2 = max(40, min(150, new_po2))
+
+    # Glucose metabolism
+    # Affected by insulin levels and stress response:
+    # dG/dt = 0.05 * (baseline - G) - insulin_sensitivity * insulin
+    glucose_target = glucose_baseline - insulin_sensitivity * insulin / 0.05
+    new_glucose = max(40, glucose + (glucose_target - glucose) * relax_factor)
+
+    # Ketone production (increases with high glucose and low insulin),
+    # cleared at the same 0.05 rate as glucose
+    ketone_production = max(0, (new_glucose - 180) / 100.0) * (1.0 / (insulin + 1.0))
+    new_ketones = max(0, ketones + (ketone_production / 0.05 - ketones) * relax_factor)
+
+    # Insulin dynamics (targets normal glucose)
+    insulin_target = 10.0 + max(0, (new_glucose - 100.0) * 0.2)
+    new_insulin = max(0, insulin + (insulin_target - insulin) * insulin_relax_factor)
+
+    # pH dynamics
+    # Respiratory component
+    new_pco2 = max(20, min(80, pco2 + (40.0 - pco2) * resp_factor))
+
+    # Metabolic component (HCO3)
+    new_hco3 = max(10, min(40, hco3 + (24.0 - hco3) * metab_factor))
+
+    # Calculate new pH using Henderson-Hasselbalch
+    new_ph = 6.1 + math.log(new_hco3 / (0.03 * new_pco2)) * _LOG10_E
+    new_ph = max(6.8, min(7.8, new_ph))
+
+    # Base excess calculation
+    new_base_excess = ((new_hco3 - 24.0) +
+                       ((new_ph - 7.4) * (new_pco2 - 40.0) * 0.008))
+
+    return (new_ph, new_pco2, new_hco3, new_po2, new_base_excess,
+            new_glucose, new_ketones, new_insulin)
+
 
 class MetabolytesState(State):
+    __slots__ = ("_ph", "_pco2", "_hco3", "_po2", "_base_excess",
+                 "_glucose", "_ketones", "_insulin", "_cache")
+
     def __init__(self, data: dict):
         # Blood gases and acid-base
         self._ph = data.get("ph", 7.4)           # Normal: 7.35-7.45
@@ -18,22 +94,28 @@ class MetabolytesState(State):
         self._glucose = data.get("glucose", 100.0)  # Normal: 70-140 mg/dL
         self._ketones = data.get("ketones", 0.1)    # Normal: < 0.6 mmol/L
         self._insulin = data.get("insulin", 10.0)    # μU/mL
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "ph": self._ph,
-            "pco2": self._pco2,
-            "hco3": self._hco3,
-            "po2": self._po2,
-            "base_excess": self._base_excess,
-            "glucose": self._glucose,
-            "ketones": self._ketones,
-            "insulin": self._insulin
-        }
-
-
-class MetabolytesSolver(Solver):
+        if self._cache is None:
+            self._cache = {
+                "ph": self._ph,
+                "pco2": self._pco2,
+                "hco3": self._hco3,
+                "po2": self._po2,
+                "base_excess": self._base_excess,
+                "glucose": self._glucose,
+                "ketones": self._ketones,
+                "insulin": self._insulin
+            }
+        return self._cache
+
+
+class MetabolytesSolver(ParamCacheMixin, Solver):
+    batch_columns = BATCH_COLUMNS
+    _CACHE_PARAMS = frozenset(("respiratory_compensation_rate", "metabolic_compensation_rate"))
+
     def __init__(self,
                  glucose_baseline: float = 100.0,
                  insulin_sensitivity: float = 0.1,
@@ -52,62 +134,51 @@ class MetabolytesSolver(Solver):
         self.insulin_sensitivity = insulin_sensitivity
         self.respiratory_compensation_rate = respiratory_compensation_rate
         self.metabolic_compensation_rate = metabolic_compensation_rate
+        self.set_dt(1.0)
+
+    def set_dt(self, dt: float):
+        """
+        Precompute the exact relaxation factors 1 - exp(-k * dt) used every step.
+
+        solve() calls this itself whenever dt changes or one of _CACHE_PARAMS
+        is reassigned.
+        """
+        self._dt = dt
+        self._relax_factor = -math.expm1(-0.05 * dt)
+        self._insulin_relax_factor = -math.expm1(-0.1 * dt)
+        self._resp_factor = -math.expm1(-self.respiratory_compensation_rate * dt)
+        self._metab_factor = -math.expm1(-self.metabolic_compensation_rate * dt)
 
     @property
     def state(self):
         return self._state.state
 
     def solve(self, state: dict, dt: float) -> State:
-        ms = MetabolytesState(state)
-        
-        # Get oxygen saturation if available (affects metabolism)
-        oxy_saturation = state.get("oxy_saturation", 98.0)
-        
-        # Update PO2 based on oxygen saturation
-        # Rough approximation using sigmoid relationship
-        new_po2 = 27.0 * oxy_saturation - 2560.0 / (oxy_saturation + 1.0)
-        new_po2 = max(40, min(150, new_po2))
-        
-        # Glucose metabolism
-        # Affected by insulin levels and stress response
-        insulin_effect = self.insulin_sensitivity * ms.state["insulin"]
-        glucose_change = (self.glucose_baseline - ms.state["glucose"]) * 0.05 * dt
-        glucose_change -= insulin_effect * dt
-        new_glucose = max(40, ms.state["glucose"] + glucose_change)
-        
-        # Ketone production (increases with high glucose and low insulin)
-        ketone_production = max(0, (new_glucose - 180) / 100.0) * (1.0 / (ms.state["insulin"] + 1.0))
-        new_ketones = max(0, ms.state["ketones"] + (ketone_production - 0.05 * ms.state["ketones"]) * dt)
-        
-        # Insulin dynamics (targets normal glucose)
-        insulin_target = 10.0 + max(0, (new_glucose - 100.0) * 0.2)
-        insulin_change = (insulin_target - ms.state["insulin"]) * 0.1 * dt
-        new_insulin = max(0, ms.state["insulin"] + insulin_change)
-        
-        # pH dynamics
-        # Respiratory component
-        pco2_change = ((40.0 - ms.state["pco2"]) * 
-                      self.respiratory_compensation_rate * dt)
-        new_pco2 = max(20, min(80, ms.state["pco2"] + pco2_change))
-        
-        # Metabolic component (HCO3)
-        hco3_change = ((24.0 - ms.state["hco3"]) * 
-                      self.metabolic_compensation_rate * dt)
-        new_hco3 = max(10, min(40, ms.state["hco3"] + hco3_change))
-        
-        # Calculate new pH using Henderson-Hasselbalch
-        new_ph = 6.1 + math.log10((new_hco3 / 0.03) / new_pco2)
-        new_ph = max(6.8, min(7.8, new_ph))
-        
-        # Base excess calculation
-        new_base_excess = ((new_hco3 - 24.0) + 
-                         ((new_ph - 7.4) * (new_pco2 - 40.0) * 0.008))
+        if _REQUIRED <= state.keys():
+            pco2 = state["pco2"]
+            hco3 = state["hco3"]
+            glucose = state["glucose"]
+            ketones = state["ketones"]
+            insulin = state["insulin"]
+        else:
+            ms = MetabolytesState(state)
+            pco2, hco3 = ms._pco2, ms._hco3
+            glucose, ketones, insulin = ms._glucose, ms._ketones, ms._insulin
+        if dt != self._dt:
+            self.set_dt(dt)
+
+        (new_ph, new_pco2, new_hco3, new_po2, new_base_excess,
+         new_glucose, new_ketones, new_insulin) = _metab_step(
+            pco2, hco3, glucose, ketones, insulin,
+            state.get("oxy_saturation", 98.0),
+            self.glucose_baseline, self.insulin_sensitivity, self._relax_factor,
+            self._insulin_relax_factor, self._resp_factor, self._metab_factor)
 
-        logger.debug(
-            f"MetabolytesSolver: pH={new_ph:.2f}, "
-            f"pCO2={new_pco2:.1f}, HCO3={new_hco3:.1f}, "
-            f"Glucose={new_glucose:.1f}, Ketones={new_ketones:.2f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "MetabolytesSolver: pH=%.2f, pCO2=%.1f, HCO3=%.1f, Glucose=%.1f, Ketones=%.2f",
+                new_ph, new_pco2, new_hco3, new_glucose, new_ketones
+            )
 
         return MetabolytesState({
             "ph": new_ph,
@@ -118,4 +189,86 @@ class MetabolytesSolver(Solver):
             "glucose": new_glucose,
             "ketones": new_ketones,
             "insulin": new_insulin
-        })
\ No newline at end of file
+        })
+
+    def solve_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Vectorised solve() over many independent patients.
+
+        :param states: Array of shape (n_patients, len(BATCH_COLUMNS))
+        :param dt: Time step
+        :return: New array with the same layout and floating dtype; oxy_saturation
+                 is passed through
+        """
+        if dt != self._dt:
+            self.set_dt(dt)
+        relax_factor = self._relax_factor
+
+        out = np.array(states, dtype=np.result_type(states.dtype, np.float32))
+        glucose = states[:, GLUCOSE]
+        ketones = states[:, KETONES]
+        insulin = states[:, INSULIN]
+        oxy_saturation = states[:, OXY_SATURATION]
+
+        po2 = 27.0 * oxy_saturation - 2560.0 / (oxy_saturation + 1.0)
+        np.clip(po2, 40, 150, out=out[:, PO2])
+
+        glucose_target = self.glucose_baseline - self.insulin_sensitivity * insulin / 0.05
+        new_glucose = np.maximum(40, glucose + (glucose_target - glucose) * relax_factor)
+        out[:, GLUCOSE] = new_glucose
+
+        ketone_production = np.maximum(0, (new_glucose - 180) / 100.0) / (insulin + 1.0)
+        out[:, KETONES] = np.maximum(0, ketones + (ketone_production / 0.05 - ketones) * relax_factor)
+
+        insulin_target = 10.0 + np.maximum(0, (new_glucose - 100.0) * 0.2)
+        out[:, INSULIN] = np.maximum(0, insulin + (insulin_target - insulin) * self._insulin_relax_factor)
+
+        pco2 = states[:, PCO2]
+        new_pco2 = np.clip(pco2 + (40.0 - pco2) * self._resp_factor, 20, 80)
+        hco3 = states[:, HCO3]
+        new_hco3 = np.clip(hco3 + (24.0 - hco3) * self._metab_factor, 10, 40)
+        out[:, PCO2] = new_pco2
+        out[:, HCO3] = new_hco3
+
+        new_ph = np.clip(6.1 + np.log10(new_hco3 / (0.03 * new_pco2)), 6.8, 7.8)
+        out[:, PH] = new_ph
+        out[:, BASE_EXCESS] = (new_hco3 - 24.0) + (new_ph - 7.4) * (new_pco2 - 40.0) * 0.008
+
+        return out
+
+    def rhs(self, t: float, y: np.ndarray) -> np.ndarray:
+        """
+        Time derivative of the metabolytes system, unclamped.
+
+        Signature matches scipy.integrate.solve_ivp's ``fun``; ``y`` is ordered
+        as ODE_VARIABLES.
+        """
+        pco2, hco3, glucose, ketones, insulin = y
+        return np.array([
+            self.respiratory_compensation_rate * (40.0 - pco2),
+            self.metabolic_compensation_rate * (24.0 - hco3),
+            0.05 * (self.glucose_baseline - glucose) - self.insulin_sensitivity * insulin,
+            max(0.0, (glucose - 180.0) / 100.0) / (insulin + 1.0) - 0.05 * ketones,
+            0.1 * (10.0 + max(0.0, (glucose - 100.0) * 0.2) - insulin),
+        ])
+
+    def jacobian(self, t: float, y: np.ndarray) -> np.ndarray:
+        """
+        Analytic Jacobian of rhs() with respect to y, for implicit integrators.
+
+        Usable as ``solve_ivp(solver.rhs, ..., method="BDF", jac=solver.jacobian)``.
+        """
+        _, _, glucose, _, insulin = y
+        jac = np.zeros((5, 5))
+        jac[0, 0] = -self.respiratory_compensation_rate
+        jac[1, 1] = -self.metabolic_compensation_rate
+        jac[2, 2] = -0.05
+        jac[2, 4] = -self.insulin_sensitivity
+        if glucose > 180.0:
+            jac[3, 2] = 0.01 / (insulin + 1.0)
+            jac[3, 4] = -((glucose - 180.0) / 100.0) / (insulin + 1.0) ** 2
+        jac[3, 3] = -0.05
+        if glucose > 100.0:
+            jac[4, 2] = 0.02
+        jac[4, 4] = -0.1
+        return jac
@@ -1,9 +1,326 @@
 import logging
-import math
-from classes import Solver, State
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+from classes import ParamCacheMixin, Solver, State
+from solvers.batch import Cohort
 
 logger = logging.getLogger(__name__)
 
+# Keys Master.parse_state always supplies to this solver; when all are present
+# solve reads them directly instead of parsing through PressureHROxyState.
+_REQUIRED = frozenset(("systolic_bp", "diastolic_bp", "heart_rate",
+                       "oxy_saturation", "oxygen_debt", "end_diastolic_volume"))
+
+# Column layout of the (n_patients, n_columns) arrays taken by solve_batch;
+# epinephrine and fio2 are inputs and are passed through unchanged, and
+# blood_pressure is an output only (MAP, derived from systolic/diastolic).
+BATCH_COLUMNS = ("systolic_bp", "diastolic_bp", "heart_rate", "oxy_saturation",
+                 "oxygen_debt", "end_diastolic_volume", "epinephrine", "fio2",
+                 "blood_pressure")
+(SYSTOLIC, DIASTOLIC, HEART_RATE, OXY_SATURATION,
+ OXYGEN_DEBT, EDV, EPINEPHRINE, FIO2, BLOOD_PRESSURE) = range(len(BATCH_COLUMNS))
+
+# Order of the continuous state vector used by rhs()/jacobian(). SpO2 is an
+# algebraic function of FiO2, and oxygen debt just integrates it, so neither
+# is part of the stiff haemodynamic system.
+ODE_VARIABLES = ("systolic_bp", "diastolic_bp", "heart_rate", "end_diastolic_volume")
+
+
+def _alveolar_oxygen(fio2, patm_mmHg=760, ph2o_mmHg=47, rq=0.8):
+    """Simplified alveolar gas equation (PAO2) with PaCO2 fixed at 40 mmHg."""
+    assumed_pa_co2 = 40.0
+    return (fio2 * (patm_mmHg - ph2o_mmHg)) - (assumed_pa_co2 / rq)
+
+
+# Default Hill-equation parameters: P50 (mmHg) and coefficient, plus K**n
+HILL_K = 26.0
+HILL_N = 2.7
+_HILL_K_N = HILL_K ** HILL_N
+
+
+def _hill_spo2(pao2, hill_k=HILL_K, hill_n=HILL_N):
+    """SpO2 (%) from PAO2 via the Hill equation, clamped to 0-100."""
+    if pao2 < 0: # PAO2 can be negative if FiO2 is very low; no real power of a negative base
+        return 0.0
+    pao2_n = pao2 ** hill_n
+    # K**n is fixed for the default parameters, so only pay for it on custom ones
+    k_n = _HILL_K_N if hill_k == HILL_K and hill_n == HILL_N else hill_k ** hill_n
+    spo2 = (pao2_n / (pao2_n + k_n)) * 100.0
+    # Conditional expressions rather than max()/min(): same result, no call
+    spo2 = spo2 if spo2 < 100.0 else 100.0
+    return spo2 if spo2 > 0.0 else 0.0
+
+
+@lru_cache(maxsize=8)
+def _oxygenation(fio2):
+    """
+    (PAO2, SpO2) for the default alveolar-gas and Hill parameters.
+
+    Both depend on FiO2 alone, which takes only a handful of distinct values
+    in a run, so the per-step results are memoised. The alveolar equation is
+    folded to fio2 * (760 - 47) - 40 / 0.8.
+    """
+    pao2 = fio2 * 713 - 50.0
+    return pao2, _hill_spo2(pao2)
+
+
+def _solve_kernel(systolic_old, diastolic_old, hr_old, debt_old, edv_old, epi, fio2, dt_seconds,
+                  base_stroke_volume, k_preload, k_afterload, target_edv,
+                  max_stroke_volume, sv_to_systolic_factor,
+                  diastolic_target, inv_pressure_time_constant,
+                  half_epi_bp_factor, epi_hr_factor, baro_gain, map_setpoint,
+                  min_systolic, max_systolic, min_diastolic, max_diastolic,
+                  min_oxy, max_oxy, optimal_oxy, oxy_debt_accum_factor,
+                  filling_ratio_factor, edv_recovery_rate):
+    """
+    One explicit-Euler PressureHROxy step on plain floats; the numerical
+    core of PressureHROxySolver.solve, free of dicts and ``self``.
+
+    Parameters are those of PressureHROxySolver, except that the
+    step-invariant diastolic target, 1 / (compliance * 5) and
+    epi_bp_factor / 2 arrive precomputed (see _kernel_params).
+
+    :return: (systolic, diastolic, heart_rate, oxy_saturation, oxygen_debt,
+              end_diastolic_volume, pao2, stroke_volume)
+    """
+    # MAP is always derived from systolic/diastolic, as in PressureHROxyState.state
+    map_old = (systolic_old + 2 * diastolic_old) / 3
+
+    """
+    1) Blood Pressure update (Windkessel-like with separate systolic and diastolic components)
+       First calculate change in MAP
+    """
+    # Calculate initial stroke volume based on EDV and MAP
+    stroke_volume_calculated = base_stroke_volume + \
+                               k_preload * (edv_old - target_edv) - \
+                               k_afterload * (map_old - map_setpoint)
+    # Clamp stroke volume to physiological limits
+    stroke_volume_actual = (stroke_volume_calculated if stroke_volume_calculated < max_stroke_volume
+                            else max_stroke_volume)
+    stroke_volume_actual = stroke_volume_actual if stroke_volume_actual > 5.0 else 5.0
+
+    # Shared by both pressure components: epinephrine pushes SBP and DBP equally
+    bp_change_epi = half_epi_bp_factor * epi if epi else 0.0
+
+    # Systolic Pressure Calculation
+    systolic_target = diastolic_old + sv_to_systolic_factor * stroke_volume_actual
+    systolic_rate_of_change = (systolic_target - systolic_old) * inv_pressure_time_constant
+    systolic_new = systolic_old + (systolic_rate_of_change + bp_change_epi) * dt_seconds
+
+    # Diastolic Pressure Calculation
+    diastolic_rate_of_change = (diastolic_target - diastolic_old) * inv_pressure_time_constant
+    diastolic_new = diastolic_old + (diastolic_rate_of_change + bp_change_epi) * dt_seconds
+
+    """
+    2) Heart Rate update (Baroreflex + Epi effect)
+       dHR/dt = baro_gain*(map_setpoint - MAP_old) + epi_hr_factor*epi
+    """
+    dhr_dt = baro_gain * (map_setpoint - map_old)
+    if epi:
+        dhr_dt += epi_hr_factor * epi
+    hr_new = hr_old + dhr_dt * dt_seconds
+
+    """
+    3) End-Diastolic Volume update
+    """
+    # Effect of stroke volume not being fully replenished or being over-replenished per beat, scaled to per second
+    # hr_old is in BPM, so divide by 60 to get BPS (beats per second)
+    heart_rate_bps = hr_old / 60.0 if hr_old > 0 else 0 # Avoid division by zero if hr_old is 0
+    net_volume_change_from_beats_per_sec = heart_rate_bps * stroke_volume_actual * (filling_ratio_factor - 1.0)
+
+    # Effect of EDV regressing towards its target value (rate-based)
+    volume_change_from_recovery_per_sec = edv_recovery_rate * (target_edv - edv_old)
+
+    # Total rate of change for EDV
+    dedv_dt = net_volume_change_from_beats_per_sec + volume_change_from_recovery_per_sec
+
+    # Update EDV
+    edv_new = edv_old + dedv_dt * dt_seconds
+
+    return _finish_step(systolic_new, diastolic_new, hr_new, edv_new, debt_old, fio2, dt_seconds,
+                        stroke_volume_actual, min_systolic, max_systolic, min_diastolic,
+                        max_diastolic, min_oxy, max_oxy, optimal_oxy, oxy_debt_accum_factor)
+
+
+def _finish_step(systolic_new, diastolic_new, hr_new, edv_new, debt_old, fio2, dt_seconds,
+                 stroke_volume_actual, min_systolic, max_systolic, min_diastolic, max_diastolic,
+                 min_oxy, max_oxy, optimal_oxy, oxy_debt_accum_factor):
+    """
+    Apply the physiological limits to a raw integrator step and add the
+    algebraic oxygen terms; shared by the Euler and Runge-Kutta kernels.
+
+    :return: Same tuple as _solve_kernel
+    """
+    # Clamps are conditional expressions rather than nested max()/min():
+    # the same results without a builtin call each, which dominated this step
+    systolic_new = systolic_new if systolic_new < max_systolic else max_systolic
+    systolic_new = systolic_new if systolic_new > min_systolic else min_systolic
+    diastolic_new = diastolic_new if diastolic_new < max_diastolic else max_diastolic
+    diastolic_new = diastolic_new if diastolic_new > min_diastolic else min_diastolic
+
+    # Enforce a minimum pulse pressure in three stages, all skipped when
+    # the gap is already wide enough (solve_batch runs them branchlessly):
+    #   1) split the deficit between SBP and DBP,
+    #   2) if clamping left it narrow, lower DBP further,
+    #   3) if DBP hit its floor, raise SBP.
+    min_pulse_pressure = 10.0
+    half_deficit = (min_pulse_pressure - (systolic_new - diastolic_new)) / 2.0
+    if half_deficit > 0.0:
+        systolic_new += half_deficit
+        systolic_new = systolic_new if systolic_new < max_systolic else max_systolic
+        diastolic_new -= half_deficit
+        diastolic_new = diastolic_new if diastolic_new > min_diastolic else min_diastolic
+        # SBP only rises and DBP only falls above, so one-sided clamps suffice
+        limit = systolic_new - min_pulse_pressure
+        limit = limit if limit < max_diastolic else max_diastolic
+        limit = limit if limit > min_diastolic else min_diastolic
+        diastolic_new = diastolic_new if diastolic_new < limit else limit
+        limit = diastolic_new + min_pulse_pressure
+        limit = limit if limit < max_systolic else max_systolic
+        limit = limit if limit > min_systolic else min_systolic
+        systolic_new = systolic_new if systolic_new > limit else limit
+
+    # Heart rate and EDV floors (EDV no lower than the ventricular residual volume)
+    hr_new = hr_new if hr_new > 0.0 else 0.0
+    edv_new = edv_new if edv_new > 30.0 else 30.0
+
+    """
+    4) Oxygen saturation update
+       Uses alveolar oxygen partial pressure (PAO2) and Hill equation.
+    """
+    # PAO2 and the Hill-equation SpO2 it gives (memoised per FiO2)
+    pao2, oxy_new = _oxygenation(fio2)
+    
+    # Apply solver-specific min/max clamping for SpO2
+    # _hill_spo2 clamps between 0-100, this allows for narrower operational range if needed.
+    oxy_new = oxy_new if oxy_new < max_oxy else max_oxy
+    oxy_new = oxy_new if oxy_new > min_oxy else min_oxy
+
+    """
+    5) Oxygen Debt update
+       If oxy_new < optimal_oxy, accumulate debt.
+       e.g., dDebt/dt = (optimal_oxy - oxy_new) * factor
+    """
+    debt_new = debt_old
+    if oxy_new < optimal_oxy:
+        debt_new += (
+            (optimal_oxy - oxy_new) * oxy_debt_accum_factor * dt_seconds
+        )
+
+    return (systolic_new, diastolic_new, hr_new, oxy_new, debt_new, edv_new,
+            pao2, stroke_volume_actual)
+
+
+def _derivatives(systolic, diastolic, hr, edv, epi, params, _min=min, _max=max):
+    """
+    Unclamped time derivatives of (systolic, diastolic, heart_rate, EDV) per second.
+
+    These are the rates the Euler kernel applies, written once for the
+    Runge-Kutta stages. Pass np.minimum/np.maximum as ``_min``/``_max`` to evaluate over
+    arrays of patients.
+
+    :param params: Tuple from _derivative_params
+    :return: (d_systolic, d_diastolic, d_heart_rate, d_edv, stroke_volume)
+    """
+    (base_stroke_volume, k_preload, k_afterload, target_edv, max_stroke_volume,
+     sv_to_systolic_factor, diastolic_target, inv_pressure_time_constant, half_epi_bp_factor,
+     epi_hr_factor, baro_gain, map_setpoint, beat_volume_factor, edv_recovery_rate) = params
+    map_value = (systolic + 2 * diastolic) / 3
+    stroke_volume = _max(5.0, _min(base_stroke_volume
+                                   + k_preload * (edv - target_edv)
+                                   - k_afterload * (map_value - map_setpoint), max_stroke_volume))
+    bp_change_epi = half_epi_bp_factor * epi
+    d_systolic = ((diastolic + sv_to_systolic_factor * stroke_volume - systolic)
+                  * inv_pressure_time_constant + bp_change_epi)
+    d_diastolic = (diastolic_target - diastolic) * inv_pressure_time_constant + bp_change_epi
+    d_hr = baro_gain * (map_setpoint - map_value) + epi_hr_factor * epi
+    d_edv = (_max(hr, 0.0) * stroke_volume * beat_volume_factor
+             + edv_recovery_rate * (target_edv - edv))
+    return d_systolic, d_diastolic, d_hr, d_edv, stroke_volume
+
+
+def _derivative_params(kernel_params):
+    """Pick the tuple _derivatives expects out of PressureHROxySolver._kernel_params()."""
+    filling_ratio_factor, edv_recovery_rate = kernel_params[-2:]
+    return kernel_params[:12] + ((filling_ratio_factor - 1.0) / 60.0, edv_recovery_rate)
+
+
+def _rk2_increments(systolic, diastolic, hr, edv, epi, h, params, _min=min, _max=max):
+    """
+    Explicit midpoint (second-order Runge-Kutta) step of _derivatives over h seconds.
+
+    :return: (delta_systolic, delta_diastolic, delta_heart_rate, delta_edv,
+              stroke_volume at the start of the step)
+    """
+    s1, d1, r1, e1, stroke_volume = _derivatives(systolic, diastolic, hr, edv, epi, params, _min, _max)
+    half = h / 2
+    s2, d2, r2, e2, _ = _derivatives(systolic + half * s1, diastolic + half * d1,
+                                     hr + half * r1, edv + half * e1, epi, params, _min, _max)
+    return h * s2, h * d2, h * r2, h * e2, stroke_volume
+
+
+def _rk4_increments(systolic, diastolic, hr, edv, epi, h, params, _min=min, _max=max):
+    """
+    Classic fourth-order Runge-Kutta step of _derivatives over h seconds.
+
+    :return: (delta_systolic, delta_diastolic, delta_heart_rate, delta_edv,
+              stroke_volume at the start of the step)
+    """
+    s1, d1, r1, e1, stroke_volume = _derivatives(systolic, diastolic, hr, edv, epi, params, _min, _max)
+    half = h / 2
+    s2, d2, r2, e2, _ = _derivatives(systolic + half * s1, diastolic + half * d1,
+                                     hr + half * r1, edv + half * e1, epi, params, _min, _max)
+    s3, d3, r3, e3, _ = _derivatives(systolic + half * s2, diastolic + half * d2,
+                                     hr + half * r2, edv + half * e2, epi, params, _min, _max)
+    s4, d4, r4, e4, _ = _derivatives(systolic + h * s3, diastolic + h * d3,
+                                     hr + h * r3, edv + h * e3, epi, params, _min, _max)
+    sixth = h / 6
+    return (sixth * (s1 + 2 * (s2 + s3) + s4), sixth * (d1 + 2 * (d2 + d3) + d4),
+            sixth * (r1 + 2 * (r2 + r3) + r4), sixth * (e1 + 2 * (e2 + e3) + e4),
+            stroke_volume)
+
+
+def _runge_kutta_kernel(increments):
+    """
+    Build a drop-in alternative to _solve_kernel that advances the
+    haemodynamic states with ``increments`` (_rk2_increments or
+    _rk4_increments) instead of Euler, so much larger steps stay stable.
+    """
+    def kernel(systolic_old, diastolic_old, hr_old, debt_old, edv_old, epi, fio2, dt_seconds,
+               base_stroke_volume, k_preload, k_afterload, target_edv,
+               max_stroke_volume, sv_to_systolic_factor,
+               diastolic_target, inv_pressure_time_constant,
+               half_epi_bp_factor, epi_hr_factor, baro_gain, map_setpoint,
+               min_systolic, max_systolic, min_diastolic, max_diastolic,
+               min_oxy, max_oxy, optimal_oxy, oxy_debt_accum_factor,
+               filling_ratio_factor, edv_recovery_rate):
+        params = (base_stroke_volume, k_preload, k_afterload, target_edv, max_stroke_volume,
+                  sv_to_systolic_factor, diastolic_target, inv_pressure_time_constant,
+                  half_epi_bp_factor, epi_hr_factor, baro_gain, map_setpoint,
+                  (filling_ratio_factor - 1.0) / 60.0, edv_recovery_rate)
+        d_systolic, d_diastolic, d_hr, d_edv, stroke_volume = increments(
+            systolic_old, diastolic_old, hr_old, edv_old, epi, dt_seconds, params)
+        return _finish_step(systolic_old + d_systolic, diastolic_old + d_diastolic, hr_old + d_hr,
+                            edv_old + d_edv, debt_old, fio2, dt_seconds, stroke_volume,
+                            min_systolic, max_systolic, min_diastolic, max_diastolic,
+                            min_oxy, max_oxy, optimal_oxy, oxy_debt_accum_factor)
+    return kernel
+
+
+# Increment functions of the Runge-Kutta integrators, shared by solve and solve_batch
+_RUNGE_KUTTA = {"rk2": _rk2_increments, "rk4": _rk4_increments}
+
+_INTEGRATORS = {"euler": _solve_kernel,
+                **{name: _runge_kutta_kernel(inc) for name, inc in _RUNGE_KUTTA.items()}}
+
+# Patients per solve_batch call in solve_all. Blocks this size keep the
+# per-field temporaries cache-resident; one call over a million patients
+# streams every temporary through main memory and runs about half as fast.
+POPULATION_BLOCK = 16384
+
 
 class PressureHROxyState(State):
     """
@@ -16,11 +333,13 @@ class PressureHROxyState(State):
       - Oxygen Debt stored in 'oxygen_debt' (cumulative measure of insufficient O2)
     """
 
+    __slots__ = ("_systolic", "_diastolic", "_hr", "_oxy", "_oxy_debt",
+                 "_respiratory_rate", "_tidal_volume", "_fio2", "_edv", "_cache")
+
     def __init__(self, data: dict):
         self._systolic = data.get("systolic_bp", 120.0)  # Systolic BP in mmHg
         self._diastolic = data.get("diastolic_bp", 80.0)  # Diastolic BP in mmHg
-        # Calculate MAP from systolic and diastolic if not provided
-        self._bp = data.get("blood_pressure", self._calculate_map())
+        # MAP ('blood_pressure') is not stored; .state derives it from systolic/diastolic
         self._hr = data.get("heart_rate", 80.0)  # Beats per minute
         self._oxy = data.get("oxy_saturation", 98.0)  # Percent
         # We'll track oxygen debt as well, defaulting to 0.
@@ -31,6 +350,24 @@ class PressureHROxyState(State):
         self._tidal_volume = data.get("tidal_volume", 0.5)  # Liters
         self._fio2 = data.get("fio2", 0.21)  # Fraction of inspired oxygen
         self._edv = data.get("end_diastolic_volume", 120.0)  # End-diastolic volume in mL
+        self._cache = None
+
+    @classmethod
+    def from_values(cls, systolic: float, diastolic: float, hr: float, oxy: float,
+                    oxy_debt: float, edv: float) -> "PressureHROxyState":
+        """Build a state from solver outputs without parsing a dict; respiratory fields take their defaults."""
+        ps = cls.__new__(cls)
+        ps._systolic = systolic
+        ps._diastolic = diastolic
+        ps._hr = hr
+        ps._oxy = oxy
+        ps._oxy_debt = oxy_debt
+        ps._respiratory_rate = 12.0
+        ps._tidal_volume = 0.5
+        ps._fio2 = 0.21
+        ps._edv = edv
+        ps._cache = None
+        return ps
     
     def _calculate_map(self):
         """Calculate Mean Arterial Pressure from systolic and diastolic values"""
@@ -39,31 +376,57 @@ class PressureHROxyState(State):
 
     @property
     def state(self) -> dict:
-        # Always ensure MAP is calculated from current systolic/diastolic values
-        map_value = self._calculate_map()
-        return {
-            "systolic_bp": self._systolic,
-            "diastolic_bp": self._diastolic,
-            "blood_pressure": map_value,  # Keep for backward compatibility
-            "heart_rate": self._hr,
-            "oxy_saturation": self._oxy,
-            "oxygen_debt": self._oxy_debt,
-            "respiratory_rate": self._respiratory_rate,
-            "tidal_volume": self._tidal_volume,
-            "fio2": self._fio2,
-            "end_diastolic_volume": self._edv,
-
-        }
+        # States are never mutated after construction, so build the dict once
+        if self._cache is None:
+            # Always ensure MAP is calculated from current systolic/diastolic values
+            map_value = self._calculate_map()
+            self._cache = {
+                "systolic_bp": self._systolic,
+                "diastolic_bp": self._diastolic,
+                "blood_pressure": map_value,  # Keep for backward compatibility
+                "heart_rate": self._hr,
+                "oxy_saturation": self._oxy,
+                "oxygen_debt": self._oxy_debt,
+                "respiratory_rate": self._respiratory_rate,
+                "tidal_volume": self._tidal_volume,
+                "fio2": self._fio2,
+                "end_diastolic_volume": self._edv,
+            }
+        return self._cache
 
     def __iter__(self):
-        self._iter = iter(self.state.items())
-        return self
+        return iter(self.state.items())
+
+
+class PressureHROxyPopulation(Cohort):
+    """
+    Vitals for a population of patients: a Cohort over BATCH_COLUMNS, so a
+    solver can update the whole population without building per-patient
+    State objects or dicts.
+    """
+
+    __slots__ = ()
 
-    def __next__(self):
-        return next(self._iter)
+    def __init__(self, n: int, initial_state: dict = None, dtype=np.float64):
+        """
+        :param n: Number of patients
+        :param initial_state: Starting values shared by every patient; missing keys use
+                              PressureHROxyState defaults (and 0 epinephrine)
+        :param dtype: Floating dtype of the arrays. np.float32 halves memory traffic
+                      for large populations; vitals carry far fewer significant
+                      digits than single precision holds.
+        """
+        initial_state = initial_state or {}
+        defaults = dict(PressureHROxyState(initial_state).state,
+                        epinephrine=initial_state.get("epinephrine", 0.0))
+        super().__init__(BATCH_COLUMNS, n, defaults, dtype)
+
+    def view(self, i: int) -> PressureHROxyState:
+        """Snapshot of patient i as a PressureHROxyState."""
+        return PressureHROxyState(self.patient(i))
 
 
-class PressureHROxySolver(Solver):
+class PressureHROxySolver(ParamCacheMixin, Solver):
     """
     A more physiologically inspired solver for:
       - Systolic Blood Pressure
@@ -90,9 +453,30 @@ class PressureHROxySolver(Solver):
     This solver optionally reads 'epinephrine' from the global state to mimic
     inotropic/chronotropic effects.
 
-    All calculations: Euler step for dt in seconds.
+    All calculations: Euler step for dt in seconds, or Runge-Kutta with
+    integrator="rk2" (midpoint, two derivative evaluations per step) or
+    integrator="rk4" (classic, four evaluations); both stay accurate at
+    several times the Euler step size.
     """
 
+    batch_columns = BATCH_COLUMNS
+    # Any public parameter change invalidates the specialised kernel
+    _CACHE_ATTR = "_params"
+    _CACHE_PARAMS = None
+
+    __slots__ = (
+        "base_stroke_volume", "k_preload", "k_afterload", "target_edv",
+        "edv_recovery_rate", "max_stroke_volume", "filling_ratio_factor",
+        "compliance", "svr", "baro_gain", "map_setpoint",
+        "sv_to_systolic_factor", "svr_to_diastolic_factor", "base_diastolic_reference",
+        "oxy_recovery_rate", "oxy_drop_rate", "epi_hr_factor", "epi_bp_factor",
+        "min_oxy", "max_oxy", "min_systolic", "max_systolic",
+        "min_diastolic", "max_diastolic", "dt_unit_in_seconds",
+        "optimal_oxy", "oxy_debt_accum_factor",
+        "default_respiratory_rate", "default_tidal_volume", "default_fio2",
+        "integrator", "_kernel", "_params", "_dt_scale", "_state",
+    )
+
     def __init__(
         self,
         # stroke_volume: float = 1.0, # Removed
@@ -109,6 +493,7 @@ class PressureHROxySolver(Solver):
         map_setpoint: float = 90.0,
         sv_to_systolic_factor: float = 0.5,  # unit: mmHg/mL
         svr_to_diastolic_factor: float = 50.0,  # unit: mmHg/SVR unit
+        base_diastolic_reference: float = 70.0,  # mmHg at baseline SVR
         oxy_recovery_rate: float = 0.01,
         oxy_drop_rate: float = 0.02,
         epi_hr_factor: float = 0.5,
@@ -120,7 +505,7 @@ class PressureHROxySolver(Solver):
         min_diastolic: float = 20.0,
         max_diastolic: float = 120.0,
         dt_unit_in_seconds: bool = True,
-        initial_state: PressureHROxyState = PressureHROxyState({}),
+        initial_state: Optional[Union[PressureHROxyState, dict]] = None,
         # Oxygen debt related:
         optimal_oxy: float = 95.0,
         oxy_debt_accum_factor: float = 0.1,
@@ -128,6 +513,7 @@ class PressureHROxySolver(Solver):
         default_respiratory_rate: float = 12.0,  # breaths/min
         default_tidal_volume: float = 0.5,  # Liters
         default_fio2: float = 0.21,  # Fraction of inspired O2 (21%)
+        integrator: str = "euler",
     ):
         """
         :param base_stroke_volume: (mL) Baseline for stroke volume calculation.
@@ -143,6 +529,7 @@ class PressureHROxySolver(Solver):
         :param map_setpoint: The target MAP for baroreflex.
         :param sv_to_systolic_factor: Factor converting stroke volume to systolic pressure changes.
         :param svr_to_diastolic_factor: Factor converting SVR to diastolic pressure changes.
+        :param base_diastolic_reference: (mmHg) Diastolic target when SVR is at its baseline of 1.0.
         :param oxy_recovery_rate: Rate at which O2 sat returns to normal if perfusion is adequate.
         :param oxy_drop_rate: Rate at which O2 sat drops if MAP is too low.
         :param epi_hr_factor: How strongly epinephrine from global state raises HR.
@@ -151,12 +538,13 @@ class PressureHROxySolver(Solver):
         :param min_systolic, max_systolic: Hard clamp on systolic BP.
         :param min_diastolic, max_diastolic: Hard clamp on diastolic BP.
         :param dt_unit_in_seconds: If True, dt is in seconds. If your Master uses minutes or hours, you can set this accordingly.
-        :param initial_state: Initial state object.
+        :param initial_state: Initial state object or dict; missing EDV starts at target_edv.
         :param optimal_oxy: O2 threshold above which no oxygen debt accumulates.
         :param oxy_debt_accum_factor: scaling factor for how fast oxygen debt accumulates below optimal O2.
         :param default_respiratory_rate: Default respiratory rate in breaths/min.
         :param default_tidal_volume: Default tidal volume in Liters.
         :param default_fio2: Default fraction of inspired oxygen (e.g., 0.21 for room air).
+        :param integrator: "euler", "rk2" or "rk4" for the BP/HR/EDV dynamics.
         """
         # Store parameters
         # self.stroke_volume = stroke_volume # Removed
@@ -173,6 +561,7 @@ class PressureHROxySolver(Solver):
         self.map_setpoint = map_setpoint
         self.sv_to_systolic_factor = sv_to_systolic_factor
         self.svr_to_diastolic_factor = svr_to_diastolic_factor
+        self.base_diastolic_reference = base_diastolic_reference
         self.oxy_recovery_rate = oxy_recovery_rate
         self.oxy_drop_rate = oxy_drop_rate
         self.epi_hr_factor = epi_hr_factor
@@ -195,15 +584,17 @@ class PressureHROxySolver(Solver):
         self.default_tidal_volume = default_tidal_volume
         self.default_fio2 = default_fio2
 
-        if not isinstance(initial_state, PressureHROxyState):
-            # if initial_state is a dict, use it, otherwise use empty dict for defaults
-            init_data = initial_state if isinstance(initial_state, dict) else {}
-            # Ensure EDV is part of this initial data if not already
-            if "end_diastolic_volume" not in init_data:
-                init_data["end_diastolic_volume"] = self.target_edv # Or another appropriate default like 120.0
-            self._state = PressureHROxyState(init_data)
-        else:
+        if integrator not in _INTEGRATORS:
+            raise ValueError(f"Unknown integrator {integrator!r}; expected one of {sorted(_INTEGRATORS)}")
+        self.integrator = integrator
+
+        if isinstance(initial_state, PressureHROxyState):
             self._state = initial_state
+        else:
+            # Copy so the caller's dict is never modified
+            init_data = dict(initial_state) if isinstance(initial_state, dict) else {}
+            init_data.setdefault("end_diastolic_volume", self.target_edv)
+            self._state = PressureHROxyState(init_data)
 
     @property
     def state(self):
@@ -220,181 +611,310 @@ class PressureHROxySolver(Solver):
         using the simplified alveolar gas equation.
         Assumes a fixed PaCO2 of 40 mmHg.
         """
-        assumed_pa_co2 = 40.0
-        pao2 = (fio2 * (patm_mmHg - ph2o_mmHg)) - (assumed_pa_co2 / rq)
-        return pao2
+        return _alveolar_oxygen(fio2, patm_mmHg, ph2o_mmHg, rq)
 
-    def _calculate_spO2(self, pao2, hill_k=26.0, hill_n=2.7):
+    def _calculate_spO2(self, pao2, hill_k=HILL_K, hill_n=HILL_N):
         """
         Calculates estimated SpO2 (%) using the Hill equation.
         PaO2 is the partial pressure of alveolar oxygen.
         K is the P50 value (PaO2 at 50% saturation).
         n is the Hill coefficient.
         """
-        if pao2 < 0: # PAO2 can be negative if FiO2 is very low, leading to math domain error
-            return 0.0
-        try:
-            pao2_n = math.pow(pao2, hill_n)
-            k_n = math.pow(hill_k, hill_n)
-            spo2 = (pao2_n / (pao2_n + k_n)) * 100.0
-        except ValueError: # Should not happen with pao2 < 0 check, but as a safeguard
-            spo2 = 0.0
-        
-        # Clamp SpO2 between 0 and 100
-        return max(0.0, min(100.0, spo2))
+        return _hill_spo2(pao2, hill_k, hill_n)
+
+    def _specialize(self) -> tuple:
+        """
+        Bind the integrator kernel, its parameter tuple and the dt-to-seconds
+        scale for the current settings; solve reuses them until a parameter
+        is reassigned.
+        """
+        self._kernel = _INTEGRATORS[self.integrator]
+        self._dt_scale = 1.0 if self.dt_unit_in_seconds else 60.0
+        self._params = self._kernel_params()
+        return self._params
+
+    def _kernel_params(self) -> tuple:
+        """
+        Model parameters in the order _solve_kernel expects them, with the
+        terms that stay fixed between parameter changes folded in.
+        """
+        # SVR baseline is 1.0; factor 5 on compliance is for tuning
+        diastolic_target = (self.base_diastolic_reference
+                            + self.svr_to_diastolic_factor * (self.svr - 1.0))
+        return (self.base_stroke_volume, self.k_preload, self.k_afterload, self.target_edv,
+                self.max_stroke_volume, self.sv_to_systolic_factor,
+                diastolic_target, 1.0 / (self.compliance * 5.0),
+                self.epi_bp_factor / 2, self.epi_hr_factor, self.baro_gain, self.map_setpoint,
+                self.min_systolic, self.max_systolic, self.min_diastolic, self.max_diastolic,
+                self.min_oxy, self.max_oxy, self.optimal_oxy, self.oxy_debt_accum_factor,
+                self.filling_ratio_factor, self.edv_recovery_rate)
 
     def solve(self, state: dict, dt: float) -> State:
-        # Convert to typed state object
-        ps = PressureHROxyState(state)
-        systolic_old = ps.state["systolic_bp"]
-        diastolic_old = ps.state["diastolic_bp"]
-        map_old = ps.state["blood_pressure"]
-        hr_old = ps.state["heart_rate"]
-        oxy_old = ps.state["oxy_saturation"]
-        debt_old = ps.state["oxygen_debt"]
+        if _REQUIRED <= state.keys():
+            systolic_old = state["systolic_bp"]
+            diastolic_old = state["diastolic_bp"]
+            hr_old = state["heart_rate"]
+            oxy_old = state["oxy_saturation"]
+            debt_old = state["oxygen_debt"]
+            edv_old = state["end_diastolic_volume"]
+        else:
+            # Convert to typed state object to fill in defaults
+            ps = PressureHROxyState(state)
+            systolic_old = ps._systolic
+            diastolic_old = ps._diastolic
+            hr_old = ps._hr
+            oxy_old = ps._oxy
+            debt_old = ps._oxy_debt
+            edv_old = ps._edv
         # Retrieve respiratory parameters from state or use defaults
         current_fio2 = state.get('fio2', self.default_fio2)
         current_rr = state.get('respiratory_rate', self.default_respiratory_rate)
         current_tv = state.get('tidal_volume', self.default_tidal_volume)
-        edv_old = ps.state["end_diastolic_volume"]
 
         # Retrieve epinephrine if it exists
-        epi = 0.0
-        if "epinephrine" in state:
-            epi = state["epinephrine"]
+        epi = state.get("epinephrine", 0.0)
 
+        params = self._params or self._specialize()
         # dt conversion to seconds if needed
-        dt_seconds = dt if self.dt_unit_in_seconds else dt * 60.0
+        dt_seconds = dt * self._dt_scale
+        (systolic_new, diastolic_new, hr_new, oxy_new, debt_new, edv_new,
+         pao2, stroke_volume_actual) = self._kernel(
+            systolic_old, diastolic_old, hr_old, debt_old, edv_old, epi, current_fio2, dt_seconds,
+            *params)
+
+        # Building the argument list (two MAPs, 20 values) is wasted work on
+        # every tick when debug output is off, so skip the call entirely
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "PressureHROxySolver:\n"
+                "  Systolic BP: %.2f -> %.2f\n"
+                "  Diastolic BP: %.2f -> %.2f\n"
+                "  MAP: %.2f -> %.2f\n"
+                "  HR: %.1f -> %.1f, Epi=%.2f\n"
+                "  PAO2: %.2f mmHg (FiO2: %.2f, RR: %.1f, TV: %.2fL)\n"
+                "  O2 Sat: %.1f%% -> %.1f%%\n"
+                "  O2 Debt: %.2f -> %.2f\n"
+                "  EDV: %.2f -> %.2f, Stroke Volume: %.2f",
+                systolic_old, systolic_new,
+                diastolic_old, diastolic_new,
+                (systolic_old + 2 * diastolic_old) / 3, (systolic_new + 2 * diastolic_new) / 3,
+                hr_old, hr_new, epi,
+                pao2, current_fio2, current_rr, current_tv,
+                oxy_old, oxy_new,
+                debt_old, debt_new,
+                edv_old, edv_new, stroke_volume_actual
+            )
 
-        """
-        1) Blood Pressure update (Windkessel-like with separate systolic and diastolic components)
-           First calculate change in MAP
-        """
-        # Calculate initial stroke volume based on EDV and MAP
-        stroke_volume_calculated = self.base_stroke_volume + \
-                                   self.k_preload * (edv_old - self.target_edv) - \
-                                   self.k_afterload * (map_old - self.map_setpoint)
-        # Clamp stroke volume to physiological limits
-        stroke_volume_actual = max(5.0, min(stroke_volume_calculated, self.max_stroke_volume))
-
-        # Systolic Pressure Calculation
-        systolic_target = diastolic_old + self.sv_to_systolic_factor * stroke_volume_actual
-        systolic_change_potential = systolic_target - systolic_old
-        systolic_change_epi = (self.epi_bp_factor / 2) * epi 
-        systolic_rate_of_change = systolic_change_potential / (self.compliance * 5.0) # Factor 5 is for tuning
-        systolic_new = systolic_old + (systolic_rate_of_change + systolic_change_epi) * dt_seconds
-
-        # Diastolic Pressure Calculation
-        diastolic_target = self.base_diastolic_reference + self.svr_to_diastolic_factor * (self.svr - 1.0) # Assuming SVR default/baseline is 1.0
-        diastolic_change_potential = diastolic_target - diastolic_old
-        diastolic_change_epi = (self.epi_bp_factor / 2) * epi
-        diastolic_rate_of_change = diastolic_change_potential / (self.compliance * 5.0) # Factor 5 is for tuning
-        diastolic_new = diastolic_old + (diastolic_rate_of_change + diastolic_change_epi) * dt_seconds
-
-        # Apply constraints and recalculate MAP
-        systolic_new = max(min(systolic_new, self.max_systolic), self.min_systolic)
-        diastolic_new = max(min(diastolic_new, self.max_diastolic), self.min_diastolic)
-        
-        min_pulse_pressure = 10.0
-        if (systolic_new - diastolic_new) < min_pulse_pressure:
-            deficit = min_pulse_pressure - (systolic_new - diastolic_new)
-            adjust_sbp = deficit / 2.0
-            adjust_dbp = -deficit / 2.0
-
-            temp_sbp = systolic_new + adjust_sbp
-            temp_dbp = diastolic_new + adjust_dbp
-
-            systolic_new = max(min(temp_sbp, self.max_systolic), self.min_systolic)
-            diastolic_new = max(min(temp_dbp, self.max_diastolic), self.min_diastolic)
-
-            if (systolic_new - diastolic_new) < min_pulse_pressure:
-                diastolic_new = systolic_new - min_pulse_pressure
-                diastolic_new = max(min(diastolic_new, self.max_diastolic), self.min_diastolic)
-                if (systolic_new - diastolic_new) < min_pulse_pressure:
-                    systolic_new = diastolic_new + min_pulse_pressure
-                    systolic_new = max(min(systolic_new, self.max_systolic), self.min_systolic)
-        
-        map_new = (systolic_new + 2 * diastolic_new) / 3
+        return PressureHROxyState.from_values(
+            systolic_new, diastolic_new, hr_new, oxy_new, debt_new, edv_new)
 
+    def solve_batch(self, states: np.ndarray, dt: float, out: np.ndarray = None) -> np.ndarray:
         """
-        2) Heart Rate update (Baroreflex + Epi effect)
-           dHR/dt = baro_gain*(map_setpoint - MAP_old) + epi_hr_factor*epi
-        """
-        dhr_dt = self.baro_gain * (self.map_setpoint - map_old) + (
-            self.epi_hr_factor * epi
-        )
-        hr_new = hr_old + dhr_dt * dt_seconds
-        if hr_new < 0:
-            hr_new = 0
+        Vectorised solve() over many independent patients.
 
+        :param states: Array of shape (n_patients, len(BATCH_COLUMNS))
+        :param dt: Time step
+        :param out: Optional array to write the result into; may be ``states`` itself
+        :return: Array with the same layout, in the input's floating dtype
         """
-        3) Oxygen saturation update
-           Uses alveolar oxygen partial pressure (PAO2) and Hill equation.
+        if out is None:
+            # Keep float32 input in float32; anything non-floating is promoted
+            out = np.array(states, dtype=np.result_type(states.dtype, np.float32))
+        systolic_old = states[:, SYSTOLIC]
+        diastolic_old = states[:, DIASTOLIC]
+        hr_old = states[:, HEART_RATE]
+        edv_old = states[:, EDV]
+        epi = states[:, EPINEPHRINE]
+        dt_seconds = dt if self.dt_unit_in_seconds else dt * 60.0
+        min_systolic, max_systolic = self.min_systolic, self.max_systolic
+        min_diastolic, max_diastolic = self.min_diastolic, self.max_diastolic
+
+        # Chains below update their temporaries in place (out=) to avoid
+        # allocating a fresh array for every ufunc on large populations.
+        def clamp_sbp(x):
+            return np.maximum(min_systolic, np.minimum(max_systolic, x, out=x), out=x)
+
+        def clamp_dbp(x):
+            return np.maximum(min_diastolic, np.minimum(max_diastolic, x, out=x), out=x)
+
+        # 1) Raw BP/HR/EDV step, before the physiological limits
+        if self.integrator in _RUNGE_KUTTA:
+            params = _derivative_params(self._params or self._specialize())
+            systolic, diastolic, hr, edv, stroke_volume = _RUNGE_KUTTA[self.integrator](
+                systolic_old, diastolic_old, hr_old, edv_old, epi, dt_seconds, params,
+                np.minimum, np.maximum)
+            systolic += systolic_old
+            diastolic += diastolic_old
+            hr += hr_old
+            edv += edv_old
+        else:
+            systolic, diastolic, hr, edv, stroke_volume = self._euler_batch(
+                systolic_old, diastolic_old, hr_old, edv_old, epi, dt_seconds)
+
+        # 2) Limits: pressure clamps, then _finish_step's three-stage minimum
+        # pulse pressure correction, unconditionally (each stage is a no-op
+        # for patients whose gap is already wide enough)
+        clamp_sbp(systolic)
+        clamp_dbp(diastolic)
+        min_pulse_pressure = 10.0
+        half_deficit = min_pulse_pressure - (systolic - diastolic)
+        np.maximum(half_deficit, 0.0, out=half_deficit)
+        half_deficit /= 2.0
+        systolic += half_deficit
+        clamp_sbp(systolic)
+        diastolic -= half_deficit
+        clamp_dbp(diastolic)
+        np.minimum(diastolic, clamp_dbp(systolic - min_pulse_pressure), out=diastolic)
+        np.maximum(systolic, clamp_sbp(diastolic + min_pulse_pressure), out=systolic)
+        np.maximum(hr, 0.0, out=hr)
+        np.maximum(edv, 30.0, out=edv)
+
+        # 3) Oxygen saturation (Hill equation; negative PAO2 gives 0%)
+        pao2_n = np.maximum(_alveolar_oxygen(states[:, FIO2]), 0.0)
+        np.power(pao2_n, HILL_N, out=pao2_n)
+        oxy = pao2_n / (pao2_n + _HILL_K_N)
+        oxy *= 100.0
+        np.clip(oxy, 0.0, 100.0, out=oxy)
+        np.maximum(self.min_oxy, np.minimum(self.max_oxy, oxy, out=oxy), out=oxy)
+
+        # 4) Oxygen debt: accumulates only while below optimal_oxy
+        debt = self.optimal_oxy - oxy
+        np.maximum(debt, 0.0, out=debt)
+        debt *= self.oxy_debt_accum_factor * dt_seconds
+        debt += states[:, OXYGEN_DEBT]
+
+        # Every input has been read; safe to write even when out is states
+        out[:, SYSTOLIC] = systolic
+        out[:, DIASTOLIC] = diastolic
+        out[:, HEART_RATE] = hr
+        out[:, OXY_SATURATION] = oxy
+        out[:, OXYGEN_DEBT] = debt
+        out[:, EDV] = edv
+        diastolic *= 2.0
+        diastolic += systolic
+        diastolic /= 3.0
+        out[:, BLOOD_PRESSURE] = diastolic
+        if out is not states:
+            out[:, EPINEPHRINE] = epi
+            out[:, FIO2] = states[:, FIO2]
+        return out
+
+    def _euler_batch(self, systolic_old, diastolic_old, hr_old, edv_old, epi, dt_seconds):
+        """Unclamped Euler step of solve_batch; returns fresh (systolic, diastolic, hr, edv, stroke_volume)."""
+        map_old = systolic_old + 2 * diastolic_old
+        map_old /= 3
+        stroke_volume = edv_old - self.target_edv
+        stroke_volume *= self.k_preload
+        stroke_volume -= self.k_afterload * (map_old - self.map_setpoint)
+        stroke_volume += self.base_stroke_volume
+        np.maximum(5.0, np.minimum(stroke_volume, self.max_stroke_volume, out=stroke_volume),
+                   out=stroke_volume)
+        bp_change_epi = (self.epi_bp_factor / 2) * epi
+        inv_pressure_time_constant = 1.0 / (self.compliance * 5.0)
+        diastolic_target = (self.base_diastolic_reference
+                            + self.svr_to_diastolic_factor * (self.svr - 1.0))
+
+        systolic = self.sv_to_systolic_factor * stroke_volume    # systolic target ...
+        systolic += diastolic_old
+        systolic -= systolic_old                                 # ... minus current SBP
+        systolic *= inv_pressure_time_constant
+        systolic += bp_change_epi
+        systolic *= dt_seconds
+        systolic += systolic_old
+
+        diastolic = diastolic_target - diastolic_old
+        diastolic *= inv_pressure_time_constant
+        diastolic += bp_change_epi
+        diastolic *= dt_seconds
+        diastolic += diastolic_old
+
+        hr = self.map_setpoint - map_old
+        hr *= self.baro_gain
+        hr += self.epi_hr_factor * epi
+        hr *= dt_seconds
+        hr += hr_old
+
+        edv = np.maximum(hr_old, 0.0)
+        edv *= stroke_volume
+        edv *= (self.filling_ratio_factor - 1.0) / 60.0
+        edv += self.edv_recovery_rate * (self.target_edv - edv_old)
+        edv *= dt_seconds
+        edv += edv_old
+        return systolic, diastolic, hr, edv, stroke_volume
+
+    def solve_into(self, population: PressureHROxyPopulation, i: int, dt: float):
+        """Advance patient i of the population in place."""
+        row = population._data[:, i]
+        params = self._params or self._specialize()
+        dt_seconds = dt * self._dt_scale
+        (row[SYSTOLIC], row[DIASTOLIC], row[HEART_RATE], row[OXY_SATURATION],
+         row[OXYGEN_DEBT], row[EDV], _, _) = self._kernel(
+            row[SYSTOLIC], row[DIASTOLIC], row[HEART_RATE], row[OXYGEN_DEBT], row[EDV],
+            row[EPINEPHRINE], row[FIO2], dt_seconds, *params)
+        row[BLOOD_PRESSURE] = (row[SYSTOLIC] + 2 * row[DIASTOLIC]) / 3
+
+    def solve_all(self, population: PressureHROxyPopulation, dt: float, workers: int = 1):
         """
-        # Calculate PAO2
-        pao2 = self._calculate_alveolar_oxygen(fio2=current_fio2)
-
-        # Calculate SpO2 based on PAO2
-        oxy_new = self._calculate_spO2(pao2)
-        
-        # Apply solver-specific min/max clamping for SpO2
-        # _calculate_spO2 clamps between 0-100, this allows for narrower operational range if needed.
-        if oxy_new < self.min_oxy:
-            oxy_new = self.min_oxy
-        elif oxy_new > self.max_oxy:
-            oxy_new = self.max_oxy
+        Advance every patient of the population in place.
 
+        :param workers: Threads to spread the blocks over. NumPy releases the
+                        GIL inside its ufuncs, so blocks run concurrently.
         """
-        4) Oxygen Debt update
-           If oxy_new < optimal_oxy, accumulate debt.
-           e.g., dDebt/dt = (optimal_oxy - oxy_new) * factor
+        data = population._data.T
+        if len(data) <= POPULATION_BLOCK:
+            self.solve_batch(data, dt, out=data)
+            return
+        blocks = [data[start:start + POPULATION_BLOCK]
+                  for start in range(0, len(data), POPULATION_BLOCK)]
+        if workers > 1:
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(lambda block: self.solve_batch(block, dt, out=block), blocks))
+        else:
+            for block in blocks:
+                self.solve_batch(block, dt, out=block)
+
+    def rhs(self, t: float, y: np.ndarray, epi: float = 0.0) -> np.ndarray:
         """
-        debt_new = debt_old
-        if oxy_new < self.optimal_oxy:
-            debt_new += (
-                (self.optimal_oxy - oxy_new) * self.oxy_debt_accum_factor * dt_seconds
-            )
+        Time derivative (per second) of the haemodynamic system, unclamped.
 
+        Signature matches scipy.integrate.solve_ivp's ``fun``; ``y`` is ordered
+        as ODE_VARIABLES and epinephrine can be supplied through ``args=(epi,)``.
         """
-        5) End-Diastolic Volume update
+        systolic, diastolic, hr, edv = y
+        params = _derivative_params(self._params or self._specialize())
+        return np.array(_derivatives(systolic, diastolic, hr, edv, epi, params)[:4])
+
+    def jacobian(self, t: float, y: np.ndarray, epi: float = 0.0) -> np.ndarray:
         """
-        # Effect of stroke volume not being fully replenished or being over-replenished per beat, scaled to per second
-        # hr_old is in BPM, so divide by 60 to get BPS (beats per second)
-        heart_rate_bps = hr_old / 60.0 if hr_old > 0 else 0 # Avoid division by zero if hr_old is 0
-        net_volume_change_from_beats_per_sec = heart_rate_bps * stroke_volume_actual * (self.filling_ratio_factor - 1.0)
-
-        # Effect of EDV regressing towards its target value (rate-based)
-        volume_change_from_recovery_per_sec = self.edv_recovery_rate * (self.target_edv - edv_old)
-
-        # Total rate of change for EDV
-        dedv_dt = net_volume_change_from_beats_per_sec + volume_change_from_recovery_per_sec
-
-        # Update EDV
-        edv_new = edv_old + dedv_dt * dt_seconds
-
-        # Ensure EDV does not become unrealistically low (e.g., less than a minimum residual volume)
-        edv_new = max(30.0, edv_new) # Clamp EDV, e.g., min 30mL (ventricular residual volume)
-
-
-        logger.debug(
-            f"PressureHROxySolver:\n"
-            f"  Systolic BP: {systolic_old:.2f} -> {systolic_new:.2f} (Target: {systolic_target:.2f})\n"
-            f"  Diastolic BP: {diastolic_old:.2f} -> {diastolic_new:.2f} (Target: {diastolic_target:.2f})\n"
-            f"  MAP: {map_old:.2f} -> {map_new:.2f}\n"
-            f"  HR: {hr_old:.1f} -> {hr_new:.1f}, dHR/dt={dhr_dt:.3f}, Epi={epi:.2f}\n"
-            f"  PAO2: {pao2:.2f} mmHg (FiO2: {current_fio2:.2f}, RR: {current_rr:.1f}, TV: {current_tv:.2f}L)\n"
-            f"  O2 Sat: {oxy_old:.1f}% -> {oxy_new:.1f}%\n"
-            f"  O2 Debt: {debt_old:.2f} -> {debt_new:.2f}\n"
-            f"  EDV: {edv_old:.2f} -> {edv_new:.2f}, dEDV/dt={dedv_dt:.3f}, Stroke Volume: {stroke_volume_actual:.2f}"
-        )
+        Analytic Jacobian of rhs() with respect to y, for implicit integrators.
 
-        return PressureHROxyState(
-            {
-                "systolic_bp": systolic_new,
-                "diastolic_bp": diastolic_new,
-                "heart_rate": hr_new,
-                "oxy_saturation": oxy_new,
-                "oxygen_debt": debt_new,
-                "end_diastolic_volume": edv_new,
-            }
-        )
+        Usable as ``solve_ivp(solver.rhs, ..., method="LSODA", jac=solver.jacobian)``.
+        """
+        systolic, diastolic, hr, edv = y
+        (base_stroke_volume, k_preload, k_afterload, target_edv, max_stroke_volume,
+         sv_to_systolic_factor, _, inv_pressure_time_constant, _,
+         _, baro_gain, map_setpoint, beat_volume_factor, edv_recovery_rate) = \
+            _derivative_params(self._params or self._specialize())
+        map_value = (systolic + 2 * diastolic) / 3
+        stroke_volume = (base_stroke_volume + k_preload * (edv - target_edv)
+                         - k_afterload * (map_value - map_setpoint))
+        # Stroke volume sensitivities vanish once it sits on a clamp
+        if 5.0 < stroke_volume < max_stroke_volume:
+            dsv = np.array([-k_afterload / 3, -2 * k_afterload / 3, 0.0, k_preload])
+        else:
+            dsv = np.zeros(4)
+            stroke_volume = max(5.0, min(stroke_volume, max_stroke_volume))
+        beats = max(hr, 0.0) * beat_volume_factor
+
+        jac = np.zeros((4, 4))
+        jac[0] = sv_to_systolic_factor * inv_pressure_time_constant * dsv
+        jac[0, 0] -= inv_pressure_time_constant
+        jac[0, 1] += inv_pressure_time_constant
+        jac[1, 1] = -inv_pressure_time_constant
+        jac[2, 0] = -baro_gain / 3
+        jac[2, 1] = -2 * baro_gain / 3
+        jac[3] = beats * dsv
+        if hr > 0:
+            jac[3, 2] = stroke_volume * beat_volume_factor
+        jac[3, 3] -= edv_recovery_rate
+        return jac
@@ -1,11 +1,37 @@
 import logging
 import random
+from typing import Optional
+
+import numpy as np
 from classes import Solver, State
 
 logger = logging.getLogger(__name__)
 
+# Rhythm types
+SINUS, AFIB, VFIB, VTACH, ARREST = range(5)
+
+# Arrhythmia onset, indexed by (potassium > 7) << 2 | (oxygen_debt > 50) << 1 | (HR > 180):
+# severe hyperkalemia -> arrest, else severe hypoxia -> VFib, else extreme
+# tachycardia -> VTach, otherwise AFib
+_ONSET_RHYTHM = (AFIB, VTACH, VFIB, VFIB, ARREST, ARREST, ARREST, ARREST)
+_ONSET_RHYTHM_ARRAY = np.array(_ONSET_RHYTHM)
+
+# Column layout of the (n_patients, n_columns) arrays taken by solve_batch;
+# heart_rate, potassium and oxygen_debt are inputs and are passed through unchanged.
+BATCH_COLUMNS = ("rhythm_type", "pr_interval", "qrs_duration", "qt_interval", "heart_block",
+                 "rr_variability", "heart_rate", "potassium", "oxygen_debt")
+(RHYTHM_TYPE, PR_INTERVAL, QRS_DURATION, QT_INTERVAL, HEART_BLOCK,
+ RR_VARIABILITY, HEART_RATE, POTASSIUM, OXYGEN_DEBT) = range(len(BATCH_COLUMNS))
+
+# Keys Master.parse_state always supplies to this solver; when all are present
+# solve reads them straight from the dict instead of building a RhythmState.
+_REQUIRED = frozenset(("rhythm_type", "pr_interval", "qrs_duration", "qt_interval",
+                       "heart_block", "rr_variability"))
+
 
 class RhythmState(State):
+    __slots__ = ("_rhythm_type", "_pr_interval", "_qrs_duration", "_qt_interval", "_heart_block", "_rr_variability", "_cache")
+
     def __init__(self, data: dict):
         # Rhythm classification (0=normal sinus, 1=afib, 2=vfib, etc.)
         self._rhythm_type = data.get("rhythm_type", 0)
@@ -19,46 +45,69 @@ class RhythmState(State):
         self._heart_block = data.get("heart_block", 0)
         # R-R variability for rhythm irregularity
         self._rr_variability = data.get("rr_variability", 0.0)
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "rhythm_type": self._rhythm_type,
-            "pr_interval": self._pr_interval,
-            "qrs_duration": self._qrs_duration,
-            "qt_interval": self._qt_interval,
-            "heart_block": self._heart_block,
-            "rr_variability": self._rr_variability
-        }
+        if self._cache is None:
+            self._cache = {
+                "rhythm_type": self._rhythm_type,
+                "pr_interval": self._pr_interval,
+                "qrs_duration": self._qrs_duration,
+                "qt_interval": self._qt_interval,
+                "heart_block": self._heart_block,
+                "rr_variability": self._rr_variability
+            }
+        return self._cache
 
 
 class RhythmSolver(Solver):
+    batch_columns = BATCH_COLUMNS
+
     def __init__(self,
                  arrhythmia_threshold: float = 0.7,
-                 conduction_recovery_rate: float = 0.05):
+                 conduction_recovery_rate: float = 0.05,
+                 seed: Optional[int] = None):
         """
         Initialize rhythm solver with conduction parameters
         
         :param arrhythmia_threshold: Threshold for developing arrhythmias
         :param conduction_recovery_rate: Rate of conduction recovery
+        :param seed: Seed for this solver's random streams; None seeds from the OS
         """
         self._state = RhythmState({})
         self.arrhythmia_threshold = arrhythmia_threshold
         self.conduction_recovery_rate = conduction_recovery_rate
+        # Private streams, so runs are reproducible and independent of the
+        # global random module. random.Random is the cheaper per-draw source
+        # for scalar solve(); solve_batch fills whole arrays from a PCG64.
+        self._rng = random.Random(seed)
+        self._batch_rng = np.random.default_rng(seed)
         
         # Constants for rhythm types
-        self.SINUS = 0
-        self.AFIB = 1
-        self.VFIB = 2
-        self.VTACH = 3
-        self.ARREST = 4
+        self.SINUS = SINUS
+        self.AFIB = AFIB
+        self.VFIB = VFIB
+        self.VTACH = VTACH
+        self.ARREST = ARREST
 
     @property
     def state(self):
         return self._state.state
 
     def solve(self, state: dict, dt: float) -> State:
-        rs = RhythmState(state)
+        if _REQUIRED <= state.keys():
+            rhythm_type = state["rhythm_type"]
+            new_pr = state["pr_interval"]
+            new_qrs = state["qrs_duration"]
+            new_qt = state["qt_interval"]
+            new_block = state["heart_block"]
+            new_variability = state["rr_variability"]
+        else:
+            rs = RhythmState(state)
+            rhythm_type = rs._rhythm_type
+            new_pr, new_qrs, new_qt = rs._pr_interval, rs._qrs_duration, rs._qt_interval
+            new_block, new_variability = rs._heart_block, rs._rr_variability
         
         # Get relevant physiological parameters if available
         heart_rate = state.get("heart_rate", 80.0)
@@ -75,29 +124,17 @@ class RhythmSolver(Solver):
         arrhythmia_risk += min(0.5, oxygen_debt / 100.0)
         
         # Determine new rhythm
-        new_rhythm = rs.state["rhythm_type"]
-        if random.random() < arrhythmia_risk * dt:
+        new_rhythm = rhythm_type
+        if self._rng.random() < arrhythmia_risk * dt:
             if arrhythmia_risk > self.arrhythmia_threshold:
-                if potassium > 7.0:  # Severe hyperkalemia
-                    new_rhythm = self.ARREST
-                elif oxygen_debt > 50:  # Severe hypoxia
-                    new_rhythm = self.VFIB
-                elif heart_rate > 180:  # Extreme tachycardia
-                    new_rhythm = self.VTACH
-                else:
-                    new_rhythm = self.AFIB
+                new_rhythm = _ONSET_RHYTHM[(potassium > 7.0) << 2 | (oxygen_debt > 50) << 1
+                                           | (heart_rate > 180)]
         elif new_rhythm != self.SINUS:
             # Chance of spontaneous conversion to sinus
-            if random.random() < self.conduction_recovery_rate * dt:
+            if self._rng.random() < self.conduction_recovery_rate * dt:
                 new_rhythm = self.SINUS
         
         # Update conduction intervals based on rhythm and conditions
-        new_pr = rs.state["pr_interval"]
-        new_qrs = rs.state["qrs_duration"]
-        new_qt = rs.state["qt_interval"]
-        new_block = rs.state["heart_block"]
-        new_variability = rs.state["rr_variability"]
-        
         if new_rhythm == self.SINUS:
             # PR interval affected by conduction and K+
             pr_change = ((160.0 - new_pr) * 
@@ -140,17 +177,19 @@ class RhythmSolver(Solver):
 
         # Heart block progression
         if potassium > 6.0:  # Hyperkalemia can cause heart block
-            if random.random() < 0.1 * dt:
+            if self._rng.random() < 0.1 * dt:
                 new_block = min(3, new_block + 1)
         elif new_block > 0:  # Possible recovery
-            if random.random() < self.conduction_recovery_rate * dt:
+            if self._rng.random() < self.conduction_recovery_rate * dt:
                 new_block = max(0, new_block - 1)
 
-        logger.debug(
-            f"RhythmSolver: type={new_rhythm}, "
-            f"PR={new_pr:.0f}, QRS={new_qrs:.0f}, "
-            f"QT={new_qt:.0f}, block={new_block}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RhythmSolver: type=%s, "
+                "PR=%.0f, QRS=%.0f, "
+                "QT=%.0f, block=%s",
+                new_rhythm, new_pr, new_qrs, new_qt, new_block
+            )
 
         return RhythmState({
             "rhythm_type": new_rhythm,
@@ -159,4 +198,56 @@ class RhythmSolver(Solver):
             "qt_interval": new_qt,
             "heart_block": new_block,
             "rr_variability": new_variability
-        })
\ No newline at end of file
+        })
+
+    def solve_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Vectorised solve() over many independent patients.
+
+        Every patient draws all four uniforms each step (onset, conversion,
+        block progression, block recovery), so streams differ from solve()
+        even with the same seed; the transition probabilities are the same.
+
+        :param states: Array of shape (n_patients, len(BATCH_COLUMNS))
+        :param dt: Time step
+        :return: New array with the same layout and floating dtype; heart_rate, potassium and
+                 oxygen_debt are passed through
+        """
+        out = np.array(states, dtype=np.result_type(states.dtype, np.float32))
+        heart_rate = states[:, HEART_RATE]
+        potassium = states[:, POTASSIUM]
+        oxygen_debt = states[:, OXYGEN_DEBT]
+        rhythm = states[:, RHYTHM_TYPE]
+        recovery = self.conduction_recovery_rate * dt
+        onset_draw, conversion_draw, block_draw, unblock_draw = self._batch_rng.random((4, len(states)))
+
+        arrhythmia_risk = (0.3 * ((heart_rate > 150) | (heart_rate < 40))
+                           + 0.4 * ((potassium > 6.0) | (potassium < 2.5))
+                           + np.minimum(0.5, oxygen_debt / 100.0))
+        disturbed = onset_draw < arrhythmia_risk * dt
+        onset = disturbed & (arrhythmia_risk > self.arrhythmia_threshold)
+        mask = (potassium > 7.0) * 4 + (oxygen_debt > 50) * 2 + (heart_rate > 180)
+        new_rhythm = np.where(onset, _ONSET_RHYTHM_ARRAY[mask], rhythm)
+        new_rhythm[~disturbed & (rhythm != SINUS) & (conversion_draw < recovery)] = SINUS
+        out[:, RHYTHM_TYPE] = new_rhythm
+
+        pr, qrs, qt = states[:, PR_INTERVAL], states[:, QRS_DURATION], states[:, QT_INTERVAL]
+        variability = states[:, RR_VARIABILITY]
+        qt_target = 400.0 - (0.5 * (heart_rate - 60))
+        qt_target += np.where(potassium < 3.5, (3.5 - potassium) * 50, 0.0)  # hypokalemia
+        rhythms = [new_rhythm == r for r in (SINUS, AFIB, VFIB, VTACH, ARREST)]
+        rate = self.conduction_recovery_rate
+        out[:, PR_INTERVAL] = np.select(rhythms, [pr + (160.0 - pr) * rate * dt, 0, 0, 0, 0], pr)
+        out[:, QRS_DURATION] = np.select(
+            rhythms, [qrs + (80.0 - qrs) * rate * dt, qrs, 300, np.minimum(200, qrs + 20 * dt), 0], qrs)
+        out[:, QT_INTERVAL] = np.select(rhythms, [qt + (qt_target - qt) * 0.1 * dt, qt, qt, qt, 0], qt)
+        out[:, RR_VARIABILITY] = np.select(
+            rhythms, [np.maximum(0, variability - 0.2 * dt), np.minimum(1.0, variability + 0.3 * dt),
+                      1.0, 0.1, 0], variability)
+
+        block = states[:, HEART_BLOCK]
+        hyperkalemia = potassium > 6.0
+        block = np.where(hyperkalemia & (block_draw < 0.1 * dt), np.minimum(3, block + 1), block)
+        out[:, HEART_BLOCK] = np.where(~hyperkalemia & (block > 0) & (unblock_draw < recovery),
+                                       np.maximum(0, block - 1), block)
+        return out
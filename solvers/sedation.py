@@ -1,10 +1,57 @@
 import logging
-from classes import Solver, State
+import math
+from bisect import bisect_right
+
+import numpy as np
+from classes import ParamCacheMixin, Solver, State
 
 logger = logging.getLogger(__name__)
 
+# Column layout of the (n_patients, n_columns) arrays taken by solve_batch
+BATCH_COLUMNS = ("sedation_score", "consciousness", "propofol", "midazolam", "dexmedetomidine")
+SEDATION_SCORE, CONSCIOUSNESS, PROPOFOL, MIDAZOLAM, DEXMEDETOMIDINE = range(len(BATCH_COLUMNS))
+
+# Lower consciousness bound of sedation scores 4, 3, 2, 1 and 0
+_SCORE_BOUNDS = (10.0, 30.0, 50.0, 70.0, 90.0)
+_SCORE_THRESHOLDS = np.array(_SCORE_BOUNDS)
+
+# Keys Master.parse_state always supplies to this solver; when all are present
+# solve reads them straight from the dict instead of building a SedationState.
+_REQUIRED = frozenset(("consciousness", "propofol", "midazolam", "dexmedetomidine"))
+
+
+def _sedation_step(propofol, midazolam, dexmedetomidine, consciousness, dt,
+                   drug_decay, propofol_potency, midazolam_potency, dexmed_potency):
+    """
+    One sedation tick on plain floats: drug metabolism, consciousness and score.
+
+    :param drug_decay: exp(-metabolism_rate * dt) (see SedationSolver.set_dt)
+    :return: (propofol, midazolam, dexmedetomidine, consciousness, sedation_score)
+    """
+    # Medication metabolism: exact first-order elimination, never below zero
+    new_propofol = propofol * drug_decay
+    new_midazolam = midazolam * drug_decay
+    new_dexmed = dexmedetomidine * drug_decay
+
+    # Total sedative effect
+    sedative_effect = (propofol_potency * new_propofol +
+                       midazolam_potency * new_midazolam +
+                       dexmed_potency * new_dexmed)
+
+    # Natural tendency to wake up balanced against sedative effects
+    wake_tendency = max(0, (100.0 - consciousness) * 0.1 * dt)
+    new_consciousness = max(0, min(100, consciousness + wake_tendency - sedative_effect * dt))
+
+    # Sedation score: 0 awake and alert, 1 drowsy but responds to voice,
+    # 2 light, 3 moderate, 4 deep sedation, 5 unarousable. 5 minus the
+    # number of bounds reached, as solve_batch computes it.
+    new_score = 5 - bisect_right(_SCORE_BOUNDS, new_consciousness)
+    return new_propofol, new_midazolam, new_dexmed, new_consciousness, new_score
+
 
 class SedationState(State):
+    __slots__ = ("_sedation_score", "_consciousness", "_propofol", "_midazolam", "_dexmedetomidine", "_cache")
+
     def __init__(self, data: dict):
         # Sedation score (0=awake, through 5=unarousable)
         self._sedation_score = data.get("sedation_score", 0)
@@ -14,19 +61,25 @@ class SedationState(State):
         self._propofol = data.get("propofol", 0.0)  # mg/kg/hr
         self._midazolam = data.get("midazolam", 0.0)  # mg/hr
         self._dexmedetomidine = data.get("dexmedetomidine", 0.0)  # mcg/kg/hr
+        self._cache = None
 
     @property
     def state(self) -> dict:
-        return {
-            "sedation_score": self._sedation_score,
-            "consciousness": self._consciousness,
-            "propofol": self._propofol,
-            "midazolam": self._midazolam,
-            "dexmedetomidine": self._dexmedetomidine
-        }
+        if self._cache is None:
+            self._cache = {
+                "sedation_score": self._sedation_score,
+                "consciousness": self._consciousness,
+                "propofol": self._propofol,
+                "midazolam": self._midazolam,
+                "dexmedetomidine": self._dexmedetomidine
+            }
+        return self._cache
 
 
-class SedationSolver(Solver):
+class SedationSolver(ParamCacheMixin, Solver):
+    batch_columns = BATCH_COLUMNS
+    _CACHE_PARAMS = frozenset(("metabolism_rate",))
+
     def __init__(self,
                  propofol_potency: float = 0.2,
                  midazolam_potency: float = 0.1,
@@ -45,57 +98,48 @@ class SedationSolver(Solver):
         self.midazolam_potency = midazolam_potency
         self.dexmed_potency = dexmed_potency
         self.metabolism_rate = metabolism_rate
+        self.set_dt(1.0)
+
+    def set_dt(self, dt: float):
+        """
+        Precompute the per-step drug decay factor for this dt.
+
+        solve() calls this itself whenever dt changes or one of _CACHE_PARAMS
+        is reassigned.
+        """
+        self._dt = dt
+        # Exact solution of d(drug)/dt = -metabolism_rate * drug
+        self._drug_decay = math.exp(-self.metabolism_rate * dt)
 
     @property
     def state(self):
         return self._state.state
 
     def solve(self, state: dict, dt: float) -> State:
-        ss = SedationState(state)
-        
-        # Medication metabolism
-        new_propofol = max(0, ss.state["propofol"] - 
-                          self.metabolism_rate * ss.state["propofol"] * dt)
-        new_midazolam = max(0, ss.state["midazolam"] - 
-                           self.metabolism_rate * ss.state["midazolam"] * dt)
-        new_dexmed = max(0, ss.state["dexmedetomidine"] - 
-                        self.metabolism_rate * ss.state["dexmedetomidine"] * dt)
-        
-        # Calculate total sedative effect
-        sedative_effect = (self.propofol_potency * new_propofol +
-                          self.midazolam_potency * new_midazolam +
-                          self.dexmed_potency * new_dexmed)
-        
-        # Update consciousness level
-        # Natural tendency to wake up balanced against sedative effects
-        wake_tendency = max(0, (100.0 - ss.state["consciousness"]) * 0.1 * dt)
-        sedation_effect = sedative_effect * dt
-        
-        new_consciousness = max(0, min(100,
-                                     ss.state["consciousness"] +
-                                     wake_tendency - sedation_effect))
-        
-        # Determine sedation score based on consciousness level
-        if new_consciousness >= 90:
-            new_score = 0  # Awake and alert
-        elif new_consciousness >= 70:
-            new_score = 1  # Drowsy but responds to voice
-        elif new_consciousness >= 50:
-            new_score = 2  # Light sedation
-        elif new_consciousness >= 30:
-            new_score = 3  # Moderate sedation
-        elif new_consciousness >= 10:
-            new_score = 4  # Deep sedation
+        if _REQUIRED <= state.keys():
+            propofol = state["propofol"]
+            midazolam = state["midazolam"]
+            dexmedetomidine = state["dexmedetomidine"]
+            consciousness = state["consciousness"]
         else:
-            new_score = 5  # Unarousable
+            ss = SedationState(state)
+            propofol, midazolam = ss._propofol, ss._midazolam
+            dexmedetomidine, consciousness = ss._dexmedetomidine, ss._consciousness
+        if dt != self._dt:
+            self.set_dt(dt)
+        new_propofol, new_midazolam, new_dexmed, new_consciousness, new_score = _sedation_step(
+            propofol, midazolam, dexmedetomidine, consciousness, dt,
+            self._drug_decay, self.propofol_potency, self.midazolam_potency, self.dexmed_potency)
 
-        logger.debug(
-            f"SedationSolver: score={new_score}, "
-            f"consciousness={new_consciousness:.1f}%, "
-            f"propofol={new_propofol:.1f}, "
-            f"midazolam={new_midazolam:.1f}, "
-            f"dexmed={new_dexmed:.2f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "SedationSolver: score=%s, "
+                "consciousness=%.1f%%, "
+                "propofol=%.1f, "
+                "midazolam=%.1f, "
+                "dexmed=%.2f",
+                new_score, new_consciousness, new_propofol, new_midazolam, new_dexmed
+            )
 
         return SedationState({
             "sedation_score": new_score,
@@ -103,4 +147,30 @@ class SedationSolver(Solver):
             "propofol": new_propofol,
             "midazolam": new_midazolam,
             "dexmedetomidine": new_dexmed
-        })
\ No newline at end of file
+        })
+
+    def solve_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Vectorised solve() over many independent patients.
+
+        :param states: Array of shape (n_patients, len(BATCH_COLUMNS))
+        :param dt: Time step
+        :return: New array with the same layout and floating dtype
+        """
+        if dt != self._dt:
+            self.set_dt(dt)
+
+        out = np.array(states, dtype=np.result_type(states.dtype, np.float32))
+        # All three drugs are metabolised at the same rate
+        out[:, PROPOFOL:] *= self._drug_decay
+        sedative_effect = (self.propofol_potency * out[:, PROPOFOL] +
+                           self.midazolam_potency * out[:, MIDAZOLAM] +
+                           self.dexmed_potency * out[:, DEXMEDETOMIDINE])
+
+        consciousness = states[:, CONSCIOUSNESS]
+        wake_tendency = np.maximum(0, (100.0 - consciousness) * 0.1 * dt)
+        new_consciousness = np.clip(consciousness + wake_tendency - sedative_effect * dt, 0, 100)
+        out[:, CONSCIOUSNESS] = new_consciousness
+        # 5 minus the number of thresholds reached: >= 90 -> 0, ..., < 10 -> 5
+        out[:, SEDATION_SCORE] = 5 - np.searchsorted(_SCORE_THRESHOLDS, new_consciousness, side="right")
+        return out
@@ -1,10 +1,93 @@
 import logging
+import math
+import numpy as np
 from classes import Solver, State
 
 logger = logging.getLogger(__name__)
 
+# Column layout of the (n_patients, n_columns) arrays taken by solve_batch;
+# temperature and wbc are inputs and are passed through unchanged.
+BATCH_COLUMNS = ("tss_severity", "tissue_damage", "toxin_level", "immune_response",
+                 "temperature", "wbc")
+(TSS_SEVERITY, TISSUE_DAMAGE, TOXIN_LEVEL, IMMUNE_RESPONSE,
+ TEMPERATURE, WBC) = range(len(BATCH_COLUMNS))
+
+# Keys Master.parse_state always supplies to this solver; when all are present
+# solve reads them straight from the dict instead of building a TSSState.
+_REQUIRED = frozenset(("tss_severity", "tissue_damage", "toxin_level", "immune_response"))
+
+
+def _linear_step(x, source, rate, dt):
+    """
+    Exact step of dx/dt = source - rate * x, with source and rate held
+    fixed over dt: x relaxes towards source / rate by a fraction 1 - e^(-rate dt).
+    """
+    if rate > 0:
+        return x + (source / rate - x) * -math.expm1(-rate * dt)
+    return x + source * dt
+
+
+def _linear_step_batch(x, source, rate, dt):
+    """Vectorised _linear_step."""
+    positive = rate > 0
+    safe_rate = np.where(positive, rate, 1.0)
+    relaxed = x + (source / safe_rate - x) * -np.expm1(-safe_rate * dt)
+    return np.where(positive, relaxed, x + source * dt)
+
+
+def _tss_step(toxin_level, tissue_damage, immune_response, body_temp, wbc_count, dt,
+              toxin_production_rate, toxin_clearance_rate, tissue_damage_rate,
+              tissue_healing_rate, immune_response_rate):
+    """
+    One TSS tick on plain floats, after any external severity override.
+
+    :return: (tss_severity, tissue_damage, toxin_level, immune_response)
+    """
+    # Update toxin levels
+    # Production increases with tissue damage, clearance depends on immune response
+    # x / 50 written as a multiply; the immune term drives both clearance and healing
+    immune_factor = immune_response * 0.02
+    toxin_production = toxin_production_rate * (1 + tissue_damage * 0.02)
+    toxin_clearance = toxin_clearance_rate * immune_factor
+
+    # Integrated exactly rather than with an Euler step, so large dt cannot overshoot
+    # Clamps are conditional expressions rather than max()/min(): same result, no call
+    new_toxin = _linear_step(toxin_level, toxin_production, toxin_clearance, dt)
+    new_toxin = new_toxin if new_toxin < 100.0 else 100.0
+    new_toxin = new_toxin if new_toxin > 0.0 else 0.0
+
+    # Update tissue damage
+    # Damage from toxins, healing depends on immune response
+    damage_rate = tissue_damage_rate * new_toxin
+    healing_rate = tissue_healing_rate * immune_factor
+
+    new_damage = _linear_step(tissue_damage, damage_rate, healing_rate, dt)
+    new_damage = new_damage if new_damage < 100.0 else 100.0
+    new_damage = new_damage if new_damage > 0.0 else 0.0
+
+    # Update immune response
+    # Strengthens with infection but can become overwhelmed
+    target_response = 50 + new_toxin if new_toxin < 50.0 else 100.0
+    if body_temp > 38.5:  # Fever boosts immune response
+        target_response *= 1.2
+    if wbc_count < 4.0:  # Low WBC impairs immune response
+        target_response *= 0.5
+
+    # Relaxes towards the target at immune_response_rate, integrated exactly like toxin and damage
+    response_change = (target_response - immune_response) * -math.expm1(-immune_response_rate * dt)
+    new_response = immune_response + response_change
+    new_response = new_response if new_response < 100.0 else 100.0
+    new_response = new_response if new_response > 0.0 else 0.0
+
+    # Calculate overall severity score:
+    # toxin * 0.4 + damage * 0.4 + (100 - response) * 0.2, with the constants folded
+    new_severity = 20.0 + 0.4 * (new_toxin + new_damage) - 0.2 * new_response
+    return new_severity, new_damage, new_toxin, new_response
+
 
 class TSSState(State):
+    __slots__ = ("_severity", "_tissue_damage", "_toxin_level", "_immune_response", "_cache")
+
     def __init__(self, data: dict):
         # Overall TSS severity score (0-100)
         self._severity = data.get("tss_severity", 0.0)
@@ -14,18 +97,41 @@ class TSSState(State):
         self._toxin_level = data.get("toxin_level", 0.0)
         # Immune response level (0-100)
         self._immune_response = data.get("immune_response", 50.0)
+        self._cache = None
+
+    @classmethod
+    def from_values(cls, severity: float, tissue_damage: float, toxin_level: float,
+                    immune_response: float) -> "TSSState":
+        """Build a state from solver outputs without parsing a dict."""
+        ts = cls.__new__(cls)
+        ts._severity = severity
+        ts._tissue_damage = tissue_damage
+        ts._toxin_level = toxin_level
+        ts._immune_response = immune_response
+        ts._cache = None
+        return ts
 
     @property
     def state(self) -> dict:
-        return {
-            "tss_severity": self._severity,
-            "tissue_damage": self._tissue_damage,
-            "toxin_level": self._toxin_level,
-            "immune_response": self._immune_response
-        }
+        if self._cache is None:
+            self._cache = {
+                "tss_severity": self._severity,
+                "tissue_damage": self._tissue_damage,
+                "toxin_level": self._toxin_level,
+                "immune_response": self._immune_response
+            }
+        return self._cache
 
 
 class TSSSolver(Solver):
+    batch_columns = BATCH_COLUMNS
+
+    __slots__ = (
+        "toxin_production_rate", "toxin_clearance_rate", "tissue_damage_rate",
+        "tissue_healing_rate", "immune_response_rate",
+        "_state", "_last_calculated_severity", "_last_batch_severity",
+    )
+
     def __init__(self,
                  toxin_production_rate: float = 0.05,
                  toxin_clearance_rate: float = 0.03,
@@ -47,104 +153,125 @@ class TSSSolver(Solver):
         self.tissue_damage_rate = tissue_damage_rate
         self.tissue_healing_rate = tissue_healing_rate
         self.immune_response_rate = immune_response_rate
-        
-        # Flag to track if we need to sync other values with severity
-        self.severity_manually_set = False
+
+        # Severity returned by the last solve, to detect external changes (None before the first)
+        self._last_calculated_severity = None
+        # Per-patient counterpart of _last_calculated_severity for solve_batch
+        self._last_batch_severity = None
 
     @property
     def state(self):
         return self._state.state
 
     def solve(self, state: dict, dt: float) -> State:
-        ts = TSSState(state)
+        if _REQUIRED <= state.keys():
+            current_severity = state["tss_severity"]
+            tissue_damage = state["tissue_damage"]
+            toxin_level = state["toxin_level"]
+            immune_response = state["immune_response"]
+        else:
+            ts = TSSState(state)
+            current_severity, tissue_damage = ts._severity, ts._tissue_damage
+            toxin_level, immune_response = ts._toxin_level, ts._immune_response
         
         # Get relevant physiological parameters if available
         body_temp = state.get("temperature", 37.0)
         wbc_count = state.get("wbc", 7.5)
         
-        # Check if tss_severity was manually set via actions
-        current_severity = ts.state["tss_severity"]
-        previous_severity = getattr(self, '_last_calculated_severity', 0.0)
-        
         # Detect if severity was changed externally (via actions)
         # by comparing with our last calculated value
-        severity_changed_externally = abs(current_severity - previous_severity) > 0.1 and hasattr(self, '_last_calculated_severity')
+        previous_severity = self._last_calculated_severity
+        severity_changed_externally = (previous_severity is not None
+                                       and abs(current_severity - previous_severity) > 0.1)
         
         # If severity was changed externally, adjust internal values to match the new severity
         if severity_changed_externally:
             # If severity was changed externally, adjust toxin and damage levels to match
             # This ensures the solver honors external severity changes
-            target_toxin_damage = min(100, current_severity / 0.8 * 1.5)  # Rough inverse of severity calculation
+            target_toxin_damage = min(100, current_severity * 1.875)  # Rough inverse of severity calculation (/ 0.8 * 1.5)
             
             # Update toxin level and tissue damage to be consistent with the new severity
             # while maintaining their relative proportions
-            if ts.state["toxin_level"] + ts.state["tissue_damage"] > 0:
-                proportion = ts.state["toxin_level"] / (ts.state["toxin_level"] + ts.state["tissue_damage"])
+            if toxin_level + tissue_damage > 0:
+                proportion = toxin_level / (toxin_level + tissue_damage)
             else:
                 proportion = 0.5  # Equal split if both are zero
                 
-            # Set new values while maintaining relative proportions
-            new_toxin = target_toxin_damage * proportion
-            new_damage = target_toxin_damage * (1 - proportion)
-            
-            # Set these as the starting points for this solve iteration
-            ts = TSSState({
-                "tss_severity": current_severity,
-                "tissue_damage": new_damage,
-                "toxin_level": new_toxin,
-                "immune_response": ts.state["immune_response"]
-            })
-        
-        # Update toxin levels
-        # Production increases with tissue damage, clearance depends on immune response
-        toxin_production = (self.toxin_production_rate * 
-                          (1 + ts.state["tissue_damage"] / 50.0))
-        toxin_clearance = (self.toxin_clearance_rate * 
-                          ts.state["immune_response"] / 50.0)
-        
-        toxin_change = (toxin_production - 
-                       toxin_clearance * ts.state["toxin_level"]) * dt
-        new_toxin = max(0, min(100, ts.state["toxin_level"] + toxin_change))
-        
-        # Update tissue damage
-        # Damage from toxins, healing depends on immune response
-        damage_rate = self.tissue_damage_rate * new_toxin
-        healing_rate = (self.tissue_healing_rate * 
-                       ts.state["immune_response"] / 50.0)
-        
-        damage_change = (damage_rate - 
-                        healing_rate * ts.state["tissue_damage"]) * dt
-        new_damage = max(0, min(100, ts.state["tissue_damage"] + damage_change))
+            # Set these as the starting points for this solve iteration,
+            # maintaining the relative proportions
+            toxin_level = target_toxin_damage * proportion
+            tissue_damage = target_toxin_damage * (1 - proportion)
         
-        # Update immune response
-        # Strengthens with infection but can become overwhelmed
-        target_response = min(100, 50 + new_toxin)
-        if body_temp > 38.5:  # Fever boosts immune response
-            target_response *= 1.2
-        if wbc_count < 4.0:  # Low WBC impairs immune response
-            target_response *= 0.5
-            
-        response_change = (self.immune_response_rate * 
-                         (target_response - ts.state["immune_response"])) * dt
-        new_response = max(0, min(100, ts.state["immune_response"] + response_change))
-        
-        # Calculate overall severity score
-        new_severity = (new_toxin * 0.4 + 
-                       new_damage * 0.4 + 
-                       (100 - new_response) * 0.2)
+        new_severity, new_damage, new_toxin, new_response = _tss_step(
+            toxin_level, tissue_damage, immune_response, body_temp, wbc_count, dt,
+            self.toxin_production_rate, self.toxin_clearance_rate, self.tissue_damage_rate,
+            self.tissue_healing_rate, self.immune_response_rate)
 
         # Save the calculated severity for next comparison
         self._last_calculated_severity = new_severity
 
-        logger.debug(
-            f"TSSSolver: severity={new_severity:.1f}, "
-            f"toxin={new_toxin:.1f}, damage={new_damage:.1f}, "
-            f"immune={new_response:.1f}"
-        )
-
-        return TSSState({
-            "tss_severity": new_severity,
-            "tissue_damage": new_damage,
-            "toxin_level": new_toxin,
-            "immune_response": new_response
-        })
\ No newline at end of file
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "TSSSolver: severity=%.1f, "
+                "toxin=%.1f, damage=%.1f, "
+                "immune=%.1f",
+                new_severity, new_toxin, new_damage, new_response
+            )
+
+        return TSSState.from_values(new_severity, new_damage, new_toxin, new_response)
+
+    def solve_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Vectorised solve() over many independent patients.
+
+        External severity changes are detected per patient against the
+        severities this method returned last time, as solve() does for its
+        single patient; the first call (or a change in cohort size) skips it.
+
+        :param states: Array of shape (n_patients, len(BATCH_COLUMNS))
+        :param dt: Time step
+        :return: New array with the same layout and floating dtype; temperature and wbc
+                 are passed through
+        """
+        out = np.array(states, dtype=np.result_type(states.dtype, np.float32))
+        severity = states[:, TSS_SEVERITY]
+        toxin = states[:, TOXIN_LEVEL]
+        damage = states[:, TISSUE_DAMAGE]
+        immune = states[:, IMMUNE_RESPONSE]
+
+        last = self._last_batch_severity
+        if last is not None and last.shape == severity.shape:
+            changed = np.abs(severity - last) > 0.1
+            if changed.any():
+                # Re-split toxin and damage to match the new severity, keeping their proportion
+                target_toxin_damage = np.minimum(100, severity * 1.875)
+                total = toxin + damage
+                proportion = np.full_like(total, 0.5)
+                np.divide(toxin, total, out=proportion, where=total > 0)
+                toxin = np.where(changed, target_toxin_damage * proportion, toxin)
+                damage = np.where(changed, target_toxin_damage * (1 - proportion), damage)
+
+        immune_factor = immune * 0.02
+        toxin_production = self.toxin_production_rate * (1 + damage * 0.02)
+        toxin_clearance = self.toxin_clearance_rate * immune_factor
+        new_toxin = np.clip(_linear_step_batch(toxin, toxin_production, toxin_clearance, dt), 0, 100)
+
+        damage_rate = self.tissue_damage_rate * new_toxin
+        healing_rate = self.tissue_healing_rate * immune_factor
+        new_damage = np.clip(_linear_step_batch(damage, damage_rate, healing_rate, dt), 0, 100)
+
+        target_response = np.minimum(100, 50 + new_toxin)
+        # Boolean masks scale straight into the factor, with no select needed
+        target_response *= 1.0 + 0.2 * (states[:, TEMPERATURE] > 38.5)  # fever boost
+        target_response *= 1.0 - 0.5 * (states[:, WBC] < 4.0)           # leukopenia
+        new_response = np.clip(immune + (target_response - immune)
+                               * -math.expm1(-self.immune_response_rate * dt), 0, 100)
+
+        new_severity = 20.0 + 0.4 * (new_toxin + new_damage) - 0.2 * new_response
+        self._last_batch_severity = new_severity
+
+        out[:, TSS_SEVERITY] = new_severity
+        out[:, TISSUE_DAMAGE] = new_damage
+        out[:, TOXIN_LEVEL] = new_toxin
+        out[:, IMMUNE_RESPONSE] = new_response
+        return out
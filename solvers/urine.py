@@ -1,10 +1,29 @@
 import logging
-from classes import Solver, State
+import math
+
+import numpy as np
+from classes import ParamCacheMixin, Solver, State
 
 logger = logging.getLogger(__name__)
 
+# Column layout of the (n_patients, n_columns) arrays taken by solve_batch;
+# blood_pressure, fluid_volume and (serum) sodium are inputs and are passed
+# through unchanged.
+BATCH_COLUMNS = ("urine_output", "urine_specific_gravity", "urine_sodium", "kidney_function",
+                 "urine_osmolality", "urine_protein", "blood_pressure", "fluid_volume", "sodium")
+(URINE_OUTPUT, URINE_SPECIFIC_GRAVITY, URINE_SODIUM, KIDNEY_FUNCTION, URINE_OSMOLALITY,
+ URINE_PROTEIN, BLOOD_PRESSURE, FLUID_VOLUME, SODIUM) = range(len(BATCH_COLUMNS))
+
+# Keys Master.parse_state always supplies to this solver; when all are present
+# solve reads them straight from the dict instead of building a UrineState.
+_REQUIRED = frozenset(("urine_output", "urine_specific_gravity", "urine_sodium",
+                       "kidney_function", "urine_osmolality", "urine_protein"))
+
 
 class UrineState(State):
+    __slots__ = ("_output", "_specific_gravity", "_sodium", "_kidney_function",
+                 "_osmolality", "_protein", "_cache")
+
     def __init__(self, data: dict):
         # Urine output in mL/hr
         self._output = data.get("urine_output", 60.0)  # Normal: 30-100 mL/hr
@@ -18,20 +37,47 @@ class UrineState(State):
         self._osmolality = data.get("urine_osmolality", 600.0)
         # Protein content (mg/dL)
         self._protein = data.get("urine_protein", 0.0)  # Normal < 20 mg/dL
+        self._cache = None
+
+    @classmethod
+    def from_values(cls, output: float, specific_gravity: float, sodium: float,
+                    kidney_function: float, osmolality: float, protein: float) -> "UrineState":
+        """Build a state from solver outputs without parsing a dict."""
+        us = cls.__new__(cls)
+        us._output = output
+        us._specific_gravity = specific_gravity
+        us._sodium = sodium
+        us._kidney_function = kidney_function
+        us._osmolality = osmolality
+        us._protein = protein
+        us._cache = None
+        return us
 
     @property
     def state(self) -> dict:
-        return {
-            "urine_output": self._output,
-            "urine_specific_gravity": self._specific_gravity,
-            "urine_sodium": self._sodium,
-            "kidney_function": self._kidney_function,
-            "urine_osmolality": self._osmolality,
-            "urine_protein": self._protein
-        }
+        if self._cache is None:
+            self._cache = {
+                "urine_output": self._output,
+                "urine_specific_gravity": self._specific_gravity,
+                "urine_sodium": self._sodium,
+                "kidney_function": self._kidney_function,
+                "urine_osmolality": self._osmolality,
+                "urine_protein": self._protein
+            }
+        return self._cache
+
 
+class UrineSolver(ParamCacheMixin, Solver):
+    batch_columns = BATCH_COLUMNS
+    _CACHE_PARAMS = frozenset(
+        ("kidney_recovery_rate", "osmolality_adjustment_rate", "protein_clearance_rate"))
+
+    __slots__ = (
+        "base_output_rate", "kidney_recovery_rate", "osmolality_adjustment_rate",
+        "protein_clearance_rate", "_state", "_dt", "_relax_factor", "_recovery_factor",
+        "_osm_factor", "_protein_factor",
+    )
 
-class UrineSolver(Solver):
     def __init__(self,
                  base_output_rate: float = 60.0,
                  kidney_recovery_rate: float = 0.01,
@@ -50,78 +96,173 @@ class UrineSolver(Solver):
         self.kidney_recovery_rate = kidney_recovery_rate
         self.osmolality_adjustment_rate = osmolality_adjustment_rate
         self.protein_clearance_rate = protein_clearance_rate
+        self.set_dt(1.0)
+
+    def set_dt(self, dt: float):
+        """
+        Precompute the exact relaxation factors 1 - exp(-k * dt) used every step.
+
+        Output, specific gravity, osmolality, sodium, protein and kidney
+        recovery each relax linearly towards a target held fixed over the
+        step, so they are advanced with the exact solution instead of an Euler
+        step and stay stable at large dt. solve() calls this itself whenever
+        dt changes or one of _CACHE_PARAMS is reassigned.
+        """
+        self._dt = dt
+        self._relax_factor = -math.expm1(-0.1 * dt)
+        self._recovery_factor = -math.expm1(-self.kidney_recovery_rate * dt)
+        self._osm_factor = -math.expm1(-self.osmolality_adjustment_rate * dt)
+        self._protein_factor = -math.expm1(-self.protein_clearance_rate * dt)
 
     @property
     def state(self):
         return self._state.state
 
     def solve(self, state: dict, dt: float) -> State:
-        us = UrineState(state)
+        if _REQUIRED <= state.keys():
+            output = state["urine_output"]
+            specific_gravity = state["urine_specific_gravity"]
+            sodium = state["urine_sodium"]
+            kidney_function = state["kidney_function"]
+            osmolality = state["urine_osmolality"]
+            protein = state["urine_protein"]
+        else:
+            us = UrineState(state)
+            output, specific_gravity, sodium = us._output, us._specific_gravity, us._sodium
+            kidney_function, osmolality, protein = us._kidney_function, us._osmolality, us._protein
         
         # Get relevant physiological parameters if available
         blood_pressure = state.get("blood_pressure", 90.0)
         fluid_volume = state.get("fluid_volume", 2000.0)
         serum_sodium = state.get("sodium", 140.0)
+        if dt != self._dt:
+            self.set_dt(dt)
+        relax_factor = self._relax_factor
         
         # Update kidney function
         # Function decreases with low BP, slowly recovers with normal BP
         if blood_pressure < 65.0:
             kidney_damage = (65.0 - blood_pressure) * 0.02 * dt
-            new_kidney_function = max(0, us.state["kidney_function"] - kidney_damage)
+            new_kidney_function = kidney_function - kidney_damage
+            new_kidney_function = new_kidney_function if new_kidney_function > 0.0 else 0.0
         else:
-            recovery = (self.kidney_recovery_rate * 
-                       (100.0 - us.state["kidney_function"])) * dt
-            new_kidney_function = min(100, us.state["kidney_function"] + recovery)
+            recovery = (100.0 - kidney_function) * self._recovery_factor
+            new_kidney_function = kidney_function + recovery
+            new_kidney_function = new_kidney_function if new_kidney_function < 100.0 else 100.0
         
         # Calculate urine output
         # Affected by kidney function, BP, and fluid volume
-        volume_factor = max(0.2, min(2.0, fluid_volume / 2000.0))
-        bp_factor = max(0.2, min(1.5, blood_pressure / 90.0))
+        # Divisions by constants written as multiplies (1 / 90.0 folds at compile time);
+        # clamps are conditional expressions rather than max()/min(): same result, no call
+        kidney_fraction = new_kidney_function * 0.01
+        volume_factor = fluid_volume * 0.0005
+        volume_factor = volume_factor if volume_factor < 2.0 else 2.0
+        volume_factor = volume_factor if volume_factor > 0.2 else 0.2
+        bp_factor = blood_pressure * (1 / 90.0)
+        bp_factor = bp_factor if bp_factor < 1.5 else 1.5
+        bp_factor = bp_factor if bp_factor > 0.2 else 0.2
         base_output = (self.base_output_rate * 
                       volume_factor * 
                       bp_factor * 
-                      (new_kidney_function / 100.0))
+                      kidney_fraction)
         
-        output_change = (base_output - us.state["urine_output"]) * 0.1 * dt
-        new_output = max(0, us.state["urine_output"] + output_change)
+        output_change = (base_output - output) * relax_factor
+        new_output = output + output_change
+        new_output = new_output if new_output > 0.0 else 0.0
         
         # Update specific gravity and osmolality
         # Inversely related to urine output
         target_sg = 1.015 + (60.0 - new_output) * 0.0003
-        sg_change = (target_sg - us.state["urine_specific_gravity"]) * 0.1 * dt
-        new_sg = max(1.001, min(1.040, 
-                    us.state["urine_specific_gravity"] + sg_change))
+        sg_change = (target_sg - specific_gravity) * relax_factor
+        new_sg = specific_gravity + sg_change
+        new_sg = new_sg if new_sg < 1.040 else 1.040
+        new_sg = new_sg if new_sg > 1.001 else 1.001
         
         target_osm = 600.0 + (60.0 - new_output) * 10.0
-        osm_change = (self.osmolality_adjustment_rate * 
-                     (target_osm - us.state["urine_osmolality"])) * dt
-        new_osm = max(50, min(1200, us.state["urine_osmolality"] + osm_change))
+        osm_change = (target_osm - osmolality) * self._osm_factor
+        new_osm = osmolality + osm_change
+        new_osm = new_osm if new_osm < 1200.0 else 1200.0
+        new_osm = new_osm if new_osm > 50.0 else 50.0
         
         # Update urine sodium
         # Influenced by serum sodium and kidney function
-        target_sodium = serum_sodium * (new_kidney_function / 100.0)
-        sodium_change = (target_sodium - us.state["urine_sodium"]) * 0.1 * dt
-        new_sodium = max(0, us.state["urine_sodium"] + sodium_change)
+        target_sodium = serum_sodium * kidney_fraction
+        sodium_change = (target_sodium - sodium) * relax_factor
+        new_sodium = sodium + sodium_change
+        new_sodium = new_sodium if new_sodium > 0.0 else 0.0
         
         # Update protein content
         # Increases with kidney damage, cleared over time
         protein_production = (100 - new_kidney_function) * 0.2
-        protein_clearance = self.protein_clearance_rate * us.state["urine_protein"]
-        protein_change = (protein_production - protein_clearance) * dt
-        new_protein = max(0, us.state["urine_protein"] + protein_change)
-
-        logger.debug(
-            f"UrineSolver: output={new_output:.1f} mL/hr, "
-            f"kidney={new_kidney_function:.1f}%, "
-            f"sg={new_sg:.3f}, Na={new_sodium:.1f}, "
-            f"protein={new_protein:.1f}"
-        )
-
-        return UrineState({
-            "urine_output": new_output,
-            "urine_specific_gravity": new_sg,
-            "urine_sodium": new_sodium,
-            "kidney_function": new_kidney_function,
-            "urine_osmolality": new_osm,
-            "urine_protein": new_protein
-        })
\ No newline at end of file
+        if self.protein_clearance_rate > 0:
+            protein_target = protein_production / self.protein_clearance_rate
+            protein_change = (protein_target - protein) * self._protein_factor
+        else:
+            protein_change = protein_production * dt
+        new_protein = protein + protein_change
+        new_protein = new_protein if new_protein > 0.0 else 0.0
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "UrineSolver: output=%.1f mL/hr, "
+                "kidney=%.1f%%, "
+                "sg=%.3f, Na=%.1f, "
+                "protein=%.1f",
+                new_output, new_kidney_function, new_sg, new_sodium, new_protein
+            )
+
+        return UrineState.from_values(new_output, new_sg, new_sodium, new_kidney_function,
+                                      new_osm, new_protein)
+
+    def solve_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Vectorised solve() over many independent patients.
+
+        :param states: Array of shape (n_patients, len(BATCH_COLUMNS))
+        :param dt: Time step
+        :return: New array with the same layout and floating dtype; blood_pressure,
+                 fluid_volume and sodium are passed through
+        """
+        if dt != self._dt:
+            self.set_dt(dt)
+        relax_factor = self._relax_factor
+
+        out = np.array(states, dtype=np.result_type(states.dtype, np.float32))
+        blood_pressure = states[:, BLOOD_PRESSURE]
+        kidney_function = states[:, KIDNEY_FUNCTION]
+
+        # Kidney function: damaged below 65 mmHg, otherwise recovering
+        damaged = np.maximum(0, kidney_function - (65.0 - blood_pressure) * 0.02 * dt)
+        recovered = np.minimum(100, kidney_function + (100.0 - kidney_function) * self._recovery_factor)
+        new_kidney_function = np.where(blood_pressure < 65.0, damaged, recovered)
+        out[:, KIDNEY_FUNCTION] = new_kidney_function
+
+        kidney_fraction = new_kidney_function * 0.01
+        volume_factor = np.clip(states[:, FLUID_VOLUME] * 0.0005, 0.2, 2.0)
+        bp_factor = np.clip(blood_pressure * (1 / 90.0), 0.2, 1.5)
+        base_output = self.base_output_rate * volume_factor * bp_factor * kidney_fraction
+        output = states[:, URINE_OUTPUT]
+        new_output = np.maximum(0, output + (base_output - output) * relax_factor)
+        out[:, URINE_OUTPUT] = new_output
+
+        target_sg = 1.015 + (60.0 - new_output) * 0.0003
+        sg = states[:, URINE_SPECIFIC_GRAVITY]
+        out[:, URINE_SPECIFIC_GRAVITY] = np.clip(sg + (target_sg - sg) * relax_factor, 1.001, 1.040)
+
+        target_osm = 600.0 + (60.0 - new_output) * 10.0
+        osm = states[:, URINE_OSMOLALITY]
+        out[:, URINE_OSMOLALITY] = np.clip(osm + (target_osm - osm) * self._osm_factor, 50, 1200)
+
+        target_sodium = states[:, SODIUM] * kidney_fraction
+        sodium = states[:, URINE_SODIUM]
+        out[:, URINE_SODIUM] = np.maximum(0, sodium + (target_sodium - sodium) * relax_factor)
+
+        protein = states[:, URINE_PROTEIN]
+        protein_production = (100 - new_kidney_function) * 0.2
+        if self.protein_clearance_rate > 0:
+            protein_target = protein_production / self.protein_clearance_rate
+            protein_change = (protein_target - protein) * self._protein_factor
+        else:
+            protein_change = protein_production * dt
+        out[:, URINE_PROTEIN] = np.maximum(0, protein + protein_change)
+        return out
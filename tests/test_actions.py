@@ -23,45 +23,49 @@ class MockState(State):
         return self._state
 
 
+# Every state variable the actions need, shared by all MockSolver instances
+_INITIAL_MOCK_STATE = {
+    # Vital signs
+    "heart_rate": 80.0,
+    "blood_pressure": 120.0,
+    "respiratory_rate": 16.0,
+    "temperature": 37.0,
+    "oxygen_saturation": 98.0,
+    
+    # Fluids and blood values
+    "blood_volume": 5000.0,  # 5000 mL
+    "fluid_volume": 2000.0,  # Initial fluid volume from FluidsSolver
+    
+    # Lab values
+    "hemoglobin": 14.0,   # g/dL
+    "platelets": 250.0,   # x10^9/L
+    "wbc": 7.5,          # x10^9/L
+    "inr": 1.0,
+    "aptt": 30.0,        # seconds
+    "crp": 5.0,          # mg/L
+    
+    # Electrolytes
+    "sodium": 140.0,     # mmol/L
+    "potassium": 4.0,    # mmol/L
+    "calcium": 2.4,      # mmol/L (normal range 2.2-2.7)
+    "chloride": 100.0,   # mmol/L
+    "glucose": 90.0,     # mg/dL
+    "lactate": 1.0,      # mmol/L
+    
+    # Clinical status
+    "infection_level": 0.0,
+    "pain_level": 0.0,
+    "sedation_level": 0.0,
+    "bleeding_rate": 0.0,
+    "cardiac_output": 5.0,
+    "svr": 1200.0
+}
+
+
 class MockSolver(Solver):
     def __init__(self):
         """Initialize with all state variables needed for testing."""
-        self._state = {
-            # Vital signs
-            "heart_rate": 80.0,
-            "blood_pressure": 120.0,
-            "respiratory_rate": 16.0,
-            "temperature": 37.0,
-            "oxygen_saturation": 98.0,
-            
-            # Fluids and blood values
-            "blood_volume": 5000.0,  # 5000 mL
-            "fluid_volume": 2000.0,  # Initial fluid volume from FluidsSolver
-            
-            # Lab values
-            "hemoglobin": 14.0,   # g/dL
-            "platelets": 250.0,   # x10^9/L
-            "wbc": 7.5,          # x10^9/L
-            "inr": 1.0,
-            "aptt": 30.0,        # seconds
-            "crp": 5.0,          # mg/L
-            
-            # Electrolytes
-            "sodium": 140.0,     # mmol/L
-            "potassium": 4.0,    # mmol/L
-            "calcium": 2.4,      # mmol/L (normal range 2.2-2.7)
-            "chloride": 100.0,   # mmol/L
-            "glucose": 90.0,     # mg/dL
-            "lactate": 1.0,      # mmol/L
-            
-            # Clinical status
-            "infection_level": 0.0,
-            "pain_level": 0.0,
-            "sedation_level": 0.0,
-            "bleeding_rate": 0.0,
-            "cardiac_output": 5.0,
-            "svr": 1200.0
-        }
+        self._state = _INITIAL_MOCK_STATE.copy()
     
     @property
     def state(self):
@@ -74,25 +78,26 @@ class MockSolver(Solver):
 
 class TestActions(unittest.TestCase):
     
-    def setUp(self):
-        # Create mock solver with comprehensive initial state
-        mock_solver = MockSolver()
-        
-        # Create actions list from imports
+    @classmethod
+    def setUpClass(cls):
+        # Create actions list from imports, once for the whole class
         blood_test = BloodTestAction()
         medication_actions = list(MEDICATIONS.values())
         fluid_actions = list(FLUIDS.values())
-        all_actions = [blood_test] + medication_actions + fluid_actions
-        
-        # Set up the master with our mock solver and actions
-        self.master = Master(
-            solvers=[mock_solver],
+        cls.actions = [blood_test] + medication_actions + fluid_actions
+
+        # Shared master for the tests that only read it; tests that perform
+        # actions build their own with _new_master()
+        cls.master = cls._new_master()
+
+    @classmethod
+    def _new_master(cls):
+        # Set up a master with a fresh mock solver and the shared actions
+        return Master(
+            solvers=[MockSolver()],
             dt=1.0,
-            actions=all_actions
+            actions=cls.actions
         )
-        
-        # Store initial state for comparison
-        self.initial_state = self.master.state.copy()
     
     def test_action_state_access(self):
         """Test that actions can access their required state keys."""
@@ -105,9 +110,9 @@ class TestActions(unittest.TestCase):
     def test_action_state_modification(self):
         """Test that actions can modify their affected state keys."""
         # Test each action
-        for action in self.master.actions:
+        for action in self.actions:
             # Reset state before each action test
-            self.master = Master(solvers=[MockSolver()], dt=1.0, actions=self.master.actions)
+            self.master = self._new_master()
             before_state = self.master.state.copy()
             
             # Perform the action
@@ -149,6 +154,7 @@ class TestActions(unittest.TestCase):
     
     def test_action_observable_state_interface(self):
         """Test that action observable state interface works correctly."""
+        self.master = self._new_master()
         for action in self.master.actions:
             # Get observable state
             observable = self.master.perform_action(action)
@@ -188,6 +194,7 @@ class TestActions(unittest.TestCase):
     
     def test_action_chaining(self):
         """Test that multiple actions can be performed in sequence."""
+        self.master = self._new_master()
         # Get a few different actions with duration
         actions_with_duration = [a for a in self.master.actions if a.duration > 0]
         self.assertGreaterEqual(len(actions_with_duration), 2,
@@ -207,6 +214,7 @@ class TestActions(unittest.TestCase):
     
     def test_perform_action_by_name(self):
         """Test that actions can be performed by name lookup."""
+        self.master = self._new_master()
         # Test with every registered action
         for action in self.master.actions:
             result = self.master.perform_action_by_name(action.name)
@@ -215,9 +223,28 @@ class TestActions(unittest.TestCase):
         # Test with non-existent action
         result = self.master.perform_action_by_name("NonexistentAction")
         self.assertEqual(result, {})
-    
+
+    def test_action_appended_after_construction(self):
+        """Test that actions appended to Master.actions later can be performed by name."""
+        master = Master(solvers=[MockSolver()], dt=1.0)
+        self.assertEqual(master.perform_action_by_name(self.actions[0].name), {})
+        master.actions.append(self.actions[0])
+        self.assertIs(master.get_action(self.actions[0].name), self.actions[0])
+        observable = master.perform_action_by_name(self.actions[0].name)
+        self.assertEqual(observable, self.actions[0].get_observable_state(master.state))
+
+    def test_apply_actions_adds_deltas_and_new_keys(self):
+        """Test that direct state changes add to existing keys and create missing ones."""
+        self.master = self._new_master()
+        heart_rate = self.master.state["heart_rate"]
+        state = self.master.apply_actions({"heart_rate": 5.0, "new_marker": 2.5})
+        self.assertIs(state, self.master.state)
+        self.assertEqual(state["heart_rate"], heart_rate + 5.0)
+        self.assertEqual(state["new_marker"], 2.5)
+
     def test_action_kwargs_handling(self):
         """Test that actions properly handle additional parameters."""
+        self.master = self._new_master()
         # Test both with and without kwargs for each action
         for action in self.master.actions:
             # Should handle no kwargs
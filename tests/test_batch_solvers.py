@@ -0,0 +1,249 @@
+import unittest
+import numpy as np
+
+from solvers import meds, metabolytes, crp, pressure_HR_Oxy, sedation, tss, urine
+from solvers.meds import MedsSolver
+from solvers.metabolytes import MetabolytesSolver
+from solvers.crp import CRPSolver
+from solvers.sedation import SedationSolver
+from solvers.tss import TSSSolver
+from solvers.urine import UrineSolver
+from solvers.pressure_HR_Oxy import PressureHROxySolver, PressureHROxyPopulation
+from solvers.batch import BatchStepper
+from classes import Solver
+
+
+# solve() reports its state-object default for these inputs rather than
+# echoing them back, while solve_batch passes them through unchanged.
+PASSTHROUGH_INPUTS = {"fio2"}
+
+
+class TestSolveBatch(unittest.TestCase):
+    """solve_batch must agree row-by-row with the scalar solve()."""
+
+    def _check(self, solver, columns, patients, dt=1.0):
+        states = np.array([[p[c] for c in columns] for p in patients])
+        batched = solver.solve_batch(states, dt)
+        for row, patient in zip(batched, patients):
+            expected = solver.solve(patient, dt).state
+            for i, column in enumerate(columns):
+                if column in expected and column not in PASSTHROUGH_INPUTS:
+                    self.assertAlmostEqual(row[i], expected[column], places=9, msg=column)
+
+    def test_meds(self):
+        patients = [{"epinephrine": 0.0}, {"epinephrine": 2.5}]
+        self._check(MedsSolver(), meds.BATCH_COLUMNS, patients, dt=30.0)
+
+    def test_metabolytes(self):
+        patients = [
+            dict(ph=7.4, pco2=40.0, hco3=24.0, po2=95.0, base_excess=0.0,
+                 glucose=100.0, ketones=0.1, insulin=10.0, oxy_saturation=98.0),
+            dict(ph=7.1, pco2=65.0, hco3=14.0, po2=60.0, base_excess=-8.0,
+                 glucose=320.0, ketones=1.5, insulin=2.0, oxy_saturation=85.0),
+        ]
+        self._check(MetabolytesSolver(), metabolytes.BATCH_COLUMNS, patients)
+
+    def test_crp(self):
+        patients = [
+            {"crp": 1.0, "inflammation": 0.0, "infection_level": 0.0},
+            {"crp": 80.0, "inflammation": 40.0, "infection_level": 90.0},
+        ]
+        self._check(CRPSolver(), crp.BATCH_COLUMNS, patients)
+
+    def test_pressure_hr_oxy(self):
+        base = {"systolic_bp": 120.0, "diastolic_bp": 80.0, "heart_rate": 80.0,
+                "oxy_saturation": 98.0, "oxygen_debt": 0.0, "end_diastolic_volume": 120.0,
+                "epinephrine": 0.0, "fio2": 0.21, "blood_pressure": 0.0}  # MAP is output only
+        patients = [
+            base,
+            dict(base, epinephrine=3.0, fio2=0.5, end_diastolic_volume=160.0),
+            dict(base, systolic_bp=62.0, diastolic_bp=58.0, fio2=0.1),  # narrow pulse pressure
+            dict(base, systolic_bp=45.0, diastolic_bp=44.0, heart_rate=0.0),
+        ]
+        self._check(PressureHROxySolver(filling_ratio_factor=1.1), pressure_HR_Oxy.BATCH_COLUMNS, patients)
+        self._check(PressureHROxySolver(dt_unit_in_seconds=False), pressure_HR_Oxy.BATCH_COLUMNS, patients)
+        for integrator in ("rk2", "rk4"):
+            self._check(PressureHROxySolver(integrator=integrator, filling_ratio_factor=1.1),
+                        pressure_HR_Oxy.BATCH_COLUMNS, patients, dt=4.0)
+
+    def test_sedation(self):
+        patients = [
+            {"sedation_score": 0, "consciousness": 100.0, "propofol": 0.0,
+             "midazolam": 0.0, "dexmedetomidine": 0.0},
+            {"sedation_score": 2, "consciousness": 55.0, "propofol": 40.0,
+             "midazolam": 5.0, "dexmedetomidine": 0.7},
+            {"sedation_score": 4, "consciousness": 12.0, "propofol": 200.0,
+             "midazolam": 20.0, "dexmedetomidine": 1.5},
+        ]
+        self._check(SedationSolver(), sedation.BATCH_COLUMNS, patients)
+
+    def test_tss(self):
+        patients = [
+            {"tss_severity": 0.0, "tissue_damage": 0.0, "toxin_level": 0.0,
+             "immune_response": 50.0, "temperature": 37.0, "wbc": 7.5},
+            {"tss_severity": 40.0, "tissue_damage": 30.0, "toxin_level": 60.0,
+             "immune_response": 70.0, "temperature": 39.5, "wbc": 3.0},
+        ]
+        states = np.array([[p[c] for c in tss.BATCH_COLUMNS] for p in patients])
+        batch_solver, solvers = TSSSolver(), [TSSSolver() for _ in patients]
+        # The second tick bumps one patient's severity to exercise the external-change path
+        for tick in range(2):
+            if tick:
+                states[1, tss.TSS_SEVERITY] += 25.0
+                patients = [dict(p, tss_severity=row[tss.TSS_SEVERITY])
+                            for p, row in zip(patients, states)]
+            states = batch_solver.solve_batch(states, 1.0)
+            expected = [s.solve(p, 1.0).state for s, p in zip(solvers, patients)]
+            patients = [dict(p, **e) for p, e in zip(patients, expected)]
+            for row, exp in zip(states, expected):
+                for key, value in exp.items():
+                    self.assertAlmostEqual(row[tss.BATCH_COLUMNS.index(key)], value, places=9, msg=key)
+
+    def test_urine(self):
+        base = {"urine_output": 60.0, "urine_specific_gravity": 1.015, "urine_sodium": 100.0,
+                "kidney_function": 100.0, "urine_osmolality": 600.0, "urine_protein": 0.0,
+                "blood_pressure": 90.0, "fluid_volume": 2000.0, "sodium": 140.0}
+        patients = [
+            base,
+            dict(base, blood_pressure=50.0, kidney_function=70.0, urine_protein=15.0),  # hypotensive
+            dict(base, fluid_volume=5000.0, blood_pressure=150.0, urine_output=5.0),
+        ]
+        self._check(UrineSolver(), urine.BATCH_COLUMNS, patients, dt=2.0)
+
+
+class TestPressureHROxyPopulation(unittest.TestCase):
+    def _population(self):
+        population = PressureHROxyPopulation(3, {"systolic_bp": 100.0})
+        population["epinephrine"][1] = 2.0
+        population["fio2"][2] = 0.5
+        return population
+
+    def test_solve_all_and_solve_into_match_solve(self):
+        solver = PressureHROxySolver()
+        batched, single = self._population(), self._population()
+        expected = [solver.solve(dict(batched.view(i).state, epinephrine=batched["epinephrine"][i]),
+                                 1.0).state for i in range(len(batched))]
+
+        solver.solve_all(batched, 1.0)
+        for i in range(len(single)):
+            solver.solve_into(single, i, 1.0)
+
+        for i, exp in enumerate(expected):
+            for key in ("systolic_bp", "diastolic_bp", "heart_rate", "oxy_saturation",
+                        "oxygen_debt", "end_diastolic_volume"):
+                self.assertAlmostEqual(batched[key][i], exp[key], places=9, msg=key)
+                self.assertAlmostEqual(single[key][i], exp[key], places=9, msg=key)
+
+    def test_blocked_and_threaded_solve_all_match_single_batch(self):
+        solver = PressureHROxySolver()
+        n = pressure_HR_Oxy.POPULATION_BLOCK * 2 + 5
+        reference, serial, threaded = (PressureHROxyPopulation(n) for _ in range(3))
+        for population in (reference, serial, threaded):
+            population["epinephrine"][:] = np.linspace(0.0, 3.0, n)
+            population["fio2"][:] = np.linspace(0.1, 0.6, n)
+        data = reference._data.T
+        for _ in range(3):
+            solver.solve_batch(data, 1.0, out=data)
+            solver.solve_all(serial, 1.0)
+            solver.solve_all(threaded, 1.0, workers=3)
+        np.testing.assert_array_equal(serial._data, reference._data)
+        np.testing.assert_array_equal(threaded._data, reference._data)
+
+    def test_float32_population_stays_float32(self):
+        solver = PressureHROxySolver()
+        full, single = PressureHROxyPopulation(2), PressureHROxyPopulation(2, dtype=np.float32)
+        for _ in range(10):
+            solver.solve_all(full, 1.0)
+            solver.solve_all(single, 1.0)
+        self.assertEqual(single["systolic_bp"].dtype, np.float32)
+        for key in ("systolic_bp", "heart_rate", "oxy_saturation", "oxygen_debt"):
+            np.testing.assert_allclose(single[key], full[key], rtol=1e-4)
+
+
+class TestBatchStepper(unittest.TestCase):
+    def test_step_matches_individual_solvers(self):
+        solvers = [MedsSolver(), MetabolytesSolver(), CRPSolver(), PressureHROxySolver()]
+        stepper = BatchStepper(solvers)
+        patients = [
+            {},
+            {"epinephrine": 1.5, "glucose": 250.0, "pco2": 55.0, "fio2": 0.4,
+             "crp": 40.0, "inflammation": 20.0, "infection_level": 60.0},
+        ]
+        packed = stepper.pack(patients)
+        stepped = stepper.unpack(stepper.step(packed, 1.0))
+
+        for before, after in zip(stepper.unpack(packed), stepped):
+            for solver in solvers:
+                expected = solver.solve(before, 1.0).state
+                for key, value in expected.items():
+                    if key not in after or key in PASSTHROUGH_INPUTS:
+                        continue
+                    self.assertAlmostEqual(after[key], value, places=9, msg=key)
+
+    def test_step_cohort_matches_packed_step(self):
+        stepper = BatchStepper([MedsSolver(), MetabolytesSolver(), CRPSolver(), PressureHROxySolver()])
+        cohort = stepper.cohort(3, {"glucose": 180.0})
+        cohort["epinephrine"][1] = 1.5
+        cohort["fio2"][2] = 0.4
+        packed = stepper.pack([cohort.patient(i) for i in range(len(cohort))])
+        for _ in range(3):
+            stepper.step_cohort(cohort, 1.0)
+            packed = stepper.step(packed, 1.0)
+        self.assertEqual(stepper.unpack(packed), [cohort.patient(i) for i in range(len(cohort))])
+
+    def test_urine_sees_blood_pressure_from_pressure_solver(self):
+        pressure, urine_solver = PressureHROxySolver(), UrineSolver()
+        stepper = BatchStepper([pressure, urine_solver])
+        cohort = stepper.cohort(2, {"systolic_bp": 70.0, "diastolic_bp": 40.0})
+        self.assertAlmostEqual(cohort["blood_pressure"][0], 50.0, places=9)
+
+        state = cohort.patient(0)
+        for _ in range(5):
+            stepper.step_cohort(cohort, 1.0)
+            state = dict(state, **pressure.solve(state, 1.0).state, **urine_solver.solve(state, 1.0).state)
+        after = cohort.patient(0)
+        self.assertAlmostEqual(after["blood_pressure"],
+                               (after["systolic_bp"] + 2 * after["diastolic_bp"]) / 3, places=9)
+        for key in ("blood_pressure", "urine_output", "kidney_function"):
+            self.assertAlmostEqual(after[key], state[key], places=9, msg=key)
+
+    def test_solver_owning_no_batch_column_is_read_only(self):
+        class FiO2Monitor(Solver):
+            batch_columns = ("fio2",)
+            state = {}
+
+            def solve(self, state, dt):
+                return state
+
+            def solve_batch(self, states, dt):
+                return states * 0.0
+
+        stepper = BatchStepper([FiO2Monitor(), MedsSolver()])
+        packed = np.array([[0.4, 1.0]])
+        stepped = stepper.step(packed, 1.0)
+        self.assertEqual(stepped[0, 0], 0.4)
+        self.assertLess(stepped[0, 1], 1.0)
+
+    def test_float32_cohort_stays_float32(self):
+        # TSSSolver remembers the last severities it returned, so each cohort gets its own solvers
+        def make_stepper():
+            return BatchStepper([MedsSolver(), MetabolytesSolver(), CRPSolver(), PressureHROxySolver(),
+                                 SedationSolver(), TSSSolver()])
+
+        steppers = make_stepper(), make_stepper()
+        full = steppers[0].cohort(2, {"propofol": 40.0})
+        single = steppers[1].cohort(2, {"propofol": 40.0}, dtype=np.float32)
+        for cohort in (full, single):
+            cohort["epinephrine"][1] = 1.5
+        for solver in make_stepper().solvers:
+            columns = np.stack([single[c] for c in solver.batch_columns], axis=1)
+            self.assertEqual(solver.solve_batch(columns, 1.0).dtype, np.float32)
+        for _ in range(10):
+            steppers[0].step_cohort(full, 1.0)
+            steppers[1].step_cohort(single, 1.0)
+        self.assertEqual(single["systolic_bp"].dtype, np.float32)
+        np.testing.assert_allclose(single._data, full._data, rtol=1e-4, atol=1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
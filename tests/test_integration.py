@@ -7,6 +7,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from master import Master
+from classes import Solver, State
 
 # Import scenarios
 from scenarios import FeverScenario, HemorrhageScenario, SepsisScenario
@@ -31,8 +32,28 @@ from solvers.crp import CRPSolver
 from solvers.rhythm import RhythmSolver
 from solvers.sedation import SedationSolver
 
-# Configure logging to show info messages
-logging.basicConfig(level=logging.INFO)
+# All implemented solvers, in stepping order
+SOLVER_CLASSES = (
+    PressureHROxySolver,
+    MedsSolver,
+    FluidsSolver,
+    TSSSolver,
+    UrineSolver,
+    CoagulationSolver,
+    DrainsSolver,
+    ElectrolytesSolver,
+    FeverSolver,
+    HemogramSolver,
+    LactateSolver,
+    MetabolytesSolver,
+    CRPSolver,
+    RhythmSolver,
+    SedationSolver,
+)
+
+# Only warnings and errors; the per-step INFO records dominate the stepping
+# loops below. Comment out the logging.disable call in setUpClass to debug.
+logging.basicConfig(level=logging.WARNING)
 
 class TestIntegration(unittest.TestCase):
     """
@@ -40,13 +61,24 @@ class TestIntegration(unittest.TestCase):
     Tests focus on interface behavior and mechanics rather than specific physiological changes.
     """
     
-    def setUp(self):
-        # Create actions list from imports
+    @classmethod
+    def setUpClass(cls):
+        # Create actions list from imports. Actions keep no per-run state (the
+        # MEDICATIONS and FLUIDS instances are module-level already), so every
+        # test can share them.
         blood_test = BloodTestAction()
         medication_actions = list(MEDICATIONS.values())
         fluid_actions = list(FLUIDS.values())
-        all_actions = [blood_test] + medication_actions + fluid_actions
-        
+        cls.actions = [blood_test] + medication_actions + fluid_actions
+        logging.disable(logging.INFO)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        # Scenarios and solvers carry per-run state (elapsed time, last TSS
+        # severity, rhythm RNG), so each test builds its own.
         # Create scenarios with shorter durations for testing
         scenarios = [
             FeverScenario(peak_temp=39.5, onset_duration=3.0, peak_duration=4.0, resolution_duration=3.0),
@@ -54,35 +86,13 @@ class TestIntegration(unittest.TestCase):
             SepsisScenario(severity=1.2, onset_duration=3.0, duration=12.0)
         ]
         
-        # Set up all implemented solvers
-        solvers = [
-            PressureHROxySolver(),
-            MedsSolver(),
-            FluidsSolver(),
-            TSSSolver(),
-            UrineSolver(),
-            CoagulationSolver(),
-            DrainsSolver(),
-            ElectrolytesSolver(),
-            FeverSolver(),
-            HemogramSolver(),
-            LactateSolver(),
-            MetabolytesSolver(),
-            CRPSolver(),
-            RhythmSolver(),
-            SedationSolver()
-        ]
-        
-        # Set up the master with our components
+        # Set up the master with fresh instances of all implemented solvers
         self.master = Master(
-            solvers=solvers,
+            solvers=[solver_class() for solver_class in SOLVER_CLASSES],
             dt=1.0,
             scenarios=scenarios,
-            actions=all_actions
+            actions=self.actions
         )
-        
-        # Store initial state for comparison
-        self.initial_state = self.master.state.copy()
     
     def test_solver_state_modification(self):
         """Test that solver state modification interface works by verifying state changes happen."""
@@ -108,8 +118,38 @@ class TestIntegration(unittest.TestCase):
         
         # Verify that at least some values have changed
         # We don't care which ones specifically, just that the simulation is running
-        changes = [k for k in new_state if new_state[k] != self.initial_state[k]]
-        self.assertGreater(len(changes), 0, "No state values changed after step")
+        self.assertGreater(len(self.master.last_delta), 0, "No state values changed after step")
+        for key, value in self.master.last_delta.items():
+            self.assertEqual(new_state[key], value)
+
+    def test_last_delta_compares_with_pre_step_state(self):
+        """Test that last_delta ignores keys a later solver restores and records new keys."""
+        class FixedState(State):
+            def __init__(self, data):
+                self._data = data
+
+            @property
+            def state(self):
+                return self._data
+
+        class FixedSolver(Solver):
+            def __init__(self, initial, result):
+                self._initial, self._result = initial, result
+
+            @property
+            def state(self):
+                return self._initial
+
+            def solve(self, state, dt):
+                return FixedState(self._result)
+
+        master = Master(solvers=[
+            FixedSolver({"k": 1.0, "j": 0.0}, {"k": 2.0, "j": 3.0}),
+            FixedSolver({}, {"k": 1.0, "marker": None}),
+        ])
+        master.step()
+        self.assertEqual(master.last_delta, {"j": 3.0, "marker": None})
+        self.assertEqual(master.state["k"], 1.0)
     
     def test_scenario_activation_mechanics(self):
         """Test scenario activation/deactivation mechanics."""
@@ -117,27 +157,29 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(len(self.master.active_scenarios), 0)
         
         # Test activation
-        for scenario in ["Fever", "Hemorrhage", "Sepsis"]:
-            # Activate scenario
-            success = self.master.apply_scenario(scenario)
-            self.assertTrue(success)
-            
-            # Verify it's in active scenarios
-            active_names = [s.name for s in self.master.active_scenarios]
-            self.assertIn(scenario, active_names)
-            
-            # Deactivate scenario
-            success = self.master.deactivate_scenario(scenario)
-            self.assertTrue(success)
-            
-            # Verify it's no longer active
-            active_names = [s.name for s in self.master.active_scenarios]
-            self.assertNotIn(scenario, active_names)
+        # Each scenario deactivates itself again, so the sub-cases share one Master
+        for scenario in ("Fever", "Hemorrhage", "Sepsis"):
+            with self.subTest(scenario=scenario):
+                # Activate scenario
+                success = self.master.apply_scenario(scenario)
+                self.assertTrue(success)
+
+                # Verify it's in active scenarios
+                active_names = [s.name for s in self.master.active_scenarios]
+                self.assertIn(scenario, active_names)
+
+                # Deactivate scenario
+                success = self.master.deactivate_scenario(scenario)
+                self.assertTrue(success)
+
+                # Verify it's no longer active
+                active_names = [s.name for s in self.master.active_scenarios]
+                self.assertNotIn(scenario, active_names)
     
     def test_scenario_duration_mechanics(self):
         """Test that scenarios handle their duration properly."""
         # Get a scenario with finite duration
-        sepsis = next(s for s in self.master.scenarios if s.name == "Sepsis")
+        sepsis = self.master.get_scenario("Sepsis")
         duration = sepsis.duration
         self.assertGreater(duration, 0)  # Verify it has a duration
         
@@ -146,8 +188,7 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(len(self.master.active_scenarios), 1)
         
         # Run until just before duration
-        for _ in range(int(duration) - 1):
-            self.master.step()
+        self.master.step(n_steps=int(duration) - 1)
         self.assertEqual(len(self.master.active_scenarios), 1)
         
         # Run one more step to complete duration
@@ -0,0 +1,27 @@
+import unittest
+import numpy as np
+
+from solvers.metabolytes import MetabolytesSolver
+
+
+class TestMetabolytesJacobian(unittest.TestCase):
+    def setUp(self):
+        self.solver = MetabolytesSolver()
+
+    def _finite_difference(self, y, h=1e-6):
+        jac = np.zeros((len(y), len(y)))
+        for j in range(len(y)):
+            step = np.zeros(len(y))
+            step[j] = h
+            jac[:, j] = (self.solver.rhs(0.0, y + step) - self.solver.rhs(0.0, y - step)) / (2 * h)
+        return jac
+
+    def test_jacobian_matches_finite_difference(self):
+        for y in (np.array([40.0, 24.0, 100.5, 0.1, 10.0]),     # near baseline
+                  np.array([60.0, 15.0, 300.0, 2.0, 4.0])):     # hyperglycaemic, ketotic
+            np.testing.assert_allclose(self.solver.jacobian(0.0, y),
+                                       self._finite_difference(y), atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
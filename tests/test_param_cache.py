@@ -0,0 +1,36 @@
+import unittest
+
+from solvers.crp import CRPSolver
+from solvers.metabolytes import MetabolytesSolver
+from solvers.sedation import SedationSolver
+
+
+class TestRateReassignment(unittest.TestCase):
+    """Reassigning a rate at an unchanged dt must change the next step like a fresh solver would."""
+
+    def _check(self, solver_class, param, value, state):
+        solver = solver_class()
+        default = solver.solve(dict(state), 1.0).state
+        setattr(solver, param, value)
+        expected = solver_class(**{param: value}).solve(dict(state), 1.0).state
+        self.assertNotEqual(expected, default)
+        self.assertEqual(solver.solve(dict(state), 1.0).state, expected)
+
+    def test_sedation_metabolism_rate(self):
+        self._check(SedationSolver, "metabolism_rate", 0.5,
+                    {"propofol": 40.0, "midazolam": 5.0, "dexmedetomidine": 0.7, "consciousness": 55.0})
+
+    def test_crp_clearance_rate(self):
+        self._check(CRPSolver, "clearance_rate", 0.3,
+                    {"crp": 80.0, "inflammation": 40.0, "infection_level": 90.0})
+
+    def test_metabolytes_compensation_rates(self):
+        acidotic = dict(ph=7.1, pco2=65.0, hco3=14.0, po2=60.0, base_excess=-8.0,
+                        glucose=320.0, ketones=1.5, insulin=2.0, oxy_saturation=85.0)
+        for param in ("respiratory_compensation_rate", "metabolic_compensation_rate"):
+            with self.subTest(param=param):
+                self._check(MetabolytesSolver, param, 0.4, acidotic)
+
+
+if __name__ == "__main__":
+    unittest.main()
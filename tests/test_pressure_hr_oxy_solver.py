@@ -1,34 +1,51 @@
 import unittest
+from types import MappingProxyType
+
+import numpy as np
 from solvers.pressure_HR_Oxy import PressureHROxySolver, PressureHROxyState
-import logging
 
-# Suppress logging for tests if not needed, or set to DEBUG to see solver logs
-# logging.basicConfig(level=logging.DEBUG) # Uncomment to see solver logs
-# logging.getLogger("solvers.pressure_HR_Oxy").setLevel(logging.WARNING)
+# To see solver logs, import logging and uncomment:
+# logging.basicConfig(level=logging.DEBUG)
 
+# MAP weights for _get_map
+_ONE_THIRD, _TWO_THIRDS = 1.0 / 3.0, 2.0 / 3.0
 
-class TestPressureHROxySolver(unittest.TestCase):
+# Read-only resting inputs (MAP ~88.33, EDV at the default target); tests
+# override single keys with {**BASELINE_INPUTS, key: value}. solve() never
+# mutates its input, so no defensive copies are needed.
+BASELINE_INPUTS = MappingProxyType({
+    "systolic_bp": 115.0, "diastolic_bp": 75.0, "heart_rate": 75.0,
+    "oxy_saturation": 98.0, "end_diastolic_volume": 120.0, "oxygen_debt": 0.0,
+})
 
-    def _get_map(self, systolic, diastolic):
-        return (systolic + 2 * diastolic) / 3
+
+class TestPressureHROxySolver(unittest.TestCase):
+    # Solver parameters for the stroke-volume clamp tests
+    MAX_SV_CLAMP_PARAMS = dict(base_stroke_volume=100.0, k_preload=2.0,
+                               max_stroke_volume=130.0,  # Clamp here
+                               target_edv=120.0, map_setpoint=90.0, k_afterload=0.1)
+    MIN_SV_CLAMP_PARAMS = dict(base_stroke_volume=10.0, k_afterload=0.5,
+                               target_edv=120.0, map_setpoint=90.0, k_preload=0.1)
+
+    @classmethod
+    def setUpClass(cls):
+        # Shared by the tests that use default parameters; solve() keeps no
+        # per-patient state, and tests that reassign a parameter restore it
+        cls.default_solver = PressureHROxySolver()
+
+    @staticmethod
+    def _get_map(systolic, diastolic):
+        # Plain arithmetic, so NumPy arrays of pressures work as well
+        return systolic * _ONE_THIRD + diastolic * _TWO_THIRDS
 
     def test_baseline_stability(self):
-        solver = PressureHROxySolver() # Uses default sv_to_systolic_factor=0.5, svr_to_diastolic_factor=50.0
-        initial_hr = 75.0
-        initial_systolic = 115.0 # Start SBP
-        initial_diastolic = 75.0  # Start DBP
+        solver = self.default_solver # Uses default sv_to_systolic_factor=0.5, svr_to_diastolic_factor=50.0
+        initial_data = BASELINE_INPUTS
+        initial_hr = initial_data["heart_rate"]  # 75
+        initial_systolic = initial_data["systolic_bp"]  # 115
+        initial_diastolic = initial_data["diastolic_bp"]  # 75
         initial_map = self._get_map(initial_systolic, initial_diastolic) # Approx 88.33
-        initial_edv = solver.target_edv # 120.0
-
-        initial_data = {
-            "systolic_bp": initial_systolic,
-            "diastolic_bp": initial_diastolic,
-            "heart_rate": initial_hr,
-            "oxy_saturation": 98.0,
-            "end_diastolic_volume": initial_edv,
-            "oxygen_debt": 0.0
-        }
-        
+        initial_edv = initial_data["end_diastolic_volume"]  # solver.target_edv, 120
         dt = 1.0
 
         # Calculate expected SV (preload and afterload effects should be minimal here if MAP is close to setpoint)
@@ -46,7 +63,7 @@ class TestPressureHROxySolver(unittest.TestCase):
         expected_systolic_target = initial_diastolic + solver.sv_to_systolic_factor * expected_sv
         expected_diastolic_target = 70.0 + solver.svr_to_diastolic_factor * (solver.svr - 1.0) # SVR is 1.0 by default
 
-        new_state_obj = solver.solve(initial_data.copy(), dt)
+        new_state_obj = solver.solve(initial_data, dt)
         new_state_dict = new_state_obj.state
 
         # SBP should move towards its target
@@ -70,24 +87,18 @@ class TestPressureHROxySolver(unittest.TestCase):
 
 
     def test_increased_preload_increases_sv_effect(self):
-        solver = PressureHROxySolver()
+        solver = self.default_solver
         initial_edv_baseline = solver.target_edv # 120
         initial_edv_increased = initial_edv_baseline + 40.0 # 160 mL
 
-        base_data = {
-            "systolic_bp": 115.0, "diastolic_bp": 75.0, # MAP ~ 88.33
-            "heart_rate": 75.0, "oxy_saturation": 98.0, "oxygen_debt": 0.0
-        }
+        base_data = BASELINE_INPUTS
 
-        initial_data_baseline = base_data.copy()
-        initial_data_baseline["end_diastolic_volume"] = initial_edv_baseline
-        
-        initial_data_increased_preload = base_data.copy()
-        initial_data_increased_preload["end_diastolic_volume"] = initial_edv_increased
+        initial_data_baseline = {**base_data, "end_diastolic_volume": initial_edv_baseline}
+        initial_data_increased_preload = {**base_data, "end_diastolic_volume": initial_edv_increased}
 
         dt = 1.0
-        state_baseline = solver.solve(initial_data_baseline.copy(), dt).state
-        state_increased_preload = solver.solve(initial_data_increased_preload.copy(), dt).state
+        state_baseline = solver.solve(initial_data_baseline, dt).state
+        state_increased_preload = solver.solve(initial_data_increased_preload, dt).state
 
         # Increased preload (EDV) should lead to higher SV, thus higher SBP primarily
         delta_sbp_baseline = state_baseline["systolic_bp"] - base_data["systolic_bp"]
@@ -106,24 +117,18 @@ class TestPressureHROxySolver(unittest.TestCase):
 
 
     def test_decreased_preload_decreases_sv_effect(self):
-        solver = PressureHROxySolver()
+        solver = self.default_solver
         initial_edv_baseline = solver.target_edv # 120
         initial_edv_decreased = initial_edv_baseline - 40.0 # 80 mL
 
-        base_data = {
-            "systolic_bp": 115.0, "diastolic_bp": 75.0, # MAP ~ 88.33
-            "heart_rate": 75.0, "oxy_saturation": 98.0, "oxygen_debt": 0.0
-        }
-
-        initial_data_baseline = base_data.copy()
-        initial_data_baseline["end_diastolic_volume"] = initial_edv_baseline
+        base_data = BASELINE_INPUTS
 
-        initial_data_decreased_preload = base_data.copy()
-        initial_data_decreased_preload["end_diastolic_volume"] = initial_edv_decreased
+        initial_data_baseline = {**base_data, "end_diastolic_volume": initial_edv_baseline}
+        initial_data_decreased_preload = {**base_data, "end_diastolic_volume": initial_edv_decreased}
         
         dt = 1.0
-        state_baseline = solver.solve(initial_data_baseline.copy(), dt).state
-        state_decreased_preload = solver.solve(initial_data_decreased_preload.copy(), dt).state
+        state_baseline = solver.solve(initial_data_baseline, dt).state
+        state_decreased_preload = solver.solve(initial_data_decreased_preload, dt).state
         
         delta_sbp_decreased = state_decreased_preload["systolic_bp"] - base_data["systolic_bp"]
         delta_dbp_decreased = state_decreased_preload["diastolic_bp"] - base_data["diastolic_bp"]
@@ -139,7 +144,7 @@ class TestPressureHROxySolver(unittest.TestCase):
     def test_increased_afterload_decreases_sv_effect(self):
         # This test checks if increased MAP_old (afterload) correctly reduces SV,
         # leading to a different evolution of BP compared to a baseline MAP_old.
-        solver = PressureHROxySolver()
+        solver = self.default_solver
         
         map_baseline_start = solver.map_setpoint # 90
         map_increased_afterload_start = solver.map_setpoint + 20 # 110
@@ -149,22 +154,18 @@ class TestPressureHROxySolver(unittest.TestCase):
              "heart_rate": 75.0, "oxy_saturation": 98.0, "oxygen_debt": 0.0
         }
 
-        initial_data_baseline = base_data.copy()
-        initial_data_baseline["systolic_bp"] = 110.0 # SBP for MAP=90
-        initial_data_baseline["diastolic_bp"] = 80.0  # DBP for MAP=90
-
-        initial_data_increased_afterload = base_data.copy()
-        initial_data_increased_afterload["systolic_bp"] = 130.0 # SBP for MAP=110
-        initial_data_increased_afterload["diastolic_bp"] = 100.0 # DBP for MAP=110
+        # SBP/DBP 110/80 give MAP=90; 130/100 give MAP=110
+        initial_data_baseline = {**base_data, "systolic_bp": 110.0, "diastolic_bp": 80.0}
+        initial_data_increased_afterload = {**base_data, "systolic_bp": 130.0, "diastolic_bp": 100.0}
         
         dt = 1.0
         
-        state_baseline_obj = solver.solve(initial_data_baseline.copy(), dt)
+        state_baseline_obj = solver.solve(initial_data_baseline, dt)
         map_new_baseline = state_baseline_obj.state["blood_pressure"]
         sbp_new_baseline = state_baseline_obj.state["systolic_bp"]
         dbp_new_baseline = state_baseline_obj.state["diastolic_bp"]
 
-        state_increased_afterload_obj = solver.solve(initial_data_increased_afterload.copy(), dt)
+        state_increased_afterload_obj = solver.solve(initial_data_increased_afterload, dt)
         map_new_increased_afterload = state_increased_afterload_obj.state["blood_pressure"]
         sbp_new_increased_afterload = state_increased_afterload_obj.state["systolic_bp"]
         dbp_new_increased_afterload = state_increased_afterload_obj.state["diastolic_bp"]
@@ -191,14 +192,14 @@ class TestPressureHROxySolver(unittest.TestCase):
             "oxygen_debt": 0.0
         }
         dt = 1.0
-        new_state = solver.solve(initial_data.copy(), dt).state
+        new_state = solver.solve(initial_data, dt).state
         # dEDV/dt = (HR/60 * SV * (fill_ratio - 1)) + edv_recovery_rate * (target_edv - edv_old)
         # SV at baseline EDV and MAP (approx 90) = base_stroke_volume (70)
         # HR/60 * SV * (1.2 - 1.0) = (75/60) * 70 * 0.2 = 1.25 * 70 * 0.2 = 87.5 * 0.2 = 17.5
         # edv_recovery_rate * (target_edv - edv_old) = 0 since edv_old = target_edv
         # So, dEDV_dt = 17.5. edv_new = 120 + 17.5 * 1 = 137.5
         self.assertAlmostEqual(new_state["end_diastolic_volume"], 137.5, delta=0.1,
-                               "EDV should increase with filling_ratio > 1")
+                               msg="EDV should increase with filling_ratio > 1")
         self.assertTrue(new_state["systolic_bp"] > new_state["diastolic_bp"])
 
 
@@ -212,25 +213,18 @@ class TestPressureHROxySolver(unittest.TestCase):
             "oxygen_debt": 0.0
         }
         dt = 1.0
-        new_state = solver.solve(initial_data.copy(), dt).state
+        new_state = solver.solve(initial_data, dt).state
         # dEDV/dt = (HR/60 * SV * (fill_ratio - 1)) + edv_recovery_rate * (target_edv - edv_old)
         # SV = 70
         # HR/60 * SV * (0.8 - 1.0) = 1.25 * 70 * (-0.2) = -17.5
         # edv_new = 120 - 17.5 * 1 = 102.5
         self.assertAlmostEqual(new_state["end_diastolic_volume"], 102.5, delta=0.1,
-                               "EDV should decrease with filling_ratio < 1")
+                               msg="EDV should decrease with filling_ratio < 1")
         self.assertTrue(new_state["systolic_bp"] > new_state["diastolic_bp"])
 
 
     def test_stroke_volume_max_clamp_effect(self):
-        solver = PressureHROxySolver(
-            base_stroke_volume=100.0,
-            k_preload=2.0,
-            max_stroke_volume=130.0, # Clamp here
-            target_edv=120.0,
-            map_setpoint=90.0, 
-            k_afterload=0.1 
-        )
+        solver = PressureHROxySolver(**self.MAX_SV_CLAMP_PARAMS)
         initial_edv = 140.0 # Preload: k_preload * (140-120) = 2.0 * 20 = 40
         # Calculated SV before clamp: base_sv + 40 = 100 + 40 = 140 mL -> clamped to 130 mL
 
@@ -245,7 +239,7 @@ class TestPressureHROxySolver(unittest.TestCase):
         }
         
         dt = 1.0
-        new_state = solver.solve(initial_data.copy(), dt).state
+        new_state = solver.solve(initial_data, dt).state
         
         # Expected change with SV = 130 mL
         # systolic_target = initial_dbp + sv_factor * SV_clamped = 80 + 0.5 * 130 = 80 + 65 = 145
@@ -253,18 +247,12 @@ class TestPressureHROxySolver(unittest.TestCase):
         # systolic_rate_of_change = 35 / (compliance * 5.0) = 35 / 5 = 7
         # new_sbp = 110 + 7 * 1 = 117
         self.assertAlmostEqual(new_state["systolic_bp"], 117.0, delta=0.1,
-                               "SBP should reflect max_stroke_volume clamping effect on systolic_target")
+                               msg="SBP should reflect max_stroke_volume clamping effect on systolic_target")
         self.assertTrue(new_state["systolic_bp"] > new_state["diastolic_bp"])
 
 
     def test_stroke_volume_min_clamp_effect(self):
-        solver = PressureHROxySolver(
-            base_stroke_volume=10.0,
-            k_afterload=0.5,
-            target_edv=120.0, 
-            map_setpoint=90.0,
-            k_preload=0.1 
-        )
+        solver = PressureHROxySolver(**self.MIN_SV_CLAMP_PARAMS)
         # SV = base (10) + k_preload*(EDV-target) - k_afterload*(MAP_old - map_setpoint)
         # MAP_old = 120. Afterload term: 0.5 * (120 - 90) = 15
         # Calculated SV before clamp: 10 - 15 = -5 mL. Should be clamped to 5 mL.
@@ -281,7 +269,7 @@ class TestPressureHROxySolver(unittest.TestCase):
         }
 
         dt = 1.0
-        new_state = solver.solve(initial_data.copy(), dt).state
+        new_state = solver.solve(initial_data, dt).state
 
         # Expected change with SV = 5 mL
         # systolic_target = initial_dbp + sv_factor * SV_clamped = 100 + 0.5 * 5 = 100 + 2.5 = 102.5
@@ -289,12 +277,12 @@ class TestPressureHROxySolver(unittest.TestCase):
         # systolic_rate_of_change = -57.5 / 5.0 = -11.5
         # new_sbp = 160 - 11.5 * 1 = 148.5
         self.assertAlmostEqual(new_state["systolic_bp"], 148.5, delta=0.1,
-                               "SBP should reflect min_stroke_volume clamping effect on systolic_target")
+                               msg="SBP should reflect min_stroke_volume clamping effect on systolic_target")
         self.assertTrue(new_state["systolic_bp"] > new_state["diastolic_bp"])
 
 
     def test_stroke_volume_effect_on_systolic(self):
-        solver = PressureHROxySolver() # Defaults: sv_to_systolic_factor=0.5, compliance=1.0
+        solver = self.default_solver # Defaults: sv_to_systolic_factor=0.5, compliance=1.0
         dt = 1.0
         base_hr = 60.0
         base_diastolic = 70.0 # Keep DBP somewhat stable initially for isolating SBP effect
@@ -308,7 +296,7 @@ class TestPressureHROxySolver(unittest.TestCase):
                 "end_diastolic_volume": edv,
                 "oxy_saturation": 98.0,
             }
-            state = solver.solve(initial_data.copy(), dt).state
+            state = solver.solve(initial_data, dt).state
             return state["systolic_bp"], state["diastolic_bp"], state
 
         # Scenario 1: Baseline SV
@@ -317,19 +305,21 @@ class TestPressureHROxySolver(unittest.TestCase):
         # Scenario 2: Higher SV
         sbp2, dbp2, state2 = _run_scenario(20)
         self.assertTrue(sbp2 > sbp1, "SBP with higher SV should be greater than SBP with baseline SV")
-        self.assertAlmostEqual(dbp2, dbp1, delta=2.0, "DBP should remain relatively unchanged with SV change")
+        self.assertAlmostEqual(dbp2, dbp1, delta=2.0, msg="DBP should remain relatively unchanged with SV change")
         self.assertTrue(state1["systolic_bp"] > state1["diastolic_bp"])
         self.assertTrue(state2["systolic_bp"] > state2["diastolic_bp"])
 
         # Scenario 3: Lower SV
         sbp3, dbp3, state3 = _run_scenario(-20)
         self.assertTrue(sbp3 < sbp1, "SBP with lower SV should be less than SBP with baseline SV")
-        self.assertAlmostEqual(dbp3, dbp1, delta=2.0, "DBP should remain relatively unchanged with SV change")
+        self.assertAlmostEqual(dbp3, dbp1, delta=2.0, msg="DBP should remain relatively unchanged with SV change")
         self.assertTrue(state3["systolic_bp"] > state3["diastolic_bp"])
 
 
     def test_svr_effect_on_diastolic(self):
-        solver = PressureHROxySolver() # Defaults: svr_to_diastolic_factor=50.0, compliance=1.0
+        solver = self.default_solver # Defaults: svr_to_diastolic_factor=50.0, compliance=1.0
+        # The scenarios below reassign svr; put the shared solver's value back afterwards
+        self.addCleanup(setattr, solver, "svr", solver.svr)
         dt = 1.0
         base_sbp = 120.0
         base_dbp = 80.0 # Initial DBP
@@ -338,13 +328,13 @@ class TestPressureHROxySolver(unittest.TestCase):
         # Scenario 1: Baseline SVR
         solver.svr = 1.0
         initial_data1 = {"systolic_bp": base_sbp, "diastolic_bp": base_dbp, "heart_rate": 75.0, "end_diastolic_volume": base_edv, "oxy_saturation": 98.0}
-        state1 = solver.solve(initial_data1.copy(), dt).state
+        state1 = solver.solve(initial_data1, dt).state
         sbp1, dbp1 = state1["systolic_bp"], state1["diastolic_bp"]
 
         # Scenario 2: Higher SVR
         solver.svr = 1.2 # 20% increase
         initial_data2 = {"systolic_bp": base_sbp, "diastolic_bp": base_dbp, "heart_rate": 75.0, "end_diastolic_volume": base_edv, "oxy_saturation": 98.0}
-        state2 = solver.solve(initial_data2.copy(), dt).state
+        state2 = solver.solve(initial_data2, dt).state
         sbp2, dbp2 = state2["systolic_bp"], state2["diastolic_bp"]
 
         self.assertTrue(dbp2 > dbp1, "DBP with higher SVR should be greater than DBP with baseline SVR")
@@ -359,7 +349,7 @@ class TestPressureHROxySolver(unittest.TestCase):
         # Scenario 3: Lower SVR
         solver.svr = 0.8 # 20% decrease
         initial_data3 = {"systolic_bp": base_sbp, "diastolic_bp": base_dbp, "heart_rate": 75.0, "end_diastolic_volume": base_edv, "oxy_saturation": 98.0}
-        state3 = solver.solve(initial_data3.copy(), dt).state
+        state3 = solver.solve(initial_data3, dt).state
         sbp3, dbp3 = state3["systolic_bp"], state3["diastolic_bp"]
         
         self.assertTrue(dbp3 < dbp1, "DBP with lower SVR should be less than DBP with baseline SVR")
@@ -369,20 +359,19 @@ class TestPressureHROxySolver(unittest.TestCase):
 
 
     def test_epinephrine_effect(self):
-        solver = PressureHROxySolver(epi_bp_factor=0.3) # Default epi_bp_factor
+        solver = self.default_solver # Default epi_bp_factor=0.3
         dt = 1.0
         initial_data_no_epi = {
             "systolic_bp": 120.0, "diastolic_bp": 80.0, "heart_rate": 70.0, 
             "end_diastolic_volume": solver.target_edv, "oxy_saturation": 98.0,
             "epinephrine": 0.0 # Explicitly zero
         }
-        state_no_epi = solver.solve(initial_data_no_epi.copy(), dt).state
+        state_no_epi = solver.solve(initial_data_no_epi, dt).state
         sbp_no_epi, dbp_no_epi = state_no_epi["systolic_bp"], state_no_epi["diastolic_bp"]
 
-        initial_data_with_epi = initial_data_no_epi.copy()
-        initial_data_with_epi["epinephrine"] = 1.0 # Arbitrary unit of epi
+        initial_data_with_epi = {**initial_data_no_epi, "epinephrine": 1.0}  # Arbitrary unit of epi
         
-        state_with_epi = solver.solve(initial_data_with_epi.copy(), dt).state
+        state_with_epi = solver.solve(initial_data_with_epi, dt).state
         sbp_with_epi, dbp_with_epi = state_with_epi["systolic_bp"], state_with_epi["diastolic_bp"]
 
         # epi_bp_factor (0.3) is split for SBP and DBP, so 0.15 effective factor for each per dt
@@ -394,5 +383,59 @@ class TestPressureHROxySolver(unittest.TestCase):
         self.assertTrue(state_with_epi["systolic_bp"] > state_with_epi["diastolic_bp"])
 
 
+    def test_runge_kutta_large_steps_track_fine_euler(self):
+        initial = {"systolic_bp": 150.0, "diastolic_bp": 60.0, "heart_rate": 120.0,
+                   "end_diastolic_volume": 90.0, "oxy_saturation": 98.0}
+
+        def run(integrator, dt, horizon=20.0):
+            solver = PressureHROxySolver(integrator=integrator, filling_ratio_factor=1.05)
+            state = dict(initial)
+            for _ in range(round(horizon / dt)):
+                state.update(solver.solve(dict(state), dt).state)
+            return state
+
+        reference = run("euler", 0.001)
+        coarse_euler = run("euler", 0.5)
+        coarse_rk2, coarse_rk4 = run("rk2", 1.0), run("rk4", 4.0)
+        for key in ("systolic_bp", "diastolic_bp", "heart_rate", "end_diastolic_volume"):
+            # 2x larger midpoint and 8x larger RK4 steps are still closer to the reference than Euler
+            euler_error = abs(coarse_euler[key] - reference[key])
+            self.assertLess(abs(coarse_rk2[key] - reference[key]), euler_error, msg=key)
+            self.assertLess(abs(coarse_rk4[key] - reference[key]), euler_error, msg=key)
+
+    def test_unknown_integrator_rejected(self):
+        with self.assertRaises(ValueError):
+            PressureHROxySolver(integrator="midpoint")
+
+    def test_initial_state_defaults(self):
+        self.assertEqual(PressureHROxySolver(target_edv=100.0).state["end_diastolic_volume"], 100.0)
+        initial = {"heart_rate": 90.0}
+        solver = PressureHROxySolver(initial_state=initial)
+        self.assertEqual(initial, {"heart_rate": 90.0})  # caller's dict is left alone
+        self.assertEqual(solver.state["heart_rate"], 90.0)
+        # Each solver gets its own default state rather than a shared instance
+        self.assertIsNot(PressureHROxySolver()._state, PressureHROxySolver()._state)
+
+    def test_memoised_oxygenation_matches_gas_equation(self):
+        solver = PressureHROxySolver(min_oxy=0.0)
+        for fio2 in (0.1, 0.21, 0.5, 0.21, 1.0):
+            expected = solver._calculate_spO2(solver._calculate_alveolar_oxygen(fio2))
+            self.assertAlmostEqual(solver.solve({"fio2": fio2}, 1.0).state["oxy_saturation"],
+                                   expected, places=9)
+
+    def test_jacobian_matches_finite_difference(self):
+        solver = PressureHROxySolver(filling_ratio_factor=1.1)
+        h = 1e-6
+        for y, epi in ((np.array([120.0, 80.0, 75.0, 120.0]), 0.0),
+                       (np.array([90.0, 65.0, 130.0, 150.0]), 2.0),     # high preload, tachycardic
+                       (np.array([200.0, 110.0, 40.0, 10.0]), 0.0)):    # SV clamped at its floor
+            numeric = np.zeros((4, 4))
+            for j in range(4):
+                step = np.zeros(4)
+                step[j] = h
+                numeric[:, j] = (solver.rhs(0.0, y + step, epi) - solver.rhs(0.0, y - step, epi)) / (2 * h)
+            np.testing.assert_allclose(solver.jacobian(0.0, y, epi), numeric, atol=1e-6)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from solvers import rhythm
+from solvers.rhythm import RhythmSolver, SINUS, AFIB, VFIB, VTACH, ARREST
+
+
+def _always_fires(solver):
+    """Make every stochastic transition with non-zero probability happen."""
+    solver._rng = SimpleNamespace(random=lambda: 0.0)
+    solver._batch_rng = SimpleNamespace(random=np.zeros)
+    return solver
+
+
+class TestRhythmOnset(unittest.TestCase):
+    def _onset(self, **vitals):
+        solver = _always_fires(RhythmSolver())
+        return solver.solve(dict(vitals, rhythm_type=SINUS), 1.0).state["rhythm_type"]
+
+    def test_onset_priority(self):
+        # Each case carries enough risk (> 0.7) for an arrhythmia to start
+        self.assertEqual(self._onset(potassium=7.5, oxygen_debt=80.0, heart_rate=190.0), ARREST)
+        self.assertEqual(self._onset(potassium=6.5, oxygen_debt=80.0, heart_rate=190.0), VFIB)
+        self.assertEqual(self._onset(potassium=6.5, oxygen_debt=10.0, heart_rate=190.0), VTACH)
+        self.assertEqual(self._onset(potassium=6.5, oxygen_debt=10.0, heart_rate=160.0), AFIB)
+
+    def test_low_risk_stays_sinus(self):
+        self.assertEqual(self._onset(potassium=4.0, oxygen_debt=0.0, heart_rate=80.0), SINUS)
+
+    def test_seed_reproducible(self):
+        state = {"heart_rate": 160.0, "potassium": 6.5, "oxygen_debt": 30.0}
+        runs = []
+        for _ in range(2):
+            solver, current = RhythmSolver(seed=7), dict(state)
+            for _ in range(50):
+                current.update(solver.solve(current, 1.0).state)
+            runs.append(current)
+        self.assertEqual(runs[0], runs[1])
+
+
+class TestRhythmSolveBatch(unittest.TestCase):
+    def test_matches_solve_when_transitions_fire(self):
+        base = {"rhythm_type": SINUS, "pr_interval": 170.0, "qrs_duration": 90.0,
+                "qt_interval": 420.0, "heart_block": 0, "rr_variability": 0.2,
+                "heart_rate": 80.0, "potassium": 4.0, "oxygen_debt": 0.0}
+        patients = [
+            base,
+            dict(base, potassium=3.0),                                   # hypokalemic sinus
+            dict(base, rhythm_type=AFIB, heart_block=2),                 # converts, block recovers
+            dict(base, potassium=7.5, oxygen_debt=80.0, heart_rate=190.0),
+            dict(base, potassium=6.5, oxygen_debt=80.0, heart_rate=190.0, heart_block=3),
+            dict(base, potassium=6.5, oxygen_debt=10.0, heart_rate=190.0),
+            dict(base, potassium=6.5, oxygen_debt=10.0, heart_rate=160.0, heart_block=1),
+        ]
+        solver = _always_fires(RhythmSolver())
+        states = np.array([[p[c] for c in rhythm.BATCH_COLUMNS] for p in patients])
+        for row, patient in zip(solver.solve_batch(states, 0.5), patients):
+            expected = solver.solve(patient, 0.5).state
+            for key, value in expected.items():
+                self.assertAlmostEqual(row[rhythm.BATCH_COLUMNS.index(key)], value, places=9, msg=key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from solvers.urine import UrineSolver
+
+
+class TestUrineSolver(unittest.TestCase):
+    def test_large_step_relaxes_without_overshoot(self):
+        solver = UrineSolver()
+        state = {"urine_output": 5.0, "urine_protein": 50.0, "urine_osmolality": 1100.0,
+                 "kidney_function": 100.0, "blood_pressure": 90.0}
+        new = solver.solve(state, 50.0).state
+        # An Euler step of this size would jump far past every target
+        self.assertTrue(5.0 < new["urine_output"] <= 60.0)
+        self.assertAlmostEqual(new["urine_output"], 60.0, delta=0.5)
+        self.assertTrue(0.0 <= new["urine_protein"] < 50.0)
+        self.assertTrue(600.0 <= new["urine_osmolality"] < 1100.0)
+
+    def test_split_steps_match_one_step_at_steady_inputs(self):
+        # Kidney recovery has a fixed target, so two half steps equal one full step
+        solver = UrineSolver()
+        state = {"kidney_function": 40.0, "blood_pressure": 90.0}
+        full = solver.solve(state, 10.0).state["kidney_function"]
+        half = solver.solve(state, 5.0).state
+        twice = solver.solve(dict(state, **half), 5.0).state["kidney_function"]
+        self.assertAlmostEqual(full, twice, places=9)
+
+    def test_rate_change_takes_effect_at_same_dt(self):
+        state = {"kidney_function": 40.0, "blood_pressure": 90.0}
+        solver = UrineSolver()
+        solver.solve(state, 1.0)
+        solver.kidney_recovery_rate = 0.5
+        expected = UrineSolver(kidney_recovery_rate=0.5).solve(state, 1.0).state
+        self.assertEqual(solver.solve(state, 1.0).state, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()